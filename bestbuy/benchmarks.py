@@ -0,0 +1,166 @@
+"""
+Performance benchmarks for the store.
+
+The suite runs the same workload as the benchmark suite of bestbuy2, with the
+same measurement names and result format, so both store implementations can be
+checked for regressions and compared with each other:
+
+    python benchmarks.py suite --sizes 1000 10000 --output baseline.json
+    python benchmarks.py suite --sizes 1000 10000 --baseline baseline.json
+
+The replay places recorded shopping lists one after the other, as the storefront
+does. A recording is a JSON Lines file with one order per line, as a list of
+{"name": ..., "quantity": ...} items; ``record`` writes a synthetic one:
+
+    python benchmarks.py record orders.jsonl --orders 100000
+    python benchmarks.py replay orders.jsonl --products 10000
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+from products import Product
+from store import Store
+
+# storebench, the suite harness shared with bestbuy2, lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storebench import add_suite_arguments, bench_suite, measure_store, ops_per_second  # noqa: E402
+
+# Catalog sizes and cart sizes measured by default, as in bestbuy2
+SUITE_SIZES = [1_000, 10_000, 100_000]
+SUITE_CART_SIZES = [1, 10, 100]
+
+
+def build_catalog(size: int, quantity: int = 1_000) -> list[Product]:
+    """
+    Builds a synthetic catalog of products.
+    :param size: (int) Number of products to create.
+    :param quantity: (int) Initial stock of every product.
+    :returns: (list[Product]) New products with distinct names and prices.
+    """
+    return [Product(f"Product {index}", price=1 + index % 1_000, quantity=quantity) for index in range(size)]
+
+
+def run_suite(sizes: list[int], cart_sizes: list[int], repeat: int = 5) -> dict[str, float]:
+    """
+    Runs the benchmark suite on seeded synthetic catalogs of the given sizes.
+    :param sizes: (list[int]) Numbers of products in the measured stores.
+    :param cart_sizes: (list[int]) Numbers of distinct products per measured order.
+    :param repeat: (int) Number of runs of every measurement.
+    :returns: (dict[str, float]) Calls per second of every measurement, by measurement name.
+    """
+    results = {}
+    stock = 10 ** 15
+
+    product = Product("Benchmark product", price=100, quantity=stock)
+    results["Product.buy"] = ops_per_second(lambda: product.buy(1), repeat)
+
+    for size in sizes:
+        catalog = build_catalog(size, quantity=stock)
+        store = Store(list(catalog))
+        results.update(measure_store(store, catalog, cart_sizes, repeat))
+        del store, catalog
+        gc.collect()
+    return results
+
+
+def record_orders(path: str, order_count: int, catalog_size: int, seed: int = 0):
+    """
+    Writes a synthetic recording of shopping lists for the products of ``build_catalog``.
+    Like real traffic, few products are ordered often and most rarely: product popularity
+    follows a Zipf-like distribution.
+    :param path: (str) Path of the JSON Lines recording, overwritten if it exists.
+    :param order_count: (int) Number of orders to record.
+    :param catalog_size: (int) Number of products to order from.
+    :param seed: (int) Seed of the random generator.
+    """
+    rng = random.Random(seed)
+    weights = [1 / (rank + 1) for rank in range(catalog_size)]
+    with open(path, "w", encoding="utf-8") as recording:
+        for _ in range(order_count):
+            indexes = rng.choices(range(catalog_size), weights, k=rng.randint(1, 4))
+            items = [{"name": f"Product {index}", "quantity": rng.randint(1, 3)} for index in indexes]
+            recording.write(json.dumps(items) + "\n")
+
+
+def replay_orders(path: str, catalog_size: int, quantity: int) -> dict:
+    """
+    Places the recorded shopping lists one after the other in a store of ``build_catalog`` products.
+    Items of products that are unknown or already sold out and removed from the store are skipped.
+    :param path: (str) Path of the JSON Lines recording.
+    :param catalog_size: (int) Number of products in the store.
+    :param quantity: (int) Initial stock of every product.
+    :returns: (dict) Placed and failed orders, orders per second and p50 and p99 latency in microseconds,
+        all zero for a recording without orders.
+    """
+    catalog = build_catalog(catalog_size, quantity)
+    products_by_name = {product.name: product for product in catalog}
+    with open(path, encoding="utf-8") as recording:
+        orders = [[(products_by_name[item["name"]], item["quantity"])
+                   for item in json.loads(line) if item["name"] in products_by_name]
+                  for line in recording if line.strip()]
+    if not orders:
+        return {"placed": 0, "failed": 0, "orders_per_second": 0.0, "p50_us": 0.0, "p99_us": 0.0}
+
+    store = Store(catalog)
+    latencies = []
+    failed = 0
+    perf_counter = time.perf_counter
+    start = perf_counter()
+    for shopping_list in orders:
+        order_start = perf_counter()
+        try:
+            store.order(shopping_list)
+        except ValueError:
+            failed += 1
+        latencies.append(perf_counter() - order_start)
+    elapsed = perf_counter() - start
+
+    cut_points = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "placed": len(orders) - failed,
+        "failed": failed,
+        "orders_per_second": len(orders) / elapsed,
+        "p50_us": cut_points[49] * 1_000_000,
+        "p99_us": cut_points[98] * 1_000_000,
+    }
+
+
+def main():
+    """Parses the command line and runs the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Store performance benchmarks.")
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+
+    suite = benchmarks.add_parser("suite", help="Throughput suite with machine-readable results.")
+    add_suite_arguments(suite, SUITE_SIZES, SUITE_CART_SIZES)
+
+    record = benchmarks.add_parser("record", help="Write a synthetic recording of shopping lists.")
+    record.add_argument("path")
+    record.add_argument("--orders", type=int, default=100_000)
+    record.add_argument("--products", type=int, default=10_000)
+
+    replay = benchmarks.add_parser("replay", help="Place recorded shopping lists.")
+    replay.add_argument("path")
+    replay.add_argument("--products", type=int, default=10_000)
+    replay.add_argument("--quantity", type=int, default=1_000, help="Initial stock of every product.")
+
+    args = parser.parse_args()
+    if args.benchmark == "suite":
+        sys.exit(bench_suite(lambda: run_suite(args.sizes, args.cart_sizes, args.repeat),
+                             args.output, args.baseline, args.tolerance))
+    elif args.benchmark == "record":
+        record_orders(args.path, args.orders, args.products)
+    elif args.benchmark == "replay":
+        report = replay_orders(args.path, args.products, args.quantity)
+        print(f"orders placed: {report['placed']}, failed: {report['failed']}")
+        print(f"throughput: {report['orders_per_second']:.0f} orders/s")
+        print(f"latency p50: {report['p50_us']:.1f} us, p99: {report['p99_us']:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
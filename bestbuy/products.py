@@ -1,8 +1,22 @@
-class Product:
+import os
+import sys
+
+# storecore, the inventory engine shared with bestbuy2, lives in the repository root
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPOSITORY_ROOT not in sys.path:
+    sys.path.append(_REPOSITORY_ROOT)
+from storecore import InventoryItem  # noqa: E402
+
+
+class Product(InventoryItem):
     """
     Represents a product with a name, price, and quantity in stock.
+    Stock, active status and observers are handled by the shared InventoryItem;
+    this class adds the bestbuy API on top of it.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, price: float, quantity: int):
         """
         Initializes a Product instance with the given name, price, and quantity.
@@ -18,10 +32,40 @@ class Product:
         if quantity < 0:
             raise ValueError(f"Invalid quantity: {quantity}, quantity can't be negative")
 
-        self.name = name
-        self.price = price
-        self.quantity = quantity
-        self.active = quantity > 0
+        super().__init__(name, price, quantity)
+
+    @property
+    def name(self) -> str:
+        """Returns the name of the product."""
+        return self._name
+
+    @name.setter
+    def name(self, name: str):
+        """Sets the name of the product."""
+        self._name = name
+
+    @property
+    def price(self) -> float:
+        """Returns the price of the product."""
+        return self._price
+
+    @price.setter
+    def price(self, price: float):
+        """Sets the price of the product."""
+        self._price = price
+
+    @property
+    def active(self) -> bool:
+        """Returns whether the product is active."""
+        return self._active
+
+    @active.setter
+    def active(self, active: bool):
+        """Sets the active status of the product."""
+        if active:
+            self.activate()
+        else:
+            self.deactivate()
 
     def get_quantity(self) -> int:
         """
@@ -36,46 +80,11 @@ class Product:
         :param quantity: (int) The new quantity of the product.
         :raises ValueError: If the quantity is negative.
         """
-        if quantity > 0:
-            self.activate()
-        else:
-            self.deactivate()
-
         self.quantity = quantity
 
-    def is_active(self) -> bool:
-        """
-        Checks if the product is active.
-        :returns: (bool) True if the product is active, False otherwise.
-        """
-        return self.active
-
-    def activate(self):
-        """Activates the product, setting its status to active."""
-        self.active = True
-
-    def deactivate(self):
-        """Deactivates the product, setting its status to inactive."""
-        self.active = False
-
     def show(self) -> str:
         """
         Returns a string representation of the product.
         :returns A string containing the product's name, price, and quantity.
         """
         return f"{self.name}, Price: {self.price}, Quantity: {self.quantity}"
-
-    def buy(self, quantity: int) -> float:
-        """
-        Buys a specified quantity of the product.
-        :param quantity: (int): The quantity to purchase.
-        :returns: (float) The total cost of the purchased quantity.
-        :raises: ValueError: If the requested quantity exceeds the available stock.
-        """
-        product_quantity = self.get_quantity()
-        if quantity > product_quantity:
-            raise ValueError("Requested quantity exceeds the stock")
-
-        self.set_quantity(product_quantity - quantity)
-
-        return quantity * self.price
@@ -1,57 +1,21 @@
-from products import Product
+import os
+import sys
 
+# storecore, the inventory engine shared with bestbuy2, lives in the repository root
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPOSITORY_ROOT not in sys.path:
+    sys.path.append(_REPOSITORY_ROOT)
+from storecore import Inventory  # noqa: E402
 
-class Store:
+
+class Store(Inventory):
     """
     Represents a store containing products in stock.
+    Everything is provided by the shared Inventory:
+    - Store(products) assigns a list of Product objects to the store.
+    - add_product and remove_product change the products of the store.
+    - get_total_quantity returns the sum of the quantities of all products.
+    - get_all_products returns the active products, in the order they were added.
+    - order(shopping_list) buys (product, quantity) items all-or-nothing and returns the
+      total cost as a float; products sold out by the order are removed from the store.
     """
-
-    def __init__(self, products: list[Product]):
-        """
-        Initializes a Store instance with given products.
-        :param products: (list[Product]) List of product to assign to the store.
-        """
-        self.products = products
-
-    def add_product(self, product: Product):
-        """
-        Adds a product to the store.
-        :param product: (Product) Product to be added to the store products.
-        """
-        self.products.append(product)
-
-    def remove_product(self, product: Product):
-        """
-        Removes a product from the store.
-        :param product: (Product) Product to be removed to the store products.
-        """
-        self.products.remove(product)
-
-    def get_total_quantity(self) -> int:
-        """
-        Get total quantity of all products in the store.
-        :returns: (int) Sum of quantities of all products in the store.
-        """
-        return sum(product.quantity for product in self.products)
-
-    def get_all_products(self) -> list[Product]:
-        """
-        Returns all the active products in the store.
-        :returns: (list[Product]) Products with attribute 'active' set to True.
-        """
-        return [product for product in self.products if product.active]
-
-    def order(self, shopping_list: list[tuple[Product, int]]) -> float:
-        """
-        Buy products from given shopping_list.
-        :param shopping_list: (list[tuple[Product, int]]) List of order items.
-        :returns: (float) Total cost of the order.
-        """
-        total = 0
-        for product, quantity in shopping_list:
-            if product in self.products:
-                total += product.buy(quantity)
-                if not product.is_active():
-                    self.remove_product(product)
-
-        return total
@@ -0,0 +1,31 @@
+from benchmarks import replay_orders
+
+
+def test_replay_of_a_recording_without_orders_reports_zeros(tmp_path):
+    """
+    Test that replaying an empty recording, or one of blank lines only, reports no orders instead of failing.
+    """
+    empty = tmp_path / "empty.jsonl"
+    empty.write_text("")
+    blank = tmp_path / "blank.jsonl"
+    blank.write_text("\n  \n\n")
+
+    for path in (empty, blank):
+        report = replay_orders(str(path), catalog_size=10, quantity=5)
+        assert report == {"placed": 0, "failed": 0, "orders_per_second": 0.0, "p50_us": 0.0, "p99_us": 0.0}
+
+
+def test_replay_places_recorded_orders(tmp_path):
+    """
+    Test that recorded orders are placed, and that orders exceeding the stock are counted as failed.
+    """
+    recording = tmp_path / "orders.jsonl"
+    recording.write_text('[{"name": "Product 1", "quantity": 2}]\n'
+                         '\n'
+                         '[{"name": "Product 1", "quantity": 2}, {"name": "Product 2", "quantity": 1}]\n'
+                         '[{"name": "Product 1", "quantity": 2}]\n')
+
+    report = replay_orders(str(recording), catalog_size=10, quantity=5)
+
+    assert report["placed"] == 2
+    assert report["failed"] == 1
@@ -0,0 +1,705 @@
+"""
+Performance benchmarks for the store.
+
+Run a benchmark by its name from the project directory, e.g.:
+
+    python benchmarks.py concurrency --threads 1 2 4 8
+    python benchmarks.py memory --products 1000000
+    python benchmarks.py pricing --lines 1000000
+    python benchmarks.py money --lines 1000000
+    python benchmarks.py cart-rules --rules 10000
+    python benchmarks.py journal --products 1000000
+    python benchmarks.py catalog-io --rows 1000000
+    python benchmarks.py merge --products 200000
+    python benchmarks.py price-index --products 1000000
+    python benchmarks.py search --products 1000000
+    python benchmarks.py listing --products 1000000
+    python benchmarks.py sharding --shards 1 2 4 8
+    python benchmarks.py stock-events --products 1000000
+
+The suite runs a fixed set of measurements and can write them as JSON and
+compare them with the results of an earlier run:
+
+    python benchmarks.py suite --sizes 1000 10000 --output baseline.json
+    python benchmarks.py suite --sizes 1000 10000 --baseline baseline.json
+"""
+import argparse
+import csv
+import json
+import os
+import gc
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+from cart_rules import BundleDiscount, BasketThreshold
+from catalog_io import read_catalog, write_catalog
+from journal import InventoryJournal
+from product_table import ProductTable
+from money import Money
+from products import Product, _promotion_price
+from promotions import (SecondHalfPrice, ThirdOneFree, PercentDiscount, PromotionStack, Promotion,
+                        _PricedItem, numpy)
+from sharded_store import ShardedStore
+from store import Store
+
+# storebench, the suite harness shared with bestbuy, lives in the repository root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storebench import add_suite_arguments, bench_suite, compare_results, measure_store, ops_per_second  # noqa: E402
+
+
+def build_catalog(size: int, quantity: int = 1_000) -> list[Product]:
+    """
+    Builds a synthetic catalog of stocked products.
+
+    :param size: Number of products to create.
+    :type size: int
+    :param quantity: Initial stock of every product.
+    :type quantity: int
+    :return: List of new products with distinct names and prices.
+    :rtype: list[Product]
+    """
+    return [Product(f"Product {index}", price=1 + index % 1_000, quantity=quantity) for index in range(size)]
+
+
+def bench_concurrency(thread_counts: list[int], orders_per_thread: int, catalog_size: int):
+    """
+    Stress test of concurrent ordering against one shared store.
+
+    Every thread places random multi-line orders on a small catalog, so the
+    threads compete for the same products until stock runs out. After each
+    run the revenue of all placed orders is compared with the value of the
+    stock that disappeared from the store, which reveals any oversold or lost
+    item. Products carry no promotion, so both must match exactly.
+
+    :param thread_counts: Numbers of worker threads to run the test with.
+    :type thread_counts: list[int]
+    :param orders_per_thread: Number of orders every thread attempts to place.
+    :type orders_per_thread: int
+    :param catalog_size: Number of products shared by all threads.
+    :type catalog_size: int
+    """
+    print(f"{'threads':>8} {'orders':>8} {'orders/s':>12} {'sold':>8} {'mismatch':>9}")
+    for thread_count in thread_counts:
+        # scarce stock: the orders ask for several times more items than the store holds
+        catalog = build_catalog(catalog_size, quantity=max(1, orders_per_thread * thread_count // catalog_size))
+        store = Store(catalog)
+        initial_quantity = store.get_total_quantity()
+        revenue = [0] * thread_count
+        placed = [0] * thread_count
+
+        def worker(worker_index: int):
+            rng = random.Random(worker_index)
+            for _ in range(orders_per_thread):
+                shopping_list = [(rng.choice(catalog), rng.randint(1, 3)) for _ in range(rng.randint(1, 4))]
+                try:
+                    revenue[worker_index] += store.order(shopping_list)
+                except ValueError:
+                    continue
+                placed[worker_index] += 1
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(thread_count)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        sold = initial_quantity - sum(product.quantity for product in catalog)
+        sold_value = sum((initial_quantity // catalog_size - product.quantity) * product.price for product in catalog)
+        mismatch = sum(revenue) - sold_value
+        if store.get_total_quantity() != initial_quantity - sold or any(product.quantity < 0 for product in catalog):
+            mismatch = "corrupt"
+
+        print(f"{thread_count:>8} {sum(placed):>8} {sum(placed) / elapsed:>12.0f} {sold:>8} {mismatch:>9}")
+
+
+def _measure_memory(build) -> tuple[int, float]:
+    """
+    Measures the memory retained by the object built by the given function.
+
+    :param build: Function without arguments creating the measured object.
+    :type build: Callable
+    :return: Retained memory in bytes and the build time in seconds.
+    :rtype: tuple[int, float]
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del built
+    return retained, elapsed
+
+
+def bench_memory(catalog_size: int):
+    """
+    Compares the memory used by a catalog of Product objects and by a ProductTable.
+
+    :param catalog_size: Number of products in the measured catalogs.
+    :type catalog_size: int
+    """
+    rows = [(f"Product {index}", 1 + index % 1_000, 100) for index in range(catalog_size)]
+    measurements = {
+        "Product objects": lambda: [Product(name, price, quantity) for name, price, quantity in rows],
+        "ProductTable": lambda: ProductTable(rows),
+    }
+
+    print(f"{'catalog':>16} {'MiB':>10} {'bytes/product':>14} {'build s':>9}")
+    for label, build in measurements.items():
+        retained, elapsed = _measure_memory(build)
+        print(f"{label:>16} {retained / 2 ** 20:>10.1f} {retained / catalog_size:>14.1f} {elapsed:>9.2f}")
+    print("(names are shared with the input rows and not included)")
+
+
+def bench_pricing(line_count: int):
+    """
+    Compares pricing many order lines one call at a time with the batch pricing path.
+
+    :param line_count: Number of (price, quantity) lines priced by every promotion.
+    :type line_count: int
+    """
+    rng = random.Random(0)
+    unit_prices = [rng.randint(1, 200_000) for _ in range(line_count)]
+    quantities = [rng.randint(1, 10) for _ in range(line_count)]
+    promotions = [SecondHalfPrice("Second Half price!"), ThirdOneFree("Third One Free!"),
+                  PercentDiscount("30% off!", percent=30)]
+
+    print(f"batch path uses {'NumPy' if numpy is not None else 'the scalar fallback (NumPy not installed)'}")
+    print(f"{'promotion':>20} {'scalar lines/s':>15} {'batch lines/s':>15}")
+    for promotion in promotions:
+        start = time.perf_counter()
+        for unit_price, quantity in zip(unit_prices, quantities):
+            promotion.apply_promotion(_PricedItem(Money(unit_price)), quantity)
+        scalar_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        promotion.apply_promotion_many(unit_prices, quantities)
+        batch_elapsed = time.perf_counter() - start
+
+        print(f"{promotion.name:>20} {line_count / scalar_elapsed:>15.0f} {line_count / batch_elapsed:>15.0f}")
+
+
+def bench_money(line_count: int, catalog_size: int):
+    """
+    Compares float pricing with exact Money pricing, with and without the price cache.
+
+    Lines are drawn from a small catalog with a 30% discount, like checkout
+    traffic, so the cache sees the same (price, quantity) pairs repeatedly.
+    The float path reproduces the old float formula without rounding to cents
+    and reports how far its total ends up from the exact total.
+
+    :param line_count: Number of order lines to price.
+    :type line_count: int
+    :param catalog_size: Number of distinct products the lines are drawn from.
+    :type catalog_size: int
+    """
+    rng = random.Random(0)
+    promotion = PercentDiscount("30% off!", percent=30)
+    catalog = build_catalog(catalog_size)
+    for product in catalog:
+        product.price = rng.randint(1, 200_000) / 100
+        product.promotion = promotion
+    lines = [(rng.choice(catalog), rng.randint(1, 10)) for _ in range(line_count)]
+
+    start = time.perf_counter()
+    float_total = 0.0
+    for product, quantity in lines:
+        float_total += (product.price - (product.price / 100) * 30) * quantity
+    float_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    exact_total = sum(promotion.apply_promotion(product, quantity) for product, quantity in lines)
+    exact_elapsed = time.perf_counter() - start
+
+    _promotion_price.cache_clear()
+    start = time.perf_counter()
+    cached_total = sum(product.get_price(quantity) for product, quantity in lines)
+    cached_elapsed = time.perf_counter() - start
+
+    print(f"{'path':>14} {'lines/s':>12} {'total':>18}")
+    print(f"{'float':>14} {line_count / float_elapsed:>12.0f} {float_total:>18.6f}")
+    print(f"{'Money':>14} {line_count / exact_elapsed:>12.0f} {exact_total:>18}")
+    print(f"{'Money, cached':>14} {line_count / cached_elapsed:>12.0f} {cached_total:>18}")
+    print(f"float total minus exact total: {float_total - float(exact_total):+.6f}")
+    print(f"price cache: {_promotion_price.cache_info()}")
+
+
+def bench_cart_rules(rule_count: int, cart_count: int, catalog_size: int):
+    """
+    Compares pricing carts with the indexed cart rules of a store with testing every rule against every cart.
+
+    :param rule_count: Number of bundle rules, a few basket thresholds are added on top.
+    :type rule_count: int
+    :param cart_count: Number of carts priced.
+    :type cart_count: int
+    :param catalog_size: Number of products in the store.
+    :type catalog_size: int
+    """
+    rng = random.Random(0)
+    catalog = build_catalog(catalog_size)
+    store = Store(catalog)
+    rules = [BundleDiscount(f"Bundle {index}", *rng.sample(catalog, 2), percent=rng.randint(5, 50))
+             for index in range(rule_count)]
+    rules += [BasketThreshold(f"{percent}% over {minimum}", minimum, percent)
+              for minimum, percent in [(500, 2), (1_000, 5), (5_000, 10)]]
+    for rule in rules:
+        store.add_rule(rule)
+    carts = [[(product, rng.randint(1, 3)) for product in rng.sample(catalog, 5)] for _ in range(cart_count)]
+
+    start = time.perf_counter()
+    indexed_totals = [store.price_cart(cart) for cart in carts]
+    indexed_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for cart in carts:
+        line_prices = store._price_lines(cart)
+        subtotal = sum(line_prices)
+        priced = {id(product): (product, quantity, price) for (product, quantity), price in zip(cart, line_prices)}
+        for rule in rules:
+            rule.apply_rule(priced, subtotal)
+    scan_elapsed = time.perf_counter() - start
+
+    discounted = sum(total < sum(store._price_lines(cart)) for total, cart in zip(indexed_totals, carts))
+    print(f"{len(rules)} rules, {cart_count} carts of 5 lines, {discounted} carts discounted")
+    print(f"{'indexed':>10} {cart_count / indexed_elapsed:>12.0f} carts/s")
+    print(f"{'full scan':>10} {cart_count / scan_elapsed:>12.0f} carts/s")
+
+
+def bench_journal(catalog_size: int, order_count: int):
+    """
+    Measures logging orders to the inventory journal and restoring the stock on startup.
+
+    :param catalog_size: Number of products saved in the snapshot.
+    :type catalog_size: int
+    :param order_count: Number of orders in the log tail replayed after the snapshot.
+    :type order_count: int
+    """
+    rng = random.Random(0)
+    with tempfile.TemporaryDirectory() as directory:
+        catalog = build_catalog(catalog_size)
+        store = Store(catalog, journal=InventoryJournal(directory, checkpoint_every=order_count + 1))
+
+        start = time.perf_counter()
+        store.checkpoint()
+        checkpoint_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(order_count):
+            store.order([(product, 1) for product in rng.sample(catalog, 3)])
+        order_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        stock = InventoryJournal(directory).load()
+        load_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Store(build_catalog(catalog_size))
+        build_elapsed = time.perf_counter() - start
+
+        start = time.perf_counter()
+        Store(build_catalog(catalog_size), journal=InventoryJournal(directory))
+        restore_elapsed = time.perf_counter() - start
+
+    print(f"snapshot of {catalog_size} products written in {checkpoint_elapsed * 1000:.0f} ms")
+    print(f"{order_count} journaled orders at {order_count / order_elapsed:.0f} orders/s")
+    print(f"snapshot + log tail loaded in {load_elapsed * 1000:.0f} ms ({len(stock)} products)")
+    print(f"store built in {build_elapsed * 1000:.0f} ms, built and restored in {restore_elapsed * 1000:.0f} ms")
+
+
+def bench_catalog_io(row_count: int):
+    """
+    Measures exporting and importing a catalog as CSV and JSON Lines, in rows per second.
+
+    The import is compared with reading the same CSV row by row into validating Product constructors.
+
+    :param row_count: Number of products in the catalog.
+    :type row_count: int
+    """
+    catalog = build_catalog(row_count)
+    print(f"{'format':>8} {'export rows/s':>14} {'import rows/s':>14}")
+    with tempfile.TemporaryDirectory() as directory:
+        for extension in ("csv", "jsonl"):
+            path = os.path.join(directory, f"catalog.{extension}")
+            start = time.perf_counter()
+            write_catalog(path, catalog)
+            export_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            imported = len(list(read_catalog(path)))
+            import_elapsed = time.perf_counter() - start
+            print(f"{extension:>8} {row_count / export_elapsed:>14.0f} {imported / import_elapsed:>14.0f}")
+
+        start = time.perf_counter()
+        with open(os.path.join(directory, "catalog.csv"), newline="") as csv_file:
+            reader = csv.reader(csv_file)
+            next(reader)
+            imported = len([Product(name, float(price) if "." in price else int(price), int(quantity))
+                            for _, name, price, quantity, _ in reader])
+        import_elapsed = time.perf_counter() - start
+        print(f"{'csv, one Product() per row':>28} {imported / import_elapsed:>14.0f} import rows/s")
+
+
+def bench_merge(catalog_size: int):
+    """
+    Measures merging two stores sharing half of their product names, with and without copying unique products.
+
+    :param catalog_size: Number of products in each merged store.
+    :type catalog_size: int
+    """
+    first = Store(build_catalog(catalog_size))
+    second = Store([Product(f"Product {index}", price=1 + index % 1_000, quantity=1_000)
+                    for index in range(catalog_size // 2, catalog_size + catalog_size // 2)])
+
+    print(f"{'merge':>16} {'products':>10} {'MiB':>8} {'seconds':>8}")
+    for label, copy_products in (("copy all", True), ("share unique", False)):
+        merged = []
+        retained, elapsed = _measure_memory(lambda: merged.append(first.merge(second, copy_products)))
+        print(f"{label:>16} {len(merged[0]):>10} {retained / 2 ** 20:>8.1f} {elapsed:>8.2f}")
+
+
+def bench_price_index(catalog_size: int, query_count: int):
+    """
+    Compares price range and cheapest-N queries answered by the price index with a full scan and sort.
+
+    :param catalog_size: Number of products in the store.
+    :type catalog_size: int
+    :param query_count: Number of queries of each kind.
+    :type query_count: int
+    """
+    rng = random.Random(0)
+    catalog = build_catalog(catalog_size)
+    store = Store(catalog)
+    ranges = [(low, low + 5) for low in (rng.randint(1, 995) for _ in range(query_count))]
+
+    start = time.perf_counter()
+    store.get_cheapest_products(1)
+    build_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for low, high in ranges:
+        store.get_products_in_price_range(low, high)
+        store.get_cheapest_products(10)
+    index_elapsed = time.perf_counter() - start
+
+    scan_count = max(1, query_count // 100)
+    start = time.perf_counter()
+    for low, high in ranges[:scan_count]:
+        sorted((product for product in store.get_all_products() if low <= product.price <= high),
+               key=lambda product: product.price)
+        sorted(store.get_all_products(), key=lambda product: product.price)[:10]
+    scan_elapsed = (time.perf_counter() - start) * query_count / scan_count
+
+    start = time.perf_counter()
+    for product in rng.sample(catalog, query_count):
+        product.price = rng.randint(1, 1_000)
+    reprice_elapsed = time.perf_counter() - start
+
+    print(f"index built on first query in {build_elapsed * 1000:.0f} ms for {catalog_size} products")
+    print(f"{'indexed':>10} {query_count / index_elapsed:>12.0f} query pairs/s")
+    print(f"{'full scan':>10} {query_count / scan_elapsed:>12.1f} query pairs/s")
+    print(f"{'reprice':>10} {query_count / reprice_elapsed:>12.0f} price changes/s with index upkeep")
+
+
+def bench_search(catalog_size: int, query_count: int):
+    """
+    Measures name search lookups on a large store.
+
+    :param catalog_size: Number of products in the store.
+    :type catalog_size: int
+    :param query_count: Number of lookups of each kind.
+    :type query_count: int
+    """
+    rng = random.Random(0)
+    brands = ["Apple", "Bose", "Google", "Samsung", "Sony", "Lenovo", "Dell", "Asus"]
+    kinds = ["Laptop", "Earbuds", "Phone", "Monitor", "Tablet", "Speaker", "Charger", "Cable"]
+    catalog = [Product(f"{rng.choice(brands)} {rng.choice(kinds)} {index}", price=100, quantity=10)
+               for index in range(catalog_size)]
+
+    start = time.perf_counter()
+    store = Store(catalog)
+    build_elapsed = time.perf_counter() - start
+    store.search_products("warm up")
+
+    queries = {
+        "exact id": [str(rng.randrange(catalog_size)) for _ in range(query_count)],
+        "id prefix": [str(rng.randrange(catalog_size))[:3] for _ in range(query_count)],
+        "words + id prefix": [f"{rng.choice(brands)} {rng.choice(kinds)} {rng.randrange(10, 99)}"
+                              for _ in range(query_count)],
+        "common word": [rng.choice(kinds) for _ in range(query_count)],
+    }
+    print(f"store of {catalog_size} products built in {build_elapsed:.1f} s")
+    print(f"{'query':>18} {'us/lookup':>10}")
+    for label, texts in queries.items():
+        start = time.perf_counter()
+        for text in texts:
+            store.search_products(text, limit=20)
+        elapsed = time.perf_counter() - start
+        print(f"{label:>18} {elapsed / query_count * 1e6:>10.1f}")
+
+
+def bench_listing(catalog_size: int, page_size: int):
+    """
+    Compares formatting the whole product listing with formatting one page from the cached listing lines.
+
+    :param catalog_size: Number of products in the store.
+    :type catalog_size: int
+    :param page_size: Number of products per page.
+    :type page_size: int
+    """
+    catalog = build_catalog(catalog_size, quantity=1)
+    store = Store(catalog)
+
+    start = time.perf_counter()
+    "\n".join(str(product) for product in store.get_all_products())
+    full_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for product in store.get_products_page(0, page_size):
+        store.get_product_line(product)
+    page_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for product in store.get_products_page(0, page_size):
+        store.get_product_line(product)
+    cached_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for product in catalog[::max(1, catalog_size // 100)]:
+        store.order([(product, 1)])
+    order_elapsed = time.perf_counter() - start
+
+    print(f"{'full listing':>24} {full_elapsed * 1000:>10.2f} ms")
+    print(f"{'first page':>24} {page_elapsed * 1000:>10.2f} ms")
+    print(f"{'first page, cached lines':>24} {cached_elapsed * 1000:>10.2f} ms")
+    print(f"{'sell-out orders':>24} {order_elapsed * 1000 / 100:>10.2f} ms each, listing kept up to date")
+
+def bench_sharding(shard_counts: list[int], order_count: int, catalog_size: int, batch_size: int):
+    """
+    Compares the order throughput of one store with stores sharded across worker processes.
+
+    Orders have one to four lines, so most of them span several shards. Sharded
+    stores are measured placing one order per request, and placing batches
+    of orders with ``order_many``.
+
+    :param shard_counts: Numbers of shards to measure.
+    :type shard_counts: list[int]
+    :param order_count: Number of orders placed per measurement.
+    :type order_count: int
+    :param catalog_size: Number of products in the store.
+    :type catalog_size: int
+    :param batch_size: Number of orders per ``order_many`` call.
+    :type batch_size: int
+    """
+    rng = random.Random(0)
+    catalog = build_catalog(catalog_size, quantity=10 ** 9)
+    orders = [[(rng.choice(catalog), rng.randint(1, 3)) for _ in range(rng.randint(1, 4))]
+              for _ in range(order_count)]
+    print(f"{os.cpu_count()} CPUs")
+
+    store = Store(catalog)
+    start = time.perf_counter()
+    for shopping_list in orders:
+        store.order(shopping_list)
+    print(f"{'single process':>22} {order_count / (time.perf_counter() - start):>12.0f} orders/s")
+
+    for shard_count in shard_counts:
+        with ShardedStore(build_catalog(catalog_size, quantity=10 ** 9), shard_count=shard_count) as sharded:
+            start = time.perf_counter()
+            for shopping_list in orders:
+                sharded.order(shopping_list)
+            single_elapsed = time.perf_counter() - start
+
+            start = time.perf_counter()
+            for index in range(0, order_count, batch_size):
+                sharded.order_many(orders[index:index + batch_size])
+            batch_elapsed = time.perf_counter() - start
+        print(f"{f'{shard_count} shards':>22} {order_count / single_elapsed:>12.0f} orders/s, "
+              f"{order_count / batch_elapsed:>10.0f} orders/s in batches")
+
+
+def bench_stock_events(catalog_size: int, order_count: int):
+    """
+    Compares finding low-stock products by scanning the catalog with low-stock alerts pushed to a subscriber,
+    and measures what publishing events costs an order.
+
+    :param catalog_size: Number of products in the store, every one with a low-stock threshold.
+    :type catalog_size: int
+    :param order_count: Number of orders placed per measurement.
+    :type order_count: int
+    """
+    rng = random.Random(0)
+    catalog = build_catalog(catalog_size, quantity=10 ** 9)
+    store = Store(catalog)
+    orders = [[(rng.choice(catalog), 1)] for _ in range(order_count)]
+
+    start = time.perf_counter()
+    for shopping_list in orders:
+        store.order(shopping_list)
+    unobserved_elapsed = time.perf_counter() - start
+
+    # every product alerts on its next sale
+    alerts = []
+    thresholds = {}
+    for product in catalog:
+        thresholds[id(product)] = product.quantity
+        store.set_low_stock_threshold(product, product.quantity)
+    store.subscribe(alerts.append, kinds=["low_stock"])
+    start = time.perf_counter()
+    for shopping_list in orders:
+        store.order(shopping_list)
+    observed_elapsed = time.perf_counter() - start
+
+    start = time.perf_counter()
+    low = [product for product in store.products if product.quantity < thresholds[id(product)]]
+    scan_elapsed = time.perf_counter() - start
+
+    print(f"{'order, no subscribers':>28} {unobserved_elapsed / order_count * 1e6:>10.1f} us")
+    print(f"{'order, alert subscriber':>28} {observed_elapsed / order_count * 1e6:>10.1f} us")
+    print(f"{'one catalog scan':>28} {scan_elapsed * 1000:>10.1f} ms, {len(low)} low products "
+          f"({len(alerts)} alerts pushed)")
+
+
+# Catalog sizes and cart sizes measured by the suite by default
+SUITE_SIZES = [1_000, 10_000, 100_000, 1_000_000]
+SUITE_CART_SIZES = [1, 10, 100]
+
+
+def run_suite(sizes: list[int], cart_sizes: list[int], repeat: int = 5) -> dict[str, float]:
+    """
+    Runs the benchmark suite on synthetic catalogs of the given sizes.
+
+    The store measurements are shared with the suite of bestbuy, this suite
+    adds the promotions. Stock is large enough never to run out.
+
+    :param sizes: Numbers of products in the measured stores.
+    :type sizes: list[int]
+    :param cart_sizes: Numbers of distinct products per measured order.
+    :type cart_sizes: list[int]
+    :param repeat: Number of runs of every measurement.
+    :type repeat: int
+    :return: Calls per second of every measurement, by measurement name.
+    :rtype: dict[str, float]
+    """
+    results = {}
+    stock = 10 ** 15
+
+    product = Product("Benchmark product", price=100, quantity=stock)
+    results["Product.buy"] = ops_per_second(lambda: product.buy(1), repeat)
+
+    promotions: list[Promotion] = [SecondHalfPrice("Second Half price!"), ThirdOneFree("Third One Free!"),
+                                   PercentDiscount("30% off!", percent=30)]
+    promotions.append(PromotionStack(promotions))
+    for promotion in promotions:
+        results[f"{type(promotion).__name__}.apply_promotion"] = ops_per_second(
+            lambda promotion=promotion: promotion.apply_promotion(product, 3), repeat)
+
+    for size in sizes:
+        catalog = build_catalog(size, quantity=stock)
+        store = Store(catalog)
+        results.update(measure_store(store, catalog, cart_sizes, repeat))
+        del store, catalog
+        gc.collect()
+    return results
+
+
+def main():
+    """Parses the command line and runs the selected benchmark."""
+    parser = argparse.ArgumentParser(description="Store performance benchmarks.")
+    benchmarks = parser.add_subparsers(dest="benchmark", required=True)
+
+    concurrency = benchmarks.add_parser("concurrency", help="Concurrent ordering stress test.")
+    concurrency.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    concurrency.add_argument("--orders", type=int, default=20_000, help="Orders per thread.")
+    concurrency.add_argument("--products", type=int, default=50)
+
+    memory = benchmarks.add_parser("memory", help="Catalog memory footprint.")
+    memory.add_argument("--products", type=int, default=1_000_000)
+
+    pricing = benchmarks.add_parser("pricing", help="Scalar versus batch promotion pricing.")
+    pricing.add_argument("--lines", type=int, default=1_000_000)
+
+    money = benchmarks.add_parser("money", help="Float versus exact Money pricing.")
+    money.add_argument("--lines", type=int, default=1_000_000)
+    money.add_argument("--products", type=int, default=1_000)
+
+    cart_rules = benchmarks.add_parser("cart-rules", help="Indexed versus full scan cart rule matching.")
+    cart_rules.add_argument("--rules", type=int, default=10_000)
+    cart_rules.add_argument("--carts", type=int, default=10_000)
+    cart_rules.add_argument("--products", type=int, default=5_000)
+
+    journal = benchmarks.add_parser("journal", help="Inventory journal logging and restore.")
+    journal.add_argument("--products", type=int, default=1_000_000)
+    journal.add_argument("--orders", type=int, default=10_000)
+
+    catalog_io = benchmarks.add_parser("catalog-io", help="Catalog import and export throughput.")
+    catalog_io.add_argument("--rows", type=int, default=1_000_000)
+
+    merge = benchmarks.add_parser("merge", help="Store merge time and memory.")
+    merge.add_argument("--products", type=int, default=200_000)
+
+    price_index = benchmarks.add_parser("price-index", help="Indexed versus scanned price queries.")
+    price_index.add_argument("--products", type=int, default=1_000_000)
+    price_index.add_argument("--queries", type=int, default=1_000)
+
+    search = benchmarks.add_parser("search", help="Product name search lookups.")
+    search.add_argument("--products", type=int, default=1_000_000)
+    search.add_argument("--queries", type=int, default=10_000)
+
+    listing = benchmarks.add_parser("listing", help="Full versus paginated product listing.")
+    listing.add_argument("--products", type=int, default=1_000_000)
+    listing.add_argument("--page-size", type=int, default=20)
+
+    stock_events = benchmarks.add_parser("stock-events", help="Low-stock alerts versus catalog scans.")
+    stock_events.add_argument("--products", type=int, default=1_000_000)
+    stock_events.add_argument("--orders", type=int, default=100_000)
+
+    suite = benchmarks.add_parser("suite", help="Throughput suite with machine-readable results.")
+    add_suite_arguments(suite, SUITE_SIZES, SUITE_CART_SIZES)
+
+    sharding = benchmarks.add_parser("sharding", help="Single process versus sharded store throughput.")
+    sharding.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4, 8])
+    sharding.add_argument("--orders", type=int, default=20_000)
+    sharding.add_argument("--products", type=int, default=100_000)
+    sharding.add_argument("--batch", type=int, default=1_000, help="Orders per order_many call.")
+
+    args = parser.parse_args()
+    if args.benchmark == "concurrency":
+        bench_concurrency(args.threads, args.orders, args.products)
+    elif args.benchmark == "memory":
+        bench_memory(args.products)
+    elif args.benchmark == "pricing":
+        bench_pricing(args.lines)
+    elif args.benchmark == "money":
+        bench_money(args.lines, args.products)
+    elif args.benchmark == "cart-rules":
+        bench_cart_rules(args.rules, args.carts, args.products)
+    elif args.benchmark == "journal":
+        bench_journal(args.products, args.orders)
+    elif args.benchmark == "catalog-io":
+        bench_catalog_io(args.rows)
+    elif args.benchmark == "merge":
+        bench_merge(args.products)
+    elif args.benchmark == "price-index":
+        bench_price_index(args.products, args.queries)
+    elif args.benchmark == "search":
+        bench_search(args.products, args.queries)
+    elif args.benchmark == "listing":
+        bench_listing(args.products, args.page_size)
+    elif args.benchmark == "sharding":
+        bench_sharding(args.shards, args.orders, args.products, args.batch)
+    elif args.benchmark == "stock-events":
+        bench_stock_events(args.products, args.orders)
+    elif args.benchmark == "suite":
+        sys.exit(bench_suite(lambda: run_suite(args.sizes, args.cart_sizes, args.repeat),
+                             args.output, args.baseline, args.tolerance, details={"numpy": numpy is not None}))
+
+
+if __name__ == "__main__":
+    main()
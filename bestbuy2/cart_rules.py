@@ -0,0 +1,269 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_right, insort
+from typing import TYPE_CHECKING
+
+from money import Money, round_half_up
+
+if TYPE_CHECKING:
+    from products import Product
+
+# Priced order lines keyed by product identity: (product, quantity, line price in cents)
+Cart = dict[int, tuple["Product", int, int]]
+
+
+class CartRule(ABC):
+    """
+    Represents a base class for promotions evaluated over a whole order instead of a single product.
+
+    A rule either names the products it needs in the cart, like a bundle, or
+    names none and applies to the basket as a whole once its subtotal reaches
+    ``minimum_subtotal``.
+    """
+
+    def __init__(self, name: str, products: tuple["Product", ...] = (), minimum_subtotal: float | int = 0):
+        """
+        Initialize the rule with the given name, required products and minimum subtotal.
+
+        :param name: The name of the rule.
+        :type name: str
+        :param products: Products which must all be in the cart for the rule to apply.
+        :type products: tuple[Product, ...]
+        :param minimum_subtotal: Order subtotal needed for the rule to apply.
+        :type minimum_subtotal: float | int
+        :raises ValueError: If the name is empty or the minimum subtotal is negative.
+        """
+        if not isinstance(name, str) or name == "":
+            raise ValueError("Invalid cart rule name set: name must be a non-empty string")
+        minimum_subtotal = Money.from_amount(minimum_subtotal)
+        if minimum_subtotal < 0:
+            raise ValueError("Invalid cart rule set: minimum subtotal cannot be negative")
+
+        self._name = name
+        self._products = tuple(products)
+        self._minimum_subtotal = minimum_subtotal
+
+    @property
+    def name(self) -> str:
+        """
+        Get the name of the rule.
+
+        :return: The name of the rule.
+        :rtype: str
+        """
+        return self._name
+
+    @property
+    def products(self) -> tuple["Product", ...]:
+        """
+        Get the products which must be in the cart for the rule to apply.
+
+        :return: The required products, empty for basket-wide rules.
+        :rtype: tuple[Product, ...]
+        """
+        return self._products
+
+    @property
+    def minimum_subtotal(self) -> Money:
+        """
+        Get the order subtotal needed for the rule to apply.
+
+        :return: The minimum subtotal.
+        :rtype: Money
+        """
+        return self._minimum_subtotal
+
+    @abstractmethod
+    def apply_rule(self, cart: Cart, subtotal: int) -> int:
+        """
+        Calculate the discount the rule gives on a cart.
+
+        :param cart: Priced order lines keyed by ``id()`` of their product.
+        :type cart: Cart
+        :param subtotal: The order subtotal in cents, after product promotions.
+        :type subtotal: int
+        :return: The discount in cents, 0 if the rule does not apply.
+        :rtype: int
+        """
+        pass
+
+
+class BundleDiscount(CartRule):
+    """
+    Cart rule giving a percentage discount on one product when bought together with another,
+    e.g. buy a laptop and get the earbuds 20% off.
+
+    One discounted item is granted for every item of the required product.
+    """
+
+    def __init__(self, name: str, required: "Product", discounted: "Product", percent: int):
+        """
+        Initialize the bundle with the required and the discounted product.
+
+        :param name: The name of the rule.
+        :type name: str
+        :param required: Product which must be bought to get the discount.
+        :type required: Product
+        :param discounted: Product sold at a discount in the bundle.
+        :type discounted: Product
+        :param percent: The percentage discount to apply (1-100% inclusive).
+        :type percent: int
+        :raises ValueError: If the percentage is out of the range 1-100.
+        """
+        super().__init__(name, (required, discounted))
+        if not 1 <= percent <= 100:
+            raise ValueError("Error creating bundle discount: out of range 1 - 100 %")
+        self._percent = percent
+
+    def apply_rule(self, cart: Cart, subtotal: int) -> int:
+        """
+        Calculate the bundle discount on the discounted product's line.
+
+        :param cart: Priced order lines keyed by ``id()`` of their product.
+        :type cart: Cart
+        :param subtotal: The order subtotal in cents, after product promotions.
+        :type subtotal: int
+        :return: The discount in cents, 0 if either product is missing.
+        :rtype: int
+        """
+        required, discounted = self.products
+        if id(required) not in cart or id(discounted) not in cart:
+            return 0
+
+        _, required_quantity, _ = cart[id(required)]
+        _, quantity, line_price = cart[id(discounted)]
+        bundles = min(required_quantity, quantity)
+        return round_half_up(line_price * bundles * self._percent, quantity * 100)
+
+
+class BasketThreshold(CartRule):
+    """
+    Cart rule giving a percentage discount on the whole order once its subtotal reaches a threshold,
+    e.g. 5% off orders over $1000.
+    """
+
+    def __init__(self, name: str, minimum_subtotal: float | int, percent: int):
+        """
+        Initialize the threshold rule.
+
+        :param name: The name of the rule.
+        :type name: str
+        :param minimum_subtotal: Order subtotal needed for the discount.
+        :type minimum_subtotal: float | int
+        :param percent: The percentage discount to apply (1-100% inclusive).
+        :type percent: int
+        :raises ValueError: If the percentage is out of the range 1-100.
+        """
+        super().__init__(name, minimum_subtotal=minimum_subtotal)
+        if not 1 <= percent <= 100:
+            raise ValueError("Error creating basket threshold: out of range 1 - 100 %")
+        self._percent = percent
+
+    def apply_rule(self, cart: Cart, subtotal: int) -> int:
+        """
+        Calculate the discount on the order subtotal.
+
+        :param cart: Priced order lines keyed by ``id()`` of their product.
+        :type cart: Cart
+        :param subtotal: The order subtotal in cents, after product promotions.
+        :type subtotal: int
+        :return: The discount in cents, 0 below the threshold.
+        :rtype: int
+        """
+        if subtotal < self.minimum_subtotal.cents:
+            return 0
+        return round_half_up(subtotal * self._percent, 100)
+
+
+class CartRuleIndex:
+    """
+    Represents the set of cart rules active in a store, indexed for fast matching.
+
+    Product rules are indexed by their first required product, so only rules
+    whose products are in the cart are evaluated, however many rules exist.
+    Basket-wide rules are kept sorted by their minimum subtotal and found by
+    binary search. Only the basket-wide rule with the highest reached minimum
+    applies, as in tiered "spend more, save more" offers.
+    """
+
+    def __init__(self):
+        """Initializes an empty rule index."""
+        self._product_rules: dict[int, list[CartRule]] = {}
+        self._basket_minimums: list[tuple[int, int]] = []
+        self._basket_rules: dict[int, CartRule] = {}
+        # kept up to date by add_rule and remove_rule, as every order checks whether any rule exists
+        self._rule_count = 0
+
+    def add_rule(self, rule: CartRule):
+        """
+        Adds a rule to the index.
+
+        :param rule: The rule to add.
+        :type rule: CartRule
+        """
+        if rule.products:
+            self._product_rules.setdefault(id(rule.products[0]), []).append(rule)
+        else:
+            insort(self._basket_minimums, (rule.minimum_subtotal.cents, id(rule)))
+            self._basket_rules[id(rule)] = rule
+        self._rule_count += 1
+
+    def remove_rule(self, rule: CartRule):
+        """
+        Removes a rule from the index.
+
+        :param rule: The rule to remove.
+        :type rule: CartRule
+        :raises ValueError: If the rule is not in the index.
+        """
+        if rule.products:
+            rules = self._product_rules.get(id(rule.products[0]), [])
+            rules.remove(rule)
+            if not rules:
+                del self._product_rules[id(rule.products[0])]
+        else:
+            self._basket_minimums.remove((rule.minimum_subtotal.cents, id(rule)))
+            del self._basket_rules[id(rule)]
+        self._rule_count -= 1
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rules in the index.
+
+        :return: Count of product and basket-wide rules.
+        :rtype: int
+        """
+        return self._rule_count
+
+    def get_discount(self, lines: list[tuple["Product", int]], line_prices: list[int]) -> int:
+        """
+        Calculates the total discount of all rules matching an order.
+
+        Product rules are evaluated first; the basket-wide rule is matched
+        against the subtotal left after their discounts.
+
+        :param lines: Order lines as (product, quantity) tuples.
+        :type lines: list[tuple[Product, int]]
+        :param line_prices: Price of every line in cents, after product promotions.
+        :type line_prices: list[int]
+        :return: The discount in cents.
+        :rtype: int
+        """
+        subtotal = sum(line_prices)
+        cart: Cart = {}
+        for (product, quantity), price in zip(lines, line_prices):
+            _, cart_quantity, cart_price = cart.get(id(product), (product, 0, 0))
+            cart[id(product)] = (product, cart_quantity + quantity, cart_price + price)
+
+        discount = 0
+        for key in cart:
+            for rule in self._product_rules.get(key, ()):
+                if subtotal >= rule.minimum_subtotal.cents:
+                    discount += rule.apply_rule(cart, subtotal)
+
+        subtotal -= discount
+        reached = bisect_right(self._basket_minimums, (subtotal, float("inf")))
+        if reached:
+            _, rule_key = self._basket_minimums[reached - 1]
+            discount += self._basket_rules[rule_key].apply_rule(cart, subtotal)
+
+        return min(discount, sum(line_prices))
@@ -0,0 +1,351 @@
+import csv
+import json
+import math
+import os
+from itertools import islice
+from typing import Callable, Iterable, Iterator, Sequence
+
+from products import Product, NonStockedProduct, LimitedProduct
+
+# Columns of a catalog file, in the order they are written
+FIELDS = ("type", "name", "price", "quantity", "maximum")
+PRODUCT_TYPES: dict[str, type[Product]] = {
+    "product": Product,
+    "non_stocked": NonStockedProduct,
+    "limited": LimitedProduct,
+}
+# Rows are validated and turned into products this many at a time. Small
+# batches keep the rows waiting in memory few, which keeps garbage collection cheap.
+BATCH_SIZE = 1_000
+
+
+def read_catalog(path: str, batch_size: int = BATCH_SIZE) -> Iterator[Product]:
+    """
+    Reads products from a CSV or JSON Lines catalog file, chosen by the file extension.
+
+    :param path: Path to a ``.csv`` or ``.jsonl`` file.
+    :type path: str
+    :param batch_size: Number of rows validated together.
+    :type batch_size: int
+    :return: Iterator of the products in the file, in file order.
+    :rtype: Iterator[Product]
+    :raises ValueError: If the file type is not supported or a row is invalid.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return read_csv(path, batch_size)
+    if extension == ".jsonl":
+        return read_jsonl(path, batch_size)
+    raise ValueError(f"Error importing catalog: unsupported file type '{extension}', use .csv or .jsonl")
+
+
+def write_catalog(path: str, products: Iterable[Product]) -> int:
+    """
+    Writes products to a CSV or JSON Lines catalog file, chosen by the file extension.
+
+    :param path: Path to a ``.csv`` or ``.jsonl`` file.
+    :type path: str
+    :param products: Products to write, e.g. ``Store.products``.
+    :type products: Iterable[Product]
+    :return: Number of rows written.
+    :rtype: int
+    :raises ValueError: If the file type is not supported.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".csv":
+        return write_csv(path, products)
+    if extension == ".jsonl":
+        return write_jsonl(path, products)
+    raise ValueError(f"Error exporting catalog: unsupported file type '{extension}', use .csv or .jsonl")
+
+
+def read_csv(path: str, batch_size: int = BATCH_SIZE) -> Iterator[Product]:
+    """
+    Reads products from a CSV catalog file with a header row naming the columns in ``FIELDS``.
+
+    The file is streamed: only one batch of rows is held in memory at a time,
+    so catalogs of any size can be read.
+
+    :param path: Path to the CSV file.
+    :type path: str
+    :param batch_size: Number of rows validated together.
+    :type batch_size: int
+    :return: Iterator of the products in the file.
+    :rtype: Iterator[Product]
+    :raises ValueError: If the header misses a column or a row is invalid.
+    """
+    with open(path, newline="", encoding="utf-8") as csv_file:
+        reader = csv.reader(csv_file)
+        header = next(reader, [])
+        missing = [field for field in FIELDS if field not in header]
+        if missing:
+            raise ValueError(f"Error importing catalog: missing columns {', '.join(missing)}")
+        columns = [header.index(field) for field in FIELDS]
+
+        first_row = 1
+        while batch := list(islice(reader, batch_size)):
+            try:
+                values = [[row[column] for row in batch] for column in columns]
+            except IndexError:
+                # rows with trailing columns left out are padded with empty values
+                values = [[row[column] if column < len(row) else "" for row in batch] for column in columns]
+            yield from _build_products(*values, rows=range(first_row, first_row + len(batch)), from_text=True)
+            first_row += len(batch)
+
+
+def read_jsonl(path: str, batch_size: int = BATCH_SIZE) -> Iterator[Product]:
+    """
+    Reads products from a JSON Lines catalog file, one JSON object with the keys in ``FIELDS`` per line.
+
+    ``quantity`` may be left out for non-stocked products and ``maximum``
+    for all but limited products. Blank lines are skipped.
+
+    :param path: Path to the JSON Lines file.
+    :type path: str
+    :param batch_size: Number of rows validated together.
+    :type batch_size: int
+    :return: Iterator of the products in the file.
+    :rtype: Iterator[Product]
+    :raises ValueError: If a line is not a JSON object or a row is invalid.
+    """
+    with open(path, encoding="utf-8") as jsonl_file:
+        first_row = 1
+        while batch := list(islice(jsonl_file, batch_size)):
+            records = []
+            # rows are numbered by line, so blank lines are counted
+            rows = []
+            for row, line in enumerate(batch, start=first_row):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as error:
+                    raise ValueError(f"Error importing catalog: row {row}: {error}")
+                if not isinstance(record, dict):
+                    raise ValueError(f"Error importing catalog: row {row}: not a JSON object")
+                records.append(record)
+                rows.append(row)
+            defaults = {"quantity": 0}
+            values = [[record.get(field, defaults.get(field)) for record in records] for field in FIELDS]
+            yield from _build_products(*values, rows=rows, from_text=False)
+            first_row += len(batch)
+
+
+def write_csv(path: str, products: Iterable[Product]) -> int:
+    """
+    Writes products to a CSV catalog file readable by ``read_csv``.
+
+    :param path: Path to the CSV file, overwritten if it exists.
+    :type path: str
+    :param products: Products to write.
+    :type products: Iterable[Product]
+    :return: Number of rows written.
+    :rtype: int
+    """
+    count = 0
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(FIELDS)
+        for row in _product_rows(products):
+            writer.writerow("" if value is None else value for value in row)
+            count += 1
+    return count
+
+
+def write_jsonl(path: str, products: Iterable[Product]) -> int:
+    """
+    Writes products to a JSON Lines catalog file readable by ``read_jsonl``.
+
+    :param path: Path to the JSON Lines file, overwritten if it exists.
+    :type path: str
+    :param products: Products to write.
+    :type products: Iterable[Product]
+    :return: Number of rows written.
+    :rtype: int
+    """
+    count = 0
+    with open(path, "w", encoding="utf-8") as jsonl_file:
+        for row in _product_rows(products):
+            record = {field: value for field, value in zip(FIELDS, row) if value is not None}
+            jsonl_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+    return count
+
+
+def _product_rows(products: Iterable[Product]) -> Iterator[tuple]:
+    """
+    Turns products into catalog rows.
+
+    :param products: Products to convert.
+    :type products: Iterable[Product]
+    :return: Iterator of rows with the values of ``FIELDS``, None for values the product type lacks.
+    :rtype: Iterator[tuple]
+    """
+    for product in products:
+        if isinstance(product, NonStockedProduct):
+            yield "non_stocked", product.name, product.price, None, None
+        elif isinstance(product, LimitedProduct):
+            yield "limited", product.name, product.price, product.quantity, product.maximum
+        else:
+            yield "product", product.name, product.price, product.quantity, None
+
+
+def _to_number(text: str, empty: int | None) -> int | float | None:
+    """
+    Parses a number read from a text file.
+
+    :param text: Text of a whole or decimal number.
+    :type text: str
+    :param empty: Value of an empty text.
+    :type empty: int | None
+    :return: The number, an int if the text has no fraction, None if the text is not a number.
+    :rtype: int | float | None
+    """
+    if text == "":
+        return empty
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _to_numbers(texts: list[str], empty: int | None) -> list[int | float | None]:
+    """
+    Parses a column of numbers read from a text file, in one pass when all of them are whole numbers.
+
+    :param texts: Texts of whole or decimal numbers.
+    :type texts: list[str]
+    :param empty: Value of an empty text.
+    :type empty: int | None
+    :return: The numbers, None for texts which are not numbers.
+    :rtype: list[int | float | None]
+    """
+    try:
+        return list(map(int, texts))
+    except ValueError:
+        return [_to_number(text, empty) for text in texts]
+
+
+def _check_column(valid: bool, values: list, is_valid: Callable[[object], bool], rows: Sequence[int], message: str):
+    """
+    Raises an error for the first invalid value of a column that failed a bulk check.
+
+    The single value check decides: if it finds no invalid value, the column is accepted.
+
+    :param valid: Result of the bulk check of the whole column.
+    :type valid: bool
+    :param values: Values of the column.
+    :type values: list
+    :param is_valid: Check of a single value, used to find the invalid row.
+    :type is_valid: Callable[[object], bool]
+    :param rows: Row number of every value, for the error message.
+    :type rows: Sequence[int]
+    :param message: Description of the requirement the value breaks.
+    :type message: str
+    :raises ValueError: If the column is not valid.
+    """
+    if valid:
+        return
+    index = next((index for index, value in enumerate(values) if not is_valid(value)), None)
+    if index is not None:
+        raise ValueError(f"Error importing catalog: row {rows[index]}: {message}")
+
+
+def _all_finite(numbers: list) -> bool:
+    """
+    Checks that all numbers are finite, with a single pass running in C.
+
+    :param numbers: Ints and floats.
+    :type numbers: list
+    :return: False if any number is infinite or NaN, or an int too large to be a float.
+    :rtype: bool
+    """
+    try:
+        return all(map(math.isfinite, numbers))
+    except OverflowError:
+        return False
+
+
+def _is_valid_price(price) -> bool:
+    """Checks a single price: a finite, non-negative int or float that fits a float."""
+    return type(price) in (int, float) and _all_finite([price]) and price >= 0
+
+
+def _is_valid_quantity(quantity) -> bool:
+    """Checks a single quantity: a non-negative int."""
+    return type(quantity) is int and quantity >= 0
+
+
+def _build_products(types: list, names: list, prices: list, quantities: list, maximums: list,
+                    rows: Sequence[int], from_text: bool) -> list[Product]:
+    """
+    Validates a batch of catalog rows column by column and creates their products.
+
+    Every column is checked with a few passes over the whole batch, and the
+    products are then created per product type, without validating each field again.
+
+    :param types: Product type of every row, a key of ``PRODUCT_TYPES``.
+    :type types: list
+    :param names: Name of every row.
+    :type names: list
+    :param prices: Price of every row.
+    :type prices: list
+    :param quantities: Quantity of every row.
+    :type quantities: list
+    :param maximums: Maximum per order of every row, used by limited products.
+    :type maximums: list
+    :param rows: Row number of every row in the file, for error messages.
+    :type rows: Sequence[int]
+    :param from_text: Whether numbers are still text, as read from CSV.
+    :type from_text: bool
+    :return: The products of the rows.
+    :rtype: list[Product]
+    :raises ValueError: If any row is invalid.
+    """
+    if not types:
+        return []
+
+    if from_text:
+        prices = _to_numbers(prices, None)
+        quantities = _to_numbers(quantities, 0)
+        maximums = _to_numbers(maximums, None)
+
+    # every column is first checked as a whole with passes running in C; the
+    # row by row checks only run to find the invalid row of a failed column
+    # types are checked to be strings first, as JSON lists and objects cannot be put in a set
+    _check_column(set(map(type, types)) == {str} and set(types) <= PRODUCT_TYPES.keys(), types,
+                  lambda kind: type(kind) is str and kind in PRODUCT_TYPES,
+                  rows, f"type must be one of {', '.join(PRODUCT_TYPES)}")
+    _check_column(set(map(type, names)) == {str} and "" not in names, names,
+                  lambda name: isinstance(name, str) and name != "", rows, "name must be a non-empty string")
+    _check_column(set(map(type, prices)) <= {int, float} and _all_finite(prices) and min(prices) >= 0,
+                  prices, _is_valid_price, rows, "price must be a non-negative number")
+    _check_column(set(map(type, quantities)) == {int} and min(quantities) >= 0,
+                  quantities, _is_valid_quantity, rows, "quantity must be a non-negative whole number")
+    limited_maximums = [maximum if kind == "limited" else 1 for kind, maximum in zip(types, maximums)]
+    _check_column(set(map(type, limited_maximums)) == {int} and min(limited_maximums) > 0, limited_maximums,
+                  lambda maximum: type(maximum) is int and maximum > 0,
+                  rows, "maximum of a limited product must be a positive whole number")
+
+    kinds = set(types)
+    if len(kinds) == 1:
+        kind = kinds.pop()
+        columns = {"maximum": maximums} if kind == "limited" else {}
+        return PRODUCT_TYPES[kind]._from_columns(names, prices, quantities, **columns)
+
+    products: list[Product | None] = [None] * len(types)
+    for kind, product_type in PRODUCT_TYPES.items():
+        indexes = [index for index, row_kind in enumerate(types) if row_kind == kind]
+        if not indexes:
+            continue
+        columns = {"maximum": [maximums[index] for index in indexes]} if kind == "limited" else {}
+        created = product_type._from_columns([names[index] for index in indexes],
+                                             [prices[index] for index in indexes],
+                                             [quantities[index] for index in indexes], **columns)
+        for index, product in zip(indexes, created):
+            products[index] = product
+    return products
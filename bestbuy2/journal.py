@@ -0,0 +1,272 @@
+import os
+import struct
+import sys
+import threading
+import zlib
+from array import array
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from products import Product
+
+SNAPSHOT_FILE = "inventory.snapshot"
+LOG_FILE = "inventory.log"
+
+# magic, format version, CRC32 of the body, product count, length of the names block
+_SNAPSHOT_HEADER = struct.Struct("<4sHIQQ")
+_SNAPSHOT_MAGIC = b"BBSN"
+_SNAPSHOT_VERSION = 1
+# payload length, CRC32 of the payload
+_RECORD_HEADER = struct.Struct("<II")
+_NAME_LENGTH = struct.Struct("<H")
+_QUANTITY = struct.Struct("<q")
+
+
+class InventoryJournal:
+    """
+    Represents the durable stock of a store, kept in a directory as a binary snapshot and an append-only log.
+
+    Every order appends one log record with the resulting quantity of each
+    product it changed. Records hold quantities rather than signed deltas,
+    so replaying a record twice gives the same stock. Once ``checkpoint_every``
+    records have been written, the store writes a new snapshot and the log
+    starts over.
+
+    The snapshot stores all product names in one block and all quantities in
+    one array of 64-bit integers, so loading it reads two buffers instead of
+    parsing a record per product. Products are matched by name.
+
+    A torn record at the end of the log, e.g. after a crash mid-write, is
+    cut off, so the stock is restored up to the last complete order. A
+    damaged record before the end stops the load and leaves the log as it is.
+    """
+
+    def __init__(self, directory: str, checkpoint_every: int = 10_000, fsync: bool = False):
+        """
+        Initializes a journal stored in the given directory, creating the directory if needed.
+
+        :param directory: Directory holding the snapshot and the log.
+        :type directory: str
+        :param checkpoint_every: Number of log records after which a new snapshot is due.
+        :type checkpoint_every: int
+        :param fsync: Whether to force every record to disk before the order completes.
+                      Safer against power loss, but much slower.
+        :type fsync: bool
+        :raises ValueError: If checkpoint_every is not positive.
+        """
+        if not isinstance(checkpoint_every, int) or checkpoint_every <= 0:
+            raise ValueError("Invalid journal set: checkpoint_every must be a positive whole number")
+
+        os.makedirs(directory, exist_ok=True)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_FILE)
+        self._log_path = os.path.join(directory, LOG_FILE)
+        self._checkpoint_every = checkpoint_every
+        self._fsync = fsync
+        self._stock: dict[str, int] = {}
+        self._records_since_checkpoint = 0
+        self._log = None
+        self._lock = threading.RLock()
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Returns the lock serializing log appends with snapshots."""
+        return self._lock
+
+    @property
+    def checkpoint_due(self) -> bool:
+        """Returns whether enough records have been logged to write a new snapshot."""
+        return self._records_since_checkpoint >= self._checkpoint_every
+
+    def load(self) -> dict[str, int]:
+        """
+        Reads the latest snapshot and replays the log written after it.
+
+        :return: Quantity of every journaled product, keyed by product name.
+        :rtype: dict[str, int]
+        :raises ValueError: If the snapshot or a record before the end of the log is damaged.
+        """
+        with self._lock:
+            self._stock = self._read_snapshot()
+            self._records_since_checkpoint = self._replay_log()
+            return dict(self._stock)
+
+    def _read_snapshot(self) -> dict[str, int]:
+        """
+        Reads product quantities from the snapshot file.
+
+        :return: Quantities keyed by product name, empty without a snapshot.
+        :rtype: dict[str, int]
+        :raises ValueError: If the snapshot is damaged or of an unknown format.
+        """
+        try:
+            with open(self._snapshot_path, "rb") as snapshot_file:
+                data = snapshot_file.read()
+        except FileNotFoundError:
+            return {}
+
+        if len(data) < _SNAPSHOT_HEADER.size:
+            raise ValueError(f"Error loading inventory snapshot: '{self._snapshot_path}' is truncated")
+        magic, version, checksum, count, names_length = _SNAPSHOT_HEADER.unpack_from(data)
+        body = memoryview(data)[_SNAPSHOT_HEADER.size:]
+        if magic != _SNAPSHOT_MAGIC or version != _SNAPSHOT_VERSION:
+            raise ValueError(f"Error loading inventory snapshot: '{self._snapshot_path}' has an unknown format")
+        if len(body) != names_length + count * _QUANTITY.size or zlib.crc32(body) != checksum:
+            raise ValueError(f"Error loading inventory snapshot: '{self._snapshot_path}' is damaged")
+        if count == 0:
+            return {}
+
+        names = bytes(body[:names_length]).decode("utf-8").split("\0")
+        quantities = array("q")
+        quantities.frombytes(body[names_length:])
+        if sys.byteorder == "big":
+            quantities.byteswap()
+        return dict(zip(names, quantities))
+
+    def _replay_log(self) -> int:
+        """
+        Applies the log records to the loaded stock and cuts off a torn record at the end.
+
+        A record is torn if the log ends inside its header or payload, or if it
+        is the last record and fails its checksum. Any other damaged record
+        means the log cannot be trusted, so it is left as it is.
+
+        :return: Number of complete records in the log.
+        :rtype: int
+        :raises ValueError: If a record before the end of the log is damaged.
+        """
+        try:
+            with open(self._log_path, "rb") as log_file:
+                data = log_file.read()
+        except FileNotFoundError:
+            return 0
+
+        offset = records = 0
+        while offset + _RECORD_HEADER.size <= len(data):
+            length, checksum = _RECORD_HEADER.unpack_from(data, offset)
+            start = offset + _RECORD_HEADER.size
+            end = start + length
+            if end > len(data):
+                break
+            payload = data[start:end]
+            try:
+                if zlib.crc32(payload) != checksum:
+                    raise ValueError("checksum mismatch")
+                changes = _decode_record(payload)
+            except (ValueError, struct.error) as e:
+                if end == len(data):
+                    break
+                raise ValueError(f"Error loading inventory log: '{self._log_path}', "
+                                 f"record {records + 1} at byte {offset} is damaged: {e}") from e
+            self._stock.update(changes)
+            offset = end
+            records += 1
+
+        if offset != len(data):
+            with open(self._log_path, "r+b") as log_file:
+                log_file.truncate(offset)
+        return records
+
+    def record(self, changes: Iterable[tuple[str, int]]):
+        """
+        Appends one record of changed quantities to the log. Hold ``lock`` while the stock changes are made.
+
+        :param changes: (name, new quantity) pairs of the products changed by an order.
+        :type changes: Iterable[tuple[str, int]]
+        :raises OSError: If the record cannot be written.
+        """
+        changes = list(changes)
+        payload = _encode_record(changes)
+        with self._lock:
+            if self._log is None:
+                self._log = open(self._log_path, "ab")
+            self._log.write(_RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload)
+            self._log.flush()
+            if self._fsync:
+                os.fsync(self._log.fileno())
+            self._stock.update(changes)
+            self._records_since_checkpoint += 1
+
+    def checkpoint(self, products: Iterable["Product"]):
+        """
+        Writes a snapshot of the journaled stock merged with the given products, then empties the log.
+
+        The snapshot is written to a temporary file and moved into place, so a
+        crash while writing leaves the previous snapshot and log intact.
+
+        :param products: Products whose current quantities are saved.
+        :type products: Iterable[Product]
+        :raises OSError: If the snapshot cannot be written.
+        """
+        with self._lock:
+            for product in products:
+                self._stock[product.name] = product.quantity
+
+            names = "\0".join(self._stock).encode("utf-8")
+            quantities = array("q", self._stock.values())
+            if sys.byteorder == "big":
+                quantities.byteswap()
+            body = names + quantities.tobytes()
+            header = _SNAPSHOT_HEADER.pack(_SNAPSHOT_MAGIC, _SNAPSHOT_VERSION, zlib.crc32(body),
+                                           len(self._stock), len(names))
+
+            temporary_path = self._snapshot_path + ".tmp"
+            with open(temporary_path, "wb") as snapshot_file:
+                snapshot_file.write(header)
+                snapshot_file.write(body)
+                snapshot_file.flush()
+                os.fsync(snapshot_file.fileno())
+            os.replace(temporary_path, self._snapshot_path)
+
+            if self._log is not None:
+                self._log.close()
+            self._log = open(self._log_path, "wb")
+            self._records_since_checkpoint = 0
+
+    def close(self):
+        """Closes the log file. The journal reopens it on the next record."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+
+
+def _encode_record(changes: list[tuple[str, int]]) -> bytes:
+    """
+    Encodes the changed quantities of an order as a log record payload.
+
+    :param changes: (name, new quantity) pairs.
+    :type changes: list[tuple[str, int]]
+    :return: The payload, a name length, name and quantity per product.
+    :rtype: bytes
+    """
+    parts = []
+    for name, quantity in changes:
+        encoded_name = name.encode("utf-8")
+        parts.append(_NAME_LENGTH.pack(len(encoded_name)))
+        parts.append(encoded_name)
+        parts.append(_QUANTITY.pack(quantity))
+    return b"".join(parts)
+
+
+def _decode_record(payload: bytes) -> list[tuple[str, int]]:
+    """
+    Decodes a log record payload written by ``_encode_record``.
+
+    :param payload: The record payload.
+    :type payload: bytes
+    :return: (name, new quantity) pairs.
+    :rtype: list[tuple[str, int]]
+    :raises struct.error: If the payload ends inside a name length or quantity.
+    :raises UnicodeDecodeError: If a name is not valid UTF-8.
+    """
+    changes = []
+    offset = 0
+    while offset < len(payload):
+        (name_length,) = _NAME_LENGTH.unpack_from(payload, offset)
+        offset += _NAME_LENGTH.size
+        name = payload[offset:offset + name_length].decode("utf-8")
+        offset += name_length
+        (quantity,) = _QUANTITY.unpack_from(payload, offset)
+        offset += _QUANTITY.size
+        changes.append((name, quantity))
+    return changes
@@ -0,0 +1,157 @@
+"""
+Load test client for the checkout service.
+
+Start the service, then run e.g.:
+
+    python service.py
+    python load_client.py --connections 50 --requests 200 --batch 1
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import time
+
+from service import read_message
+
+
+async def request(reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                  method: str, path: str, payload: dict | None = None) -> tuple[int, dict]:
+    """
+    Sends one request over an open keep-alive connection and reads its response.
+
+    :param reader: Stream of the responses.
+    :type reader: asyncio.StreamReader
+    :param writer: Stream of the requests.
+    :type writer: asyncio.StreamWriter
+    :param method: The HTTP method.
+    :type method: str
+    :param path: The request path with its query.
+    :type path: str
+    :param payload: JSON body of the request, or None for no body.
+    :type payload: dict | None
+    :return: The response status and JSON payload.
+    :rtype: tuple[int, dict]
+    :raises ConnectionError: If the service closed the connection.
+    """
+    body = json.dumps(payload).encode() if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: checkout\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body)
+    await writer.drain()
+    response = await read_message(reader)
+    if response is None:
+        raise ConnectionError("Error reading response: connection closed by the service")
+    start_line, _, response_body = response
+    return int(start_line.split(" ")[1]), json.loads(response_body)
+
+
+async def _run_connection(host: str, port: int, names: list[str], request_count: int, batch: int,
+                          rng: random.Random, latencies: list[float]) -> tuple[int, int]:
+    """
+    Places orders of one random product each over one connection, one request at a time.
+
+    :param host: Address of the service.
+    :type host: str
+    :param port: Port of the service.
+    :type port: int
+    :param names: Names of the products to order from.
+    :type names: list[str]
+    :param request_count: Number of requests to send.
+    :type request_count: int
+    :param batch: Orders per request; 1 uses ``/orders``, more use ``/orders/batch``.
+    :type batch: int
+    :param rng: Random generator choosing the products.
+    :type rng: random.Random
+    :param latencies: List collecting the latency of every request in seconds.
+    :type latencies: list[float]
+    :return: Numbers of placed and rejected orders.
+    :rtype: tuple[int, int]
+    """
+    placed = rejected = 0
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for _ in range(request_count):
+            orders = [{"items": [{"name": rng.choice(names), "quantity": 1}]} for _ in range(batch)]
+            start = time.perf_counter()
+            if batch == 1:
+                status, payload = await request(reader, writer, "POST", "/orders", orders[0])
+                results = [payload]
+            else:
+                status, payload = await request(reader, writer, "POST", "/orders/batch", {"orders": orders})
+                results = payload.get("results", [payload])
+            latencies.append(time.perf_counter() - start)
+            for result in results:
+                if "total" in result:
+                    placed += 1
+                else:
+                    rejected += 1
+    finally:
+        writer.close()
+    return placed, rejected
+
+
+async def run_load(host: str, port: int, connections: int, request_count: int, batch: int,
+                   seed: int = 0) -> dict:
+    """
+    Loads the service with concurrent connections placing orders and measures request latency.
+
+    :param host: Address of the service.
+    :type host: str
+    :param port: Port of the service.
+    :type port: int
+    :param connections: Number of concurrent connections.
+    :type connections: int
+    :param request_count: Number of requests per connection.
+    :type request_count: int
+    :param batch: Orders per request.
+    :type batch: int
+    :param seed: Seed of the random product choice.
+    :type seed: int
+    :return: Placed and rejected orders, requests per second and p50 and p99 latency in milliseconds.
+    :rtype: dict
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, listing = await request(reader, writer, "GET", "/products?page=0&size=1000")
+    finally:
+        writer.close()
+    names = [product["name"] for product in listing["products"]]
+    if not names:
+        raise ValueError("Error running load test: the store has no active products")
+
+    latencies: list[float] = []
+    start = time.perf_counter()
+    counts = await asyncio.gather(*(
+        _run_connection(host, port, names, request_count, batch, random.Random(seed + index), latencies)
+        for index in range(connections)))
+    elapsed = time.perf_counter() - start
+
+    cut_points = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        "placed": sum(placed for placed, _ in counts),
+        "rejected": sum(rejected for _, rejected in counts),
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": cut_points[49] * 1000,
+        "p99_ms": cut_points[98] * 1000,
+    }
+
+
+def main():
+    """Parses the command line, runs the load test and prints its report."""
+    parser = argparse.ArgumentParser(description="Load test for the checkout service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=200, help="Requests per connection.")
+    parser.add_argument("--batch", type=int, default=1, help="Orders per request.")
+    args = parser.parse_args()
+
+    report = asyncio.run(run_load(args.host, args.port, args.connections, args.requests, args.batch))
+    print(f"orders placed: {report['placed']}, rejected: {report['rejected']}")
+    print(f"throughput: {report['requests_per_second']:.0f} requests/s")
+    print(f"latency p50: {report['p50_ms']:.2f} ms, p99: {report['p99_ms']:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,73 @@
+import argparse
 import sys
+from itertools import islice
+from typing import Iterator
 
+from catalog_io import read_catalog
+from journal import InventoryJournal
 from products import Product, NonStockedProduct, LimitedProduct
+from profiling import Profiler
 from promotions import SecondHalfPrice, ThirdOneFree, PercentDiscount
 from store import Store
 
 
-def print_store_products(store: Store):
+# Number of products shown per page of the product listing
+PAGE_SIZE = 20
+
+
+def print_products(store: Store, products: list[Product], first_number: int = 1):
     """
-    Prints a numbered list of all products in the store with their details.
+    Prints a numbered list of products with their details.
 
-    :param store: Store object exposing its products for displaying.
+    :param store: Store object providing the formatted product lines.
     :type store: Store
+    :param products: Products to display.
+    :type products: list[Product]
+    :param first_number: Number of the first product in the list.
+    :type first_number: int
     """
     print("------")
-    for index, product in enumerate(store.get_all_products()):
-        print(f"{index + 1}. {product}")
+    for number, product in enumerate(products, first_number):
+        print(f"{number}. {store.get_product_line(product)}")
     print("------")
 
 
+def print_store_page(store: Store, products: Iterator[Product], page: int) -> bool:
+    """
+    Prints the next page of the store's products, numbered across all pages.
+
+    :param store: Store object exposing its products for displaying.
+    :type store: Store
+    :param products: Iterator over the store, positioned at the start of the page.
+    :type products: Iterator[Product]
+    :param page: Index of the page, starting at 0.
+    :type page: int
+    :return: True if more pages follow, otherwise False.
+    :rtype: bool
+    """
+    page_count = store.get_page_count(PAGE_SIZE)
+    print_products(store, list(islice(products, PAGE_SIZE)), page * PAGE_SIZE + 1)
+    print(f"Page {page + 1} of {max(page_count, 1)}")
+    return page + 1 < page_count
+
+
+def print_store_products(store: Store):
+    """
+    Prints a numbered list of all products in the store with their details, one page at a time.
+
+    The pages are taken from one iteration over the store, so the listing is never copied as a whole.
+
+    :param store: Store object exposing its products for displaying.
+    :type store: Store
+    """
+    products = iter(store)
+    page = 0
+    while print_store_page(store, products, page):
+        if input("Press enter for the next page, or type anything to stop: ") != "":
+            break
+        page += 1
+
+
 def print_store_items_amount(store: Store):
     """
     Prints the total quantity of all items assigned to the store instance.
@@ -28,22 +78,29 @@ def print_store_items_amount(store: Store):
     print(f"Total of {store.get_total_quantity()} items in store")
 
 
-def make_order(store: Store):
+def make_order(store: Store, products: list[Product] | None = None):
     """
     Navigates the user through the order creation process.
 
     Steps:
-    - Display the products available in the store.
+    - Display the first page of products available in the store, or the given products.
     - Repeatedly prompt the user to add a new item consisting of a
       Product instance and ordered quantity to the shopping list.
     - Finalize the order creation when the user provides empty input.
 
     :param store: Store object exposing its methods for managing ordered products it contains.
     :type store: Store
+    :param products: Products to choose from, e.g. search results. All active products by default,
+                     chosen by their number in the full product list.
+    :type products: list[Product] | None
     """
     shopping_list = []
 
-    print_store_products(store)
+    if products is None:
+        print_store_page(store, iter(store), 0)
+        print("Any product # from the full list can be ordered.")
+    else:
+        print_products(store, products)
     print("When you want to finish order, enter empty text.")
 
     while True:
@@ -55,7 +112,13 @@ def make_order(store: Store):
 
         try:
             product_index = int(selected_product_index) - 1
-            product = store.get_all_products()[product_index]
+            if products is None:
+                # walks the store up to the product; a negative number makes islice raise ValueError
+                product = next(islice(store, product_index, None), None)
+                if product is None:
+                    raise IndexError(product_index)
+            else:
+                product = products[product_index]
             quantity = int(quantity)
 
             item = (product, quantity)
@@ -74,6 +137,21 @@ def make_order(store: Store):
             print(e)
 
 
+def search_and_order(store: Store):
+    """
+    Searches products by name and lets the user order from the results.
+
+    :param store: Store object exposing its product search and ordering.
+    :type store: Store
+    """
+    query = input("Search products by name: ")
+    products = store.search_products(query)
+    if not products:
+        print("No products found!")
+        return
+    make_order(store, products)
+
+
 def start(store: Store):
     """
     Provides a terminal user interface to the user.
@@ -88,6 +166,7 @@ def start(store: Store):
         lambda: print_store_products(store),
         lambda: print_store_items_amount(store),
         lambda: make_order(store),
+        lambda: search_and_order(store),
         sys.exit
     ]
 
@@ -97,7 +176,8 @@ def start(store: Store):
         print("1. List all products in store")
         print("2. Show total amount in store")
         print("3. Make an order")
-        print("4. Quit")
+        print("4. Search products and order")
+        print("5. Quit")
 
         try:
             user_choice = int(input("Please choose a number: "))
@@ -113,11 +193,12 @@ def start(store: Store):
         print()
 
 
-def main():
+def build_default_catalog() -> list[Product]:
     """
-    Main method to start the program.
+    Builds the built-in inventory with its promotions.
 
-    Sets up the initial stock of inventory, promotions, and starts the store.
+    :return: The products of the built-in inventory.
+    :rtype: list[Product]
     """
     # setup initial stock of inventory
     product_list = [
@@ -138,8 +219,48 @@ def main():
     product_list[1].promotion = third_one_free
     product_list[3].promotion = thirty_percent
 
-    best_buy = Store(product_list)
-    start(best_buy)
+    return product_list
+
+
+def main():
+    """
+    Main method to start the program.
+
+    Sets up the initial stock of inventory, promotions, and starts the store.
+    The inventory is read from a CSV or JSON Lines catalog file when its path is
+    given as the first command line argument, otherwise the built-in inventory is used.
+    Stock sold in earlier runs is restored from the journal in the ``data`` directory.
+    With ``--profile`` the order flow is timed and the stats are printed on exit,
+    or written to a JSON file when its path follows the flag.
+    """
+    parser = argparse.ArgumentParser(description="Best Buy store terminal app.")
+    parser.add_argument("catalog", nargs="?", help="CSV or JSON Lines catalog, the built-in inventory by default.")
+    parser.add_argument("--profile", nargs="?", const="-", metavar="PATH",
+                        help="Time the order flow and print the stats on exit, or write them to PATH as JSON.")
+    args = parser.parse_args()
+
+    if args.catalog is not None:
+        try:
+            product_list = list(read_catalog(args.catalog))
+        except (OSError, ValueError) as e:
+            print(e)
+            sys.exit(1)
+    else:
+        product_list = build_default_catalog()
+
+    profiler = Profiler()
+    if args.profile is not None:
+        profiler.enable()
+
+    best_buy = Store(product_list, journal=InventoryJournal("data"))
+    try:
+        start(best_buy)
+    finally:
+        best_buy.checkpoint()
+        if args.profile == "-":
+            print(profiler.report())
+        elif args.profile is not None:
+            profiler.export(args.profile)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,202 @@
+import math
+import operator
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+
+CENTS_PER_UNIT = 100
+# Floats below this magnitude are converted to whole cents without Decimal,
+# as they are much more precise than a cent
+FAST_FLOAT_LIMIT = 2 ** 40
+
+
+def round_half_up(numerator, denominator: int):
+    """
+    Divides whole numbers and rounds the result half up, without leaving integer arithmetic.
+
+    Works the same for plain integers and for NumPy integer arrays.
+
+    :param numerator: Non-negative dividend, an int or an integer array.
+    :param denominator: Positive divisor.
+    :type denominator: int
+    :return: The rounded quotient, of the same kind as the numerator.
+    """
+    return (2 * numerator + denominator) // (2 * denominator)
+
+
+class Money:
+    """
+    Represents an exact amount of money stored as a whole number of cents.
+
+    Unlike binary floats, sums and products of Money never drift, so order
+    totals always match what accounting expects. Money compares equal to
+    ints and floats of the same amount, e.g. ``Money(999) == 9.99`` and
+    ``Money(100) == 1``, and hashes like them.
+    """
+
+    __slots__ = ("_cents",)
+
+    def __init__(self, cents: int = 0):
+        """
+        Initializes a Money instance with the given amount of cents.
+
+        :param cents: The amount in cents.
+        :type cents: int
+        :raises ValueError: If cents is not a whole number.
+        """
+        if not isinstance(cents, int):
+            raise ValueError("Invalid money amount: cents must be an int")
+        self._cents = cents
+
+    @classmethod
+    def from_amount(cls, amount: "float | int | str | Decimal | Money") -> "Money":
+        """
+        Creates Money from an amount in whole currency units, rounded half up to cents.
+
+        Floats are converted through their shortest representation, so 9.99 becomes
+        exactly 999 cents.
+
+        :param amount: The amount of money, e.g. 9.99.
+        :type amount: float | int | str | Decimal | Money
+        :return: The amount as Money.
+        :rtype: Money
+        :raises ValueError: If the amount is not a number.
+        """
+        if isinstance(amount, Money):
+            return amount
+        if isinstance(amount, int):
+            return cls(amount * CENTS_PER_UNIT)
+        if type(amount) is float and -FAST_FLOAT_LIMIT < amount < FAST_FLOAT_LIMIT:
+            # a float this small is the nearest float to at most one whole number of cents;
+            # if it is one, its shortest representation is that number, so no Decimal is needed
+            cents = round(amount * CENTS_PER_UNIT)
+            if cents / CENTS_PER_UNIT == amount:
+                return cls(cents)
+        try:
+            cents = (Decimal(str(amount)) * CENTS_PER_UNIT).quantize(Decimal(1), rounding=ROUND_HALF_UP)
+        except ArithmeticError:
+            raise ValueError(f"Invalid money amount: '{amount}' is not a number")
+        return cls(int(cents))
+
+    @property
+    def cents(self) -> int:
+        """Returns the amount in cents."""
+        return self._cents
+
+    @property
+    def amount(self) -> Decimal:
+        """Returns the amount in whole currency units as an exact Decimal."""
+        return Decimal(self._cents).scaleb(-2)
+
+    def __add__(self, other):
+        """Adds Money or a plain amount to this amount."""
+        if isinstance(other, Money):
+            return Money(self._cents + other._cents)
+        if isinstance(other, (int, float, Decimal)):
+            return Money(self._cents + Money.from_amount(other)._cents)
+        return NotImplemented
+
+    def __radd__(self, other):
+        """Adds this amount to a plain amount, which makes ``sum()`` of Money work."""
+        return self.__add__(other)
+
+    def __sub__(self, other):
+        """Subtracts Money or a plain amount from this amount."""
+        if isinstance(other, Money):
+            return Money(self._cents - other._cents)
+        if isinstance(other, (int, float, Decimal)):
+            return Money(self._cents - Money.from_amount(other)._cents)
+        return NotImplemented
+
+    def __rsub__(self, other):
+        """Subtracts this amount from a plain amount."""
+        if isinstance(other, (int, float, Decimal)):
+            return Money(Money.from_amount(other)._cents - self._cents)
+        return NotImplemented
+
+    def __mul__(self, factor: int):
+        """Multiplies the amount by a whole number, e.g. a quantity of items."""
+        if isinstance(factor, int):
+            return Money(self._cents * factor)
+        return NotImplemented
+
+    def __rmul__(self, factor: int):
+        """Multiplies the amount by a whole number, e.g. a quantity of items."""
+        return self.__mul__(factor)
+
+    def __neg__(self):
+        """Returns the negated amount."""
+        return Money(-self._cents)
+
+    def _compare(self, other, compare):
+        """
+        Compares this amount with Money or a plain number.
+
+        Floats are compared by their shortest representation, the amount they are
+        converted to by ``from_amount``, so ``Money(999) == 9.99`` and ``Money(30) == 0.3``,
+        while ``0.1 + 0.2``, whose shortest representation is ``0.30000000000000004``, is more.
+        Decimals are not compared: no hash can match both ``9.99`` and ``Decimal("9.99")``.
+
+        :param other: Money, or an int or float amount in whole currency units.
+        :param compare: Comparison operator, e.g. ``operator.lt``.
+        :return: Result of the comparison, or NotImplemented for other types.
+        """
+        if isinstance(other, Money):
+            return compare(self._cents, other._cents)
+        if isinstance(other, int):
+            return compare(self._cents, other * CENTS_PER_UNIT)
+        if isinstance(other, float):
+            if not math.isfinite(other):
+                # any amount compares with infinities and NaN like zero does
+                return compare(0, other)
+            return compare(Fraction(self._cents, CENTS_PER_UNIT), Fraction(repr(other)))
+        return NotImplemented
+
+    def __eq__(self, other):
+        """Checks whether two amounts are equal."""
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        """Checks whether this amount is smaller than another."""
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        """Checks whether this amount is smaller than or equal to another."""
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        """Checks whether this amount is larger than another."""
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        """Checks whether this amount is larger than or equal to another."""
+        return self._compare(other, operator.ge)
+
+    def __hash__(self):
+        """Returns the hash of the amount, equal to the hash of plain numbers it equals."""
+        if self._cents % CENTS_PER_UNIT == 0:
+            return hash(self._cents // CENTS_PER_UNIT)
+        try:
+            # an equal float is the float closest to the amount, which is what the division returns
+            return hash(self._cents / CENTS_PER_UNIT)
+        except OverflowError:
+            return hash(self._cents)
+
+    def __bool__(self):
+        """Returns whether the amount is not zero."""
+        return self._cents != 0
+
+    def __float__(self):
+        """Returns the amount in whole currency units as a float."""
+        return self._cents / CENTS_PER_UNIT
+
+    def __format__(self, format_spec: str) -> str:
+        """Formats the amount like a Decimal, e.g. ``f"{total:>10}"``."""
+        return format(self.amount, format_spec)
+
+    def __str__(self) -> str:
+        """Returns the amount with two decimal places, e.g. ``1450.00``."""
+        return str(self.amount)
+
+    def __repr__(self) -> str:
+        """Returns a representation of the amount, e.g. ``Money('9.99')``."""
+        return f"Money('{self}')"
@@ -0,0 +1,105 @@
+from bisect import bisect_left
+from typing import Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from products import Product
+
+# Sort key of an indexed product: (unit price in cents, tie-breaker)
+PriceKey = tuple[int, int]
+
+
+class PriceIndex:
+    """
+    Represents products kept sorted by their unit price.
+
+    Keys and products are kept in two parallel lists sorted by key, so range
+    and top-k queries find their bounds by binary search and return a slice.
+    Products of the same price are ordered by a tie-breaker supplied by the
+    owner, e.g. the position of the product in a store.
+    """
+
+    def __init__(self, entries: Iterable[tuple[PriceKey, "Product"]] = ()):
+        """
+        Initializes the index with the given products, sorting them once.
+
+        :param entries: (key, product) pairs with unique keys.
+        :type entries: Iterable[tuple[PriceKey, Product]]
+        """
+        entries = sorted(entries, key=lambda entry: entry[0])
+        self._keys: list[PriceKey] = [key for key, _ in entries]
+        self._products: list["Product"] = [product for _, product in entries]
+
+    def add(self, key: PriceKey, product: "Product"):
+        """
+        Adds a product to the index.
+
+        :param key: The product's (price in cents, tie-breaker) key.
+        :type key: PriceKey
+        :param product: The product to add.
+        :type product: Product
+        """
+        index = bisect_left(self._keys, key)
+        self._keys.insert(index, key)
+        self._products.insert(index, product)
+
+    def remove(self, key: PriceKey):
+        """
+        Removes the product with the given key from the index.
+
+        :param key: The key the product was added with.
+        :type key: PriceKey
+        :raises ValueError: If no product has the key.
+        """
+        index = bisect_left(self._keys, key)
+        if index == len(self._keys) or self._keys[index] != key:
+            raise ValueError("Error updating price index: product is not in the index")
+        del self._keys[index]
+        del self._products[index]
+
+    def between(self, low_cents: int, high_cents: int) -> list["Product"]:
+        """
+        Returns the products priced between two prices, both inclusive.
+
+        :param low_cents: The lowest price in cents.
+        :type low_cents: int
+        :param high_cents: The highest price in cents.
+        :type high_cents: int
+        :return: The products in ascending order of price.
+        :rtype: list[Product]
+        """
+        start = bisect_left(self._keys, (low_cents,))
+        end = bisect_left(self._keys, (high_cents + 1,))
+        return self._products[start:end]
+
+    def cheapest(self, count: int) -> list["Product"]:
+        """
+        Returns the cheapest products.
+
+        :param count: Maximum number of products to return.
+        :type count: int
+        :return: The products in ascending order of price.
+        :rtype: list[Product]
+        """
+        return self._products[:max(count, 0)]
+
+    def most_expensive(self, count: int) -> list["Product"]:
+        """
+        Returns the most expensive products.
+
+        :param count: Maximum number of products to return.
+        :type count: int
+        :return: The products in descending order of price.
+        :rtype: list[Product]
+        """
+        if count <= 0:
+            return []
+        return self._products[:-count - 1:-1]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of indexed products.
+
+        :return: Count of products in the index.
+        :rtype: int
+        """
+        return len(self._keys)
@@ -0,0 +1,225 @@
+import threading
+import weakref
+from array import array
+from typing import Callable, Iterable, Iterator
+
+from money import Money, CENTS_PER_UNIT
+from products import Product, _stock_lock
+from promotions import Promotion
+
+
+class ProductTable:
+    """
+    Represents a compact, column-oriented catalog of stocked products.
+
+    Names, prices in cents, quantities and active flags are kept in one list
+    and in typed arrays instead of one object per product, which makes
+    loading very large catalogs much cheaper in memory. Promotions and observers are
+    rarely set, so they are kept in dictionaries holding only the rows that
+    have them.
+
+    Rows are handed out as lightweight ``ProductView`` objects, which behave
+    like a regular ``Product`` and can be added to a ``Store``. While a view
+    is in use, asking for the same row again returns the same view.
+    """
+
+    def __init__(self, rows: Iterable[tuple[str, float | int, int]] = ()):
+        """
+        Initializes a ProductTable with the given product rows.
+
+        :param rows: Iterable of (name, price, quantity) tuples.
+        :type rows: Iterable[tuple[str, float | int, int]]
+        :raises ValueError: If any name, price or quantity is invalid.
+        """
+        self._names: list[str] = []
+        self._prices = array("q")
+        self._quantities = array("q")
+        self._active = bytearray()
+        self._promotions: dict[int, Promotion] = {}
+        self._observers: dict[int, tuple[Callable, ...]] = {}
+        self._views: weakref.WeakValueDictionary[int, ProductView] = weakref.WeakValueDictionary()
+        self.extend(rows)
+
+    def append(self, name: str, price: float | int, quantity: int) -> "ProductView":
+        """
+        Adds a product row to the table.
+
+        :param name: The name of the product. Must not be empty.
+        :type name: str
+        :param price: The price of the product. Must be non-negative.
+        :type price: float | int
+        :param quantity: The quantity of the product in stock. Must be non-negative.
+        :type quantity: int
+        :return: View of the new row.
+        :rtype: ProductView
+        :raises ValueError: If name is empty, price is negative, or quantity is negative.
+        """
+        self.extend([(name, price, quantity)])
+        return self[len(self) - 1]
+
+    def extend(self, rows: Iterable[tuple[str, float | int, int]]):
+        """
+        Adds many product rows to the table without creating views for them.
+
+        :param rows: Iterable of (name, price, quantity) tuples.
+        :type rows: Iterable[tuple[str, float | int, int]]
+        :raises ValueError: If any name, price or quantity is invalid.
+        """
+        for name, price, quantity in rows:
+            Product._validate_name(name)
+            Product._validate_price(price)
+            Product._validate_quantity(quantity)
+            self._names.append(name)
+            self._prices.append(Money.from_amount(price).cents)
+            self._quantities.append(quantity)
+            self._active.append(quantity > 0)
+
+    def __len__(self) -> int:
+        """
+        Returns the number of rows in the table.
+
+        :return: Count of products in the table.
+        :rtype: int
+        """
+        return len(self._names)
+
+    def __getitem__(self, row: int) -> "ProductView":
+        """
+        Returns a product view of the given row.
+
+        :param row: Index of the row, negative indexes count from the end.
+        :type row: int
+        :return: View reading and writing the row's columns.
+        :rtype: ProductView
+        :raises IndexError: If the row is out of range.
+        """
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError("Product table row out of range")
+
+        view = self._views.get(row)
+        if view is None:
+            view = ProductView(self, row)
+            self._views[row] = view
+        return view
+
+    def __iter__(self) -> Iterator["ProductView"]:
+        """
+        Iterates over views of all rows in the table.
+
+        :return: Iterator of product views.
+        :rtype: Iterator[ProductView]
+        """
+        for row in range(len(self)):
+            yield self[row]
+
+
+def _column_attribute(column: str) -> property:
+    """
+    Creates a property redirecting a Product attribute to a column of the view's table.
+
+    :param column: Name of the ProductTable column attribute, e.g. ``_quantities``.
+    :type column: str
+    :return: Property reading and writing the view's row of the column.
+    :rtype: property
+    """
+    def get_value(view: "ProductView"):
+        return getattr(view._table, column)[view._row]
+
+    def set_value(view: "ProductView", value):
+        getattr(view._table, column)[view._row] = value
+
+    return property(get_value, set_value)
+
+
+def _sparse_attribute(column: str, default) -> property:
+    """
+    Creates a property redirecting a Product attribute to a sparse column of the view's table.
+
+    :param column: Name of the ProductTable dictionary attribute, e.g. ``_promotions``.
+    :type column: str
+    :param default: Value of the attribute for rows missing in the dictionary.
+    :return: Property reading and writing the view's row of the column.
+    :rtype: property
+    """
+    def get_value(view: "ProductView"):
+        return getattr(view._table, column).get(view._row, default)
+
+    def set_value(view: "ProductView", value):
+        values = getattr(view._table, column)
+        if value == default:
+            values.pop(view._row, None)
+        else:
+            values[view._row] = value
+
+    return property(get_value, set_value)
+
+
+def _price_attribute(as_money: bool) -> property:
+    """
+    Creates a property redirecting a Product price attribute to the cents column of the view's table.
+
+    :param as_money: Whether the property holds Money, or a plain int or float price.
+    :type as_money: bool
+    :return: Property reading and writing the view's row of the price column.
+    :rtype: property
+    """
+    def get_value(view: "ProductView"):
+        cents = view._table._prices[view._row]
+        if as_money:
+            return Money(cents)
+        return cents / CENTS_PER_UNIT if cents % CENTS_PER_UNIT else cents // CENTS_PER_UNIT
+
+    def set_value(view: "ProductView", value):
+        view._table._prices[view._row] = Money.from_amount(value).cents
+
+    return property(get_value, set_value)
+
+
+class ProductView(Product):
+    """
+    Represents a product stored as a row of a ProductTable.
+
+    The view holds no product data itself; every attribute is read from and
+    written to the table, so views are cheap to create and throw away.
+    """
+
+    __slots__ = ("_table", "_row", "__weakref__")
+
+    _name = _column_attribute("_names")
+    _price = _price_attribute(as_money=False)
+    _unit_price = _price_attribute(as_money=True)
+    _quantity = _column_attribute("_quantities")
+    _active = property(
+        lambda view: bool(view._table._active[view._row]),
+        lambda view, value: view._table._active.__setitem__(view._row, value)
+    )
+    _promotion = _sparse_attribute("_promotions", None)
+    _observers = _sparse_attribute("_observers", ())
+
+    def __init__(self, table: ProductTable, row: int):
+        """
+        Initializes a view of a table row. Use indexing of ProductTable instead of creating views directly.
+
+        :param table: The table holding the product data.
+        :type table: ProductTable
+        :param row: Index of the product's row in the table.
+        :type row: int
+        """
+        self._table = table
+        self._row = row
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Returns the stock lock of the row, shared by all views of the row."""
+        return _stock_lock(id(self._table) + (self._row << 4))
+
+    def copy(self) -> Product:
+        """
+        Creates an independent copy of the row as a regular product, not stored in any table.
+
+        :return: The new product.
+        :rtype: Product
+        """
+        return self._copy_as(Product)
@@ -1,11 +1,57 @@
-from promotions import Promotion
+import os
+import sys
+import threading
+from functools import lru_cache
+from typing import Callable
 
+from money import Money
+from promotions import Promotion, PromotionStack, compile_promotions, _PricedItem
 
-class Product:
+# storecore, the inventory engine shared with bestbuy, lives in the repository root
+_REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _REPOSITORY_ROOT not in sys.path:
+    sys.path.append(_REPOSITORY_ROOT)
+from storecore import InventoryItem  # noqa: E402
+
+# Products share a fixed pool of stock locks instead of owning one each,
+# which keeps the per-product memory small for large catalogs.
+_STOCK_LOCKS = tuple(threading.RLock() for _ in range(1024))
+_STOCK_LOCK_MASK = len(_STOCK_LOCKS) - 1
+
+
+def _stock_lock(key: int) -> threading.RLock:
+    """
+    Returns the stock lock from the shared pool assigned to the given key.
+    @param key: (int) A number identifying the locked product, e.g. its id().
+    @return: (threading.RLock) The same lock for the same key.
+    """
+    return _STOCK_LOCKS[(key >> 4) & _STOCK_LOCK_MASK]
+
+
+@lru_cache(maxsize=2 ** 16)
+def _promotion_price(promotion: Promotion, unit_price: int, quantity: int) -> Money:
+    """
+    Returns the promotional price of an order line, memoized per promotion, unit price and quantity.
+    Keying by the unit price in cents instead of by product lets equally priced products
+    share entries and keeps entries valid when a product's price changes.
+    @param promotion: (Promotion) The promotion applied to the line.
+    @param unit_price: (int) The unit price of the product in cents.
+    @param quantity: (int) The number of items in the line.
+    @return: (Money) The final price of the line.
+    """
+    # promotions written against float prices return floats
+    return Money.from_amount(promotion.apply_promotion(_PricedItem(Money(unit_price)), quantity))
+
+
+class Product(InventoryItem):
     """
     Represents a product with a name, price, quantity in stock, and promotion applied.
+    Stock, active status and observers are handled by the shared InventoryItem; this class
+    adds validation, exact prices, promotions and the locks guarding the stock against concurrent orders.
     """
 
+    __slots__ = ("_unit_price", "_promotion")
+
     def __init__(self, name: str, price: float | int, quantity: int):
         """
         Initializes a Product instance with the given name, price, and quantity, and no promotion.
@@ -15,17 +61,64 @@ class Product:
         @raise ValueError: If name is empty, price is negative, or quantity is negative.
         """
         Product._validate_name(name)
-        self._name = name
-
         Product._validate_price(price)
-        self._price = price
-
         Product._validate_quantity(quantity)
-        self._quantity = quantity
 
-        self._active = quantity > 0
+        super().__init__(name, price, quantity)
+        self._unit_price = Money.from_amount(price)
         self._promotion = None
 
+    @classmethod
+    def _from_columns(cls, names: list[str], prices: list[float | int], quantities: list[int],
+                      **columns: list) -> list["Product"]:
+        """
+        Creates many products from columns of values validated in bulk, e.g. by a catalog importer,
+        skipping the per-field validation of __init__.
+        @param names: (list[str]) The validated names of the products.
+        @param prices: (list[float | int]) The validated prices of the products.
+        @param quantities: (list[int]) The validated quantities of the products in stock.
+        @param columns: Values of the extra attributes of a subclass, e.g. maximum.
+        @return: (list[Product]) The new products, active if they are in stock.
+        """
+        new_product = cls.__new__
+        to_money = Money.from_amount
+        products = []
+        for name, price, quantity in zip(names, prices, quantities):
+            product = new_product(cls)
+            product._name = name
+            product._price = price
+            product._unit_price = to_money(price)
+            product._quantity = quantity
+            product._active = quantity > 0
+            product._promotion = None
+            product._observers = ()
+            products.append(product)
+
+        for attribute, values in columns.items():
+            for product, value in zip(products, values):
+                setattr(product, "_" + attribute, value)
+        return products
+
+    def copy(self) -> "Product":
+        """
+        Creates an independent copy of the product with the same name, price, quantity, status and promotion.
+        The copy has no observers and its own stock, so it can be added to another store.
+        @return: (Product) The new product, of the same type as this product.
+        """
+        return self._copy_as(type(self))
+
+    def _copy_as(self, cls: type["Product"], **columns: list) -> "Product":
+        """
+        Creates a copy of the product as an instance of the given product class.
+        @param cls: (type[Product]) Class of the copy.
+        @param columns: Values of the extra attributes of the class, e.g. maximum, as one-item lists.
+        @return: (Product) The new product.
+        """
+        product = cls._from_columns([self.name], [self.price], [self.quantity], **columns)[0]
+        product._active = self._active
+        product._promotion = self._promotion
+        return product
+
     @staticmethod
     def _validate_name(name: str):
         """
@@ -69,9 +162,14 @@ class Product:
 
     @name.setter
     def name(self, value: str):
-        """Sets the name of the product."""
+        """Sets the name of the product and notifies observers."""
         Product._validate_name(value)
-        self._name = value
+
+        with self.lock:
+            old_name = self._name
+            self._name = value
+            if old_name != value:
+                self._notify("name", old_name, value)
 
     @property
     def price(self) -> float | int:
@@ -80,30 +178,46 @@ class Product:
 
     @price.setter
     def price(self, value: float | int):
-        """Sets the price of the product."""
+        """Sets the price of the product and notifies observers with the old and new unit price."""
         Product._validate_price(value)
-        self._price = value
+        unit_price = Money.from_amount(value)
+
+        with self.lock:
+            old_unit_price = self._unit_price
+            self._price = value
+            self._unit_price = unit_price
+            if old_unit_price != unit_price:
+                self._notify("price", old_unit_price, unit_price)
 
     @property
-    def quantity(self) -> int:
-        """"Returns the quantity of the product in stock."""
-        return self._quantity
+    def unit_price(self) -> Money:
+        """Returns the price of one item of the product as exact Money, used for all price calculations."""
+        return self._unit_price
 
-    @quantity.setter
+    @InventoryItem.quantity.setter
     def quantity(self, quantity: int):
-        """Sets the quantity of the product and updates its active status."""
+        """Sets the quantity of the product, updates its active status and notifies observers."""
         Product._validate_quantity(quantity)
 
-        if quantity > 0:
-            self.activate()
-        else:
-            self.deactivate()
+        with self.lock:
+            self._set_quantity(quantity)
 
-        self._quantity = quantity
+    @property
+    def lock(self) -> threading.RLock:
+        """
+        Returns the re-entrant lock guarding the product's stock.
+        Holding it makes a check of the stock and the following purchase one atomic step.
+        The lock may be shared with other products.
+        """
+        # the lookup of _stock_lock is inlined, as every purchase takes the lock
+        return _STOCK_LOCKS[(id(self) >> 4) & _STOCK_LOCK_MASK]
 
     @property
     def promotion(self) -> Promotion:
-        """Returns the current promotion applied to the product."""
+        """
+        Returns the current promotion applied to the product.
+        With several promotions assigned, this is their compiled PromotionStack.
+        """
         return self._promotion
 
     @promotion.setter
@@ -115,23 +229,72 @@ class Product:
         """
         if promotion is not None and not isinstance(promotion, Promotion):
             raise ValueError("Invalid promotion set: promotion must be an instance of Promotion or None")
-        self._promotion = promotion
+        self._set_promotion(promotion)
+
+    @property
+    def promotions(self) -> list[Promotion]:
+        """Returns all promotions applied to the product, in the order they are applied."""
+        if self._promotion is None:
+            return []
+        if isinstance(self._promotion, PromotionStack):
+            return list(self._promotion.promotions)
+        return [self._promotion]
+
+    @promotions.setter
+    def promotions(self, promotions: list[Promotion]):
+        """
+        Sets several promotions stacked on the product, applied in ascending order of their priority.
+        The promotions are compiled into a single pricing function once, here, instead of on every purchase.
+        @param promotions: (list[Promotion]) Promotion objects, an empty list removes all promotions.
+        @raise ValueError: If any promotion is not an instance of Promotion.
+        """
+        if not all(isinstance(promotion, Promotion) for promotion in promotions):
+            raise ValueError("Invalid promotions set: every promotion must be an instance of Promotion")
+        self._set_promotion(compile_promotions(tuple(promotions)))
+
+    def _set_promotion(self, promotion: Promotion | None):
+        """
+        Applies a validated promotion to the product and notifies observers if it changed.
+        @param promotion: (Promotion | None) The promotion to apply.
+        """
+        with self.lock:
+            old_promotion = self._promotion
+            self._promotion = promotion
+            if old_promotion is not promotion:
+                self._notify("promotion", old_promotion, promotion)
 
     def _get_promotion_name(self) -> str:
         """Returns the name of the promotion applied to the product, or 'None' if no promotion is set."""
         return getattr(self.promotion, 'name', "None")
 
-    def is_active(self) -> bool:
-        """Returns whether the product is active."""
-        return self._active
+    def add_observer(self, observer: Callable):
+        """
+        Registers a callback notified about every change of the product's state.
+        The callback is called as ``observer(product, attribute, old_value, new_value)``,
+        where attribute is ``quantity``, ``active``, ``price`` (as Money), ``name`` or ``promotion``.
+        @param observer: (Callable) The callback to register.
+        """
+        with self.lock:
+            super().add_observer(observer)
+
+    def remove_observer(self, observer: Callable):
+        """
+        Unregisters a previously registered callback.
+        @param observer: (Callable) The callback to unregister.
+        @raise ValueError: If the callback is not registered.
+        """
+        with self.lock:
+            super().remove_observer(observer)
 
     def activate(self):
         """Activates the product."""
-        self._active = True
+        with self.lock:
+            super().activate()
 
     def deactivate(self):
         """Deactivates the product."""
-        self._active = False
+        with self.lock:
+            super().deactivate()
 
     def __str__(self) -> str:
         """
@@ -164,23 +327,48 @@ class Product:
         """Compares whether this product is less expensive or equally priced."""
         return self.price <= other.price
 
-    def buy(self, quantity: int) -> float:
+    def check_purchase(self, quantity: int):
         """
-        Buys a specified quantity of the product.
+        Checks whether a specified quantity of the product can be bought, without buying it.
         @param quantity: (int) The quantity to purchase.
-        @return: (float) The total cost of the purchased quantity.
-        @raise ValueError: If the requested quantity exceeds available stock.
+        @raise ValueError: If the quantity is not positive or exceeds available stock.
         """
-        product_quantity = self.quantity
-        if quantity > product_quantity:
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Error while making order! Quantity must be a positive whole number")
+        if quantity > self.quantity:
             raise ValueError("Error while making order! Quantity larger than what exists")
 
-        self.quantity = product_quantity - quantity
+    def get_price(self, quantity: int) -> Money:
+        """
+        Calculates the price of a specified quantity of the product, including its promotion.
+        @param quantity: (int) The quantity to price.
+        @return: (Money) The total cost of the quantity.
+        """
+        promotion = self._promotion
+        if promotion is not None:
+            return _promotion_price(promotion, self._unit_price.cents, quantity)
+
+        return self._unit_price * quantity
 
-        if self.promotion is not None:
-            return self.promotion.apply_promotion(self, quantity)
+    def take_stock(self, quantity: int):
+        """
+        Takes a specified quantity of the product out of stock without pricing it.
+        The check of the stock and the change of the quantity are made under the product's lock.
+        @param quantity: (int) The quantity to take.
+        @raise ValueError: If the requested quantity exceeds available stock.
+        """
+        with self.lock:
+            # the shared take_stock inlined, as every purchase runs it
+            self.check_purchase(quantity)
+            self._set_quantity(self._quantity - quantity)
 
-        return quantity * self.price
+    def restock(self, quantity: int):
+        """
+        Returns a specified quantity of the product back to stock, e.g. when an order is rolled back.
+        @param quantity: (int) The quantity to return.
+        """
+        with self.lock:
+            super().restock(quantity)
 
 
 class NonStockedProduct(Product):
@@ -188,6 +376,8 @@ class NonStockedProduct(Product):
     Represents a non-stocked product with unlimited availability.
     """
 
+    __slots__ = ()
+
     def __init__(self, name: str, price: float):
         """
         Initializes a NonStockedProduct instance with the given name and price.
@@ -199,17 +389,40 @@ class NonStockedProduct(Product):
         super().__init__(name, price, 0)
         super().activate()
 
+    @classmethod
+    def _from_columns(cls, names: list[str], prices: list[float | int], quantities: list[int],
+                      **columns: list) -> list["Product"]:
+        """
+        Creates many active non-stocked products from columns validated in bulk. Quantities are ignored.
+        @return: (list[NonStockedProduct]) The new products.
+        """
+        products = super()._from_columns(names, prices, [0] * len(names), **columns)
+        for product in products:
+            product._active = True
+        return products
+
     @Product.quantity.setter
     def quantity(self, quantity: int):
         """Prevents setting a quantity for non-stocked products."""
         print("Warning: Non-material product does not have a quantity.")
 
-    def buy(self, quantity: int) -> float:
-        """Returns the total price of non-stocked products ordered."""
-        if self.promotion is not None:
-            return self.promotion.apply_promotion(self, quantity)
+    def check_purchase(self, quantity: int):
+        """
+        Checks whether a specified quantity of the non-stocked product can be bought.
+        Availability is unlimited, so only the quantity itself is validated.
+        @param quantity: (int) The quantity to purchase.
+        @raise ValueError: If the quantity is not positive.
+        """
+        if not isinstance(quantity, int) or quantity <= 0:
+            raise ValueError("Error while making order! Quantity must be a positive whole number")
+
+    def take_stock(self, quantity: int):
+        """Non-stocked products have no stock to take, so only the quantity is checked."""
+        self.check_purchase(quantity)
 
-        return quantity * self.price
+    def restock(self, quantity: int):
+        """Non-stocked products have no stock to return to."""
+        pass
 
     def __str__(self) -> str:
         """
@@ -224,10 +437,24 @@ class LimitedProduct(Product):
     Represents a product with a maximum purchase limit per order.
     """
 
+    __slots__ = ("_maximum",)
+
     def __init__(self, name: str, price: float, quantity: int, maximum: int):
         super().__init__(name, price, quantity)
         self._maximum = maximum
 
+    @property
+    def maximum(self) -> int:
+        """Returns the maximum quantity of the product allowed per order."""
+        return self._maximum
+
+    def copy(self) -> "LimitedProduct":
+        """
+        Creates an independent copy of the limited product, including its maximum per order.
+        @return: (LimitedProduct) The new product.
+        """
+        return self._copy_as(LimitedProduct, maximum=[self._maximum])
+
     def __str__(self) -> str:
         """
         Allows printing a string representation of the limited product.
@@ -236,14 +463,14 @@ class LimitedProduct(Product):
         """
         return f"{self.name}, Price: ${self.price}, Limited to 1 per order!, Promotion: {self._get_promotion_name()}"
 
-    def buy(self, quantity: int) -> float:
+    def check_purchase(self, quantity: int):
         """
-        Buys a specified quantity of the limited product.
+        Checks whether a specified quantity of the limited product can be bought.
         @param quantity: (int) The quantity to purchase.
-        @raise ValueError: If the quantity exceeds the maximum allowed per order.
+        @raise ValueError: If the quantity exceeds the maximum allowed per order or available stock.
         """
         if quantity > self._maximum:
             raise ValueError(
                 f"Error while making order! Only {self._maximum} is allowed from this product1!"
             )
-        return super().buy(quantity)
+        super().check_purchase(quantity)
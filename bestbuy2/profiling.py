@@ -0,0 +1,204 @@
+import functools
+import inspect
+import json
+import threading
+import time
+from typing import Callable
+
+from products import Product, NonStockedProduct
+from promotions import Promotion, PromotionStack
+from store import Store
+
+# Methods instrumented by default: (class, method name), each reported as "Class.method".
+# These are the steps Store.order runs for every order: taking the stock and pricing the
+# lines, with Product.get_price covering the memoized promotion prices of small carts.
+# Direct purchases and the promotion pricing behind the memo, single and stacked, are timed too
+DEFAULT_TARGETS = (
+    (Store, "order"),
+    (Store, "_price_lines"),
+    (Product, "take_stock"),
+    (NonStockedProduct, "take_stock"),
+    (Product, "get_price"),
+    (Product, "buy"),
+    (Promotion, "apply_promotion"),
+    (PromotionStack, "apply_promotion"),
+)
+# Latency histogram buckets: bucket 0 counts calls under 1 us, bucket b calls of 2^(b-1) to 2^b us
+HISTOGRAM_BUCKETS = 40
+
+
+class CallStats:
+    """
+    Represents the recorded calls of one instrumented method: count, cumulative time and latency histogram.
+    """
+
+    def __init__(self):
+        """Initializes the stats without calls."""
+        self.count = 0
+        self.total_seconds = 0.0
+        self.histogram = [0] * HISTOGRAM_BUCKETS
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float):
+        """
+        Records one call.
+
+        :param seconds: Duration of the call.
+        :type seconds: float
+        """
+        bucket = min(int(seconds * 1_000_000).bit_length(), HISTOGRAM_BUCKETS - 1)
+        with self._lock:
+            self.count += 1
+            self.total_seconds += seconds
+            self.histogram[bucket] += 1
+
+    def percentile(self, share: float) -> float:
+        """
+        Estimates a latency percentile from the histogram.
+
+        :param share: The percentile as a share of the calls, e.g. 0.99.
+        :type share: float
+        :return: Upper bound of the histogram bucket holding the percentile, in microseconds, 0 without calls.
+        :rtype: float
+        """
+        rank = share * self.count
+        seen = 0
+        for bucket, calls in enumerate(self.histogram):
+            seen += calls
+            if calls and seen >= rank:
+                return float(2 ** bucket)
+        return 0.0
+
+    def to_dict(self) -> dict:
+        """
+        Returns the stats as a JSON-compatible dict.
+
+        :return: Count, total and mean time, p50 and p99 estimates and the histogram by bucket upper bound in us.
+        :rtype: dict
+        """
+        return {
+            "count": self.count,
+            "total_seconds": self.total_seconds,
+            "mean_us": self.total_seconds / self.count * 1_000_000 if self.count else 0.0,
+            "p50_us": self.percentile(0.5),
+            "p99_us": self.percentile(0.99),
+            "histogram_us": {str(2 ** bucket): calls for bucket, calls in enumerate(self.histogram) if calls},
+        }
+
+
+class Profiler:
+    """
+    Represents instrumentation of hot methods of the order flow, such as ``Store.order``.
+
+    Enabling the profiler replaces the target methods on their classes with
+    timing wrappers, and disabling it puts the original methods back, so a
+    disabled profiler costs nothing at all. Only one profiler should be
+    enabled at a time.
+    """
+
+    def __init__(self, targets: tuple[tuple[type, str], ...] = DEFAULT_TARGETS):
+        """
+        Initializes a disabled profiler.
+
+        :param targets: (class, method name) pairs to instrument; every method must be a plain function or
+            a staticmethod, defined by its class or inherited from a base class.
+        :type targets: tuple[tuple[type, str], ...]
+        """
+        self._targets = targets
+        self._stats = {f"{cls.__name__}.{name}": CallStats() for cls, name in targets}
+        self._originals: dict[tuple[type, str], Callable] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """Returns whether the target methods are instrumented."""
+        return bool(self._originals)
+
+    def enable(self):
+        """Instruments the target methods. Enabling an enabled profiler has no effect."""
+        if self.enabled:
+            return
+        for cls, name in self._targets:
+            original = inspect.getattr_static(cls, name)
+            # an inherited method is wrapped on the class itself and removed from it again on disable
+            self._originals[(cls, name)] = cls.__dict__.get(name)
+            stats = self._stats[f"{cls.__name__}.{name}"]
+            if isinstance(original, staticmethod):
+                setattr(cls, name, staticmethod(_timed(original.__func__, stats)))
+            else:
+                setattr(cls, name, _timed(original, stats))
+
+    def disable(self):
+        """Restores the original target methods. The recorded stats are kept."""
+        for (cls, name), original in self._originals.items():
+            if original is None:
+                delattr(cls, name)
+            else:
+                setattr(cls, name, original)
+        self._originals = {}
+
+    def reset(self):
+        """Discards the recorded stats."""
+        for name in self._stats:
+            self._stats[name] = CallStats()
+        if self.enabled:
+            # the wrappers hold the discarded stats, so they are created again
+            self.disable()
+            self.enable()
+
+    def get_stats(self) -> dict[str, CallStats]:
+        """
+        Returns the recorded stats.
+
+        :return: Stats by method name, e.g. ``Store.order``.
+        :rtype: dict[str, CallStats]
+        """
+        return dict(self._stats)
+
+    def report(self) -> str:
+        """
+        Formats the recorded stats as a table, one line per method.
+
+        :return: The report.
+        :rtype: str
+        """
+        lines = [f"{'method':<32} {'calls':>10} {'total ms':>10} {'mean us':>10} {'p50 us':>10} {'p99 us':>10}"]
+        for name, stats in self._stats.items():
+            values = stats.to_dict()
+            lines.append(f"{name:<32} {values['count']:>10} {values['total_seconds'] * 1000:>10.2f} "
+                         f"{values['mean_us']:>10.1f} {values['p50_us']:>10.0f} {values['p99_us']:>10.0f}")
+        return "\n".join(lines)
+
+    def export(self, path: str):
+        """
+        Writes the recorded stats to a JSON file.
+
+        :param path: Path of the file, overwritten if it exists.
+        :type path: str
+        """
+        with open(path, "w", encoding="utf-8") as export_file:
+            json.dump({name: stats.to_dict() for name, stats in self._stats.items()}, export_file, indent=2)
+            export_file.write("\n")
+
+
+def _timed(function: Callable, stats: CallStats) -> Callable:
+    """
+    Wraps a function to record the duration of every call.
+
+    :param function: The function to wrap.
+    :type function: Callable
+    :param stats: Stats recording the calls.
+    :type stats: CallStats
+    :return: The wrapper.
+    :rtype: Callable
+    """
+    perf_counter = time.perf_counter
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        start = perf_counter()
+        try:
+            return function(*args, **kwargs)
+        finally:
+            stats.record(perf_counter() - start)
+
+    return wrapper
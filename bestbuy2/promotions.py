@@ -1,25 +1,59 @@
-from abc import ABC, abstractmethod
+from abc import ABC
+from collections import namedtuple
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Sequence
 
-from typing import TYPE_CHECKING
+from money import Money, round_half_up
+
+try:
+    import numpy
+except ImportError:  # NumPy is optional, batch pricing falls back to the scalar path
+    numpy = None
 
 if TYPE_CHECKING:
     from products import Product
 
+# Unit price in cents at which the paid share of a promotion only overriding apply_promotion is measured
+SHARE_REFERENCE_CENTS = 1_000_000
+
+
+class _PricedItem(namedtuple("_PricedItem", ["unit_price"])):
+    """
+    Stands in for a product when only its unit price is known, e.g. in batch pricing.
+    """
+
+    __slots__ = ()
+
+    @property
+    def price(self) -> float:
+        """Returns the unit price as a float, like ``Product.price``, for promotions written against it."""
+        return float(self.unit_price)
+
 
 class Promotion(ABC):
     """
     Represents a base class for creating promotions assigned to product instances.
+
+    A promotion describes its discount declaratively as the share of the full
+    price that is paid for a quantity of items. Shares of several promotions
+    multiply, which lets any promotions be stacked on one product.
     """
 
-    def __init__(self, name: str):
+    # True for promotions whose paid share does not depend on the quantity
+    fixed_share = False
+
+    def __init__(self, name: str, priority: int = 0):
         """
         Initialize the promotion with the given name.
 
         :param name: The name of the promotion.
         :type name: str
+        :param priority: Stacked promotions are applied in ascending order of priority.
+        :type priority: int
         """
         Promotion._validate_name(name)
         self._name = name
+        self._priority = priority
 
     @staticmethod
     def _validate_name(name: str):
@@ -56,19 +90,73 @@ class Promotion(ABC):
         Promotion._validate_name(name)
         self._name = name
 
-    @abstractmethod
-    def apply_promotion(self, product: "Product", quantity: int) -> float:
+    @property
+    def priority(self) -> int:
+        """
+        Get the priority of the promotion.
+
+        :return: The priority, lower values are applied first when promotions are stacked.
+        :rtype: int
+        """
+        return self._priority
+
+    def paid_share(self, quantity: int) -> tuple[int, int]:
+        """
+        Get the share of the full price paid for a specific quantity after the promotion.
+
+        Subclasses override this method or ``apply_promotion``. For those overriding
+        only ``apply_promotion``, the share is what it charges for the quantity at a unit
+        price of ``SHARE_REFERENCE_CENTS``, which lets them be stacked and batch priced too.
+
+        :param quantity: The number of items.
+        :type quantity: int
+        :return: The paid share as a (numerator, denominator) pair, e.g. (7, 10) for 30% off.
+        :rtype: tuple[int, int]
+        :raises NotImplementedError: If the subclass overrides neither method.
+        """
+        if type(self).apply_promotion is Promotion.apply_promotion:
+            raise NotImplementedError(f"{type(self).__name__} must override paid_share or apply_promotion")
+        if quantity == 0:
+            return 1, 1
+        paid = Money.from_amount(self.apply_promotion(_PricedItem(Money(SHARE_REFERENCE_CENTS)), quantity))
+        return paid.cents, SHARE_REFERENCE_CENTS * quantity
+
+    def apply_promotion(self, product: "Product", quantity: int) -> Money:
         """
         Apply the promotion to a product for a specific quantity.
 
+        Prices are calculated in whole cents. Where the discount splits a cent,
+        the discount is rounded half up.
+
         :param product: The product to apply the promotion on.
         :type product: Product
         :param quantity: The number of items.
         :type quantity: int
         :return: The final price after applying the promotion.
-        :rtype: float
+        :rtype: Money
         """
-        pass
+        full_price = product.unit_price.cents * quantity
+        numerator, denominator = self.paid_share(quantity)
+        return Money(full_price - round_half_up(full_price * (denominator - numerator), denominator))
+
+    def apply_promotion_many(self, unit_prices: Sequence[int], quantities: Sequence[int]) -> Sequence[int]:
+        """
+        Apply the promotion to many order lines at once.
+
+        The base implementation calls ``apply_promotion`` for every line, which
+        makes it the reference for the vectorized overrides in subclasses.
+
+        :param unit_prices: Unit price of every line in cents.
+        :type unit_prices: Sequence[int]
+        :param quantities: Number of items of every line.
+        :type quantities: Sequence[int]
+        :return: The final price of every line in cents after applying the promotion.
+        :rtype: Sequence[int]
+        """
+        return [
+            Money.from_amount(self.apply_promotion(_PricedItem(Money(unit_price)), quantity)).cents
+            for unit_price, quantity in zip(unit_prices, quantities)
+        ]
 
 
 class SecondHalfPrice(Promotion):
@@ -76,19 +164,35 @@ class SecondHalfPrice(Promotion):
     Promotion for products that applies a half-price discount for every other item.
     """
 
-    def apply_promotion(self, product: "Product", quantity: int) -> float:
+    def paid_share(self, quantity: int) -> tuple[int, int]:
         """
-        Calculate the final price after applying a half-price discount for every other item.
+        Get the share of the full price paid with every other item at half price.
 
-        :param product: The product to apply the discount on.
-        :type product: Product
         :param quantity: The number of items bought.
         :type quantity: int
-        :return: The final price after the discount.
-        :rtype: float
+        :return: The paid share as a (numerator, denominator) pair.
+        :rtype: tuple[int, int]
         """
-        discount = (product.price / 2) * (quantity // 2)
-        return (product.price * quantity) - discount
+        return 2 * quantity - quantity // 2, 2 * quantity or 1
+
+    def apply_promotion_many(self, unit_prices: Sequence[int], quantities: Sequence[int]) -> Sequence[int]:
+        """
+        Calculate the final price of many order lines in one vectorized pass.
+
+        :param unit_prices: Unit price of every line in cents.
+        :type unit_prices: Sequence[int]
+        :param quantities: Number of items of every line.
+        :type quantities: Sequence[int]
+        :return: The final price of every line in cents after the discount.
+        :rtype: Sequence[int]
+        """
+        if numpy is None:
+            return super().apply_promotion_many(unit_prices, quantities)
+
+        unit_prices = numpy.asarray(unit_prices, dtype=numpy.int64)
+        quantities = numpy.asarray(quantities, dtype=numpy.int64)
+        discount = round_half_up(unit_prices * (quantities // 2), 2)
+        return unit_prices * quantities - discount
 
 
 class ThirdOneFree(Promotion):
@@ -96,19 +200,35 @@ class ThirdOneFree(Promotion):
     Promotion for products that applies a 100% discount for every third item.
     """
 
-    def apply_promotion(self, product: "Product", quantity: int) -> float:
+    def paid_share(self, quantity: int) -> tuple[int, int]:
         """
-        Calculate the final price after applying a 100% discount for every third item.
+        Get the share of the full price paid with every third item free.
 
-        :param product: The product to apply the discount on.
-        :type product: Product
         :param quantity: The number of items bought.
         :type quantity: int
-        :return: The final price after the discount.
-        :rtype: float
+        :return: The paid share as a (numerator, denominator) pair.
+        :rtype: tuple[int, int]
         """
-        discount = product.price * (quantity // 3)
-        return (product.price * quantity) - discount
+        return quantity - quantity // 3, quantity or 1
+
+    def apply_promotion_many(self, unit_prices: Sequence[int], quantities: Sequence[int]) -> Sequence[int]:
+        """
+        Calculate the final price of many order lines in one vectorized pass.
+
+        :param unit_prices: Unit price of every line in cents.
+        :type unit_prices: Sequence[int]
+        :param quantities: Number of items of every line.
+        :type quantities: Sequence[int]
+        :return: The final price of every line in cents after the discount.
+        :rtype: Sequence[int]
+        """
+        if numpy is None:
+            return super().apply_promotion_many(unit_prices, quantities)
+
+        unit_prices = numpy.asarray(unit_prices, dtype=numpy.int64)
+        quantities = numpy.asarray(quantities, dtype=numpy.int64)
+        discount = unit_prices * (quantities // 3)
+        return unit_prices * quantities - discount
 
 
 class PercentDiscount(Promotion):
@@ -117,7 +237,9 @@ class PercentDiscount(Promotion):
     The discount percentage is specified during instance creation.
     """
 
-    def __init__(self, name: str, percent: int):
+    fixed_share = True
+
+    def __init__(self, name: str, percent: int, priority: int = 0):
         """
         Initialize the PercentDiscount instance with a name and discount percentage.
 
@@ -125,23 +247,179 @@ class PercentDiscount(Promotion):
         :type name: str
         :param percent: The percentage discount to apply (1-100% inclusive).
         :type percent: int
+        :param priority: Stacked promotions are applied in ascending order of priority.
+        :type priority: int
         :raises ValueError: If the percentage is out of the range 1-100.
         """
-        super().__init__(name)
-        if 0 > percent > 100:
+        super().__init__(name, priority)
+        if not 1 <= percent <= 100:
             raise ValueError("Error creating percent discount: out of range 1 - 100 %")
         self.__percent = percent
 
-    def apply_promotion(self, product: "Product", quantity: int) -> float:
+    def paid_share(self, quantity: int) -> tuple[int, int]:
+        """
+        Get the share of the full price paid after the percentage discount, the same for any quantity.
+
+        :param quantity: The number of items bought.
+        :type quantity: int
+        :return: The paid share as a (numerator, denominator) pair.
+        :rtype: tuple[int, int]
+        """
+        return 100 - self.__percent, 100
+
+    def apply_promotion_many(self, unit_prices: Sequence[int], quantities: Sequence[int]) -> Sequence[int]:
+        """
+        Calculate the final price of many order lines in one vectorized pass.
+
+        :param unit_prices: Unit price of every line in cents.
+        :type unit_prices: Sequence[int]
+        :param quantities: Number of items of every line.
+        :type quantities: Sequence[int]
+        :return: The final price of every line in cents after the discount.
+        :rtype: Sequence[int]
+        """
+        if numpy is None:
+            return super().apply_promotion_many(unit_prices, quantities)
+
+        unit_prices = numpy.asarray(unit_prices, dtype=numpy.int64)
+        quantities = numpy.asarray(quantities, dtype=numpy.int64)
+        full_prices = unit_prices * quantities
+        discount = round_half_up(full_prices * self.__percent, 100)
+        return full_prices - discount
+
+
+class PromotionStack(Promotion):
+    """
+    Promotion combining several promotions applied to the same product, e.g. 30% off
+    together with every third item free.
+
+    The stacked promotions are compiled once, on creation, into a single pricing
+    function: shares of promotions that do not depend on the quantity are
+    multiplied in advance, so pricing a line is one call instead of one call
+    per stacked promotion. Use ``compile_promotions`` to create stacks.
+    """
+
+    def __init__(self, promotions: Sequence[Promotion]):
+        """
+        Initialize the stack from the given promotions.
+
+        :param promotions: The promotions to combine, at least two.
+        :type promotions: Sequence[Promotion]
+        :raises ValueError: If fewer than two promotions are given.
+        """
+        if len(promotions) < 2:
+            raise ValueError("Error creating promotion stack: at least two promotions are required")
+
+        self._promotions = tuple(sorted(promotions, key=lambda promotion: promotion.priority))
+        super().__init__(" + ".join(promotion.name for promotion in self._promotions),
+                         self._promotions[0].priority)
+        self._price_line = _compile_price_line(self._promotions)
+
+    def __reduce__(self):
+        """
+        Pickle the stack by its promotions, as the compiled pricing function cannot be pickled.
+
+        :return: The stack's class and the arguments recreating it.
+        :rtype: tuple
         """
-        Calculate the final price after applying a percentage discount to all items.
+        return PromotionStack, (self._promotions,)
 
-        :param product: The product to apply the discount on.
+    @property
+    def promotions(self) -> tuple[Promotion, ...]:
+        """
+        Get the stacked promotions.
+
+        :return: The promotions in the order they are applied.
+        :rtype: tuple[Promotion, ...]
+        """
+        return self._promotions
+
+    def paid_share(self, quantity: int) -> tuple[int, int]:
+        """
+        Get the share of the full price paid after all stacked promotions.
+
+        :param quantity: The number of items bought.
+        :type quantity: int
+        :return: The paid share as a (numerator, denominator) pair.
+        :rtype: tuple[int, int]
+        """
+        numerator, denominator = 1, 1
+        for promotion in self._promotions:
+            share_numerator, share_denominator = promotion.paid_share(quantity)
+            numerator *= share_numerator
+            denominator *= share_denominator
+        return numerator, denominator
+
+    def apply_promotion(self, product: "Product", quantity: int) -> Money:
+        """
+        Calculate the final price after applying all stacked promotions with the compiled pricing function.
+
+        :param product: The product to apply the promotions on.
         :type product: Product
         :param quantity: The number of items bought.
         :type quantity: int
-        :return: The final price after the discount.
-        :rtype: float
+        :return: The final price after all discounts.
+        :rtype: Money
         """
-        discount = ((product.price / 100) * self.__percent)  # single product
-        return (product.price - discount) * quantity
+        return self._price_line(product.unit_price.cents, quantity)
+
+
+def _compile_price_line(promotions: Sequence[Promotion]) -> Callable[[int, int], Money]:
+    """
+    Compiles promotions into one function pricing an order line.
+
+    :param promotions: The promotions to apply together.
+    :type promotions: Sequence[Promotion]
+    :return: Function taking the unit price in cents and the quantity and returning the line price.
+    :rtype: Callable[[int, int], Money]
+    """
+    fixed_numerator, fixed_denominator = 1, 1
+    quantity_shares = []
+    for promotion in promotions:
+        if promotion.fixed_share:
+            numerator, denominator = promotion.paid_share(1)
+            fixed_numerator *= numerator
+            fixed_denominator *= denominator
+        else:
+            quantity_shares.append(promotion.paid_share)
+
+    if not quantity_shares:
+        fixed_discount = fixed_denominator - fixed_numerator
+
+        def price_line(unit_price: int, quantity: int) -> Money:
+            full_price = unit_price * quantity
+            return Money(full_price - round_half_up(full_price * fixed_discount, fixed_denominator))
+
+        return price_line
+
+    def price_line(unit_price: int, quantity: int) -> Money:
+        numerator, denominator = fixed_numerator, fixed_denominator
+        for paid_share in quantity_shares:
+            share_numerator, share_denominator = paid_share(quantity)
+            numerator *= share_numerator
+            denominator *= share_denominator
+        full_price = unit_price * quantity
+        return Money(full_price - round_half_up(full_price * (denominator - numerator), denominator))
+
+    return price_line
+
+
+@lru_cache(maxsize=1024)
+def compile_promotions(promotions: tuple[Promotion, ...]) -> Promotion | None:
+    """
+    Combines the promotions of a product into the single promotion applied at checkout.
+
+    The same combination of promotions always compiles to the same object, so
+    products sharing promotions also share memoized prices and batch pricing.
+
+    :param promotions: The promotions assigned to a product.
+    :type promotions: tuple[Promotion, ...]
+    :return: None without promotions, the promotion itself for a single one,
+             otherwise a PromotionStack.
+    :rtype: Promotion | None
+    """
+    if not promotions:
+        return None
+    if len(promotions) == 1:
+        return promotions[0]
+    return PromotionStack(promotions)
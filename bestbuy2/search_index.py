@@ -0,0 +1,141 @@
+import re
+from bisect import bisect_left
+from typing import Iterator, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from products import Product
+
+_TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Splits a text into lowercase search tokens, e.g. "MacBook Air M2" into macbook, air and m2.
+
+    :param text: The text to split.
+    :type text: str
+    :return: The tokens in order of appearance.
+    :rtype: list[str]
+    """
+    return _TOKEN_PATTERN.findall(text.lower())
+
+
+class NameIndex:
+    """
+    Represents an inverted index of product names for search-as-you-type lookups.
+
+    Every token of a name maps to the products whose names contain it, and
+    the distinct tokens are kept sorted, so the tokens starting with a prefix
+    are found by binary search. A lookup touches only the products matching
+    its rarest token, not the whole catalog.
+
+    New tokens are collected unsorted and merged into the sorted tokens on
+    the next lookup, so adding a large catalog does not insert into the
+    sorted list one token at a time.
+    """
+
+    def __init__(self):
+        """Initializes an empty index."""
+        self._postings: dict[str, dict[int, "Product"]] = {}
+        self._tokens: list[str] = []
+        self._new_tokens: list[str] = []
+        self._product_tokens: dict[int, tuple[str, ...]] = {}
+
+    def add(self, product: "Product"):
+        """
+        Adds a product to the index under the tokens of its current name.
+
+        :param product: The product to add.
+        :type product: Product
+        """
+        key = id(product)
+        tokens = tuple(dict.fromkeys(tokenize(product.name)))
+        self._product_tokens[key] = tokens
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = {}
+                self._new_tokens.append(token)
+            postings[key] = product
+
+    def remove(self, product: "Product"):
+        """
+        Removes a product from the index. Removing a product missing in the index has no effect.
+
+        :param product: The product to remove.
+        :type product: Product
+        """
+        key = id(product)
+        for token in self._product_tokens.pop(key, ()):
+            postings = self._postings[token]
+            del postings[key]
+            if not postings:
+                del self._postings[token]
+                self._merge_new_tokens()
+                del self._tokens[bisect_left(self._tokens, token)]
+
+    def _merge_new_tokens(self):
+        """Merges the tokens added since the last lookup into the sorted tokens."""
+        if self._new_tokens:
+            # sorting two sorted runs takes linear time
+            self._new_tokens.sort()
+            self._tokens += self._new_tokens
+            self._tokens.sort()
+            self._new_tokens = []
+
+    def _prefix_range(self, prefix: str) -> tuple[int, int]:
+        """
+        Finds the sorted tokens starting with a prefix by binary search.
+
+        :param prefix: A non-empty prefix.
+        :type prefix: str
+        :return: Start and end position of the matching tokens in the sorted tokens.
+        :rtype: tuple[int, int]
+        """
+        self._merge_new_tokens()
+        start = bisect_left(self._tokens, prefix)
+        end = bisect_left(self._tokens, prefix[:-1] + chr(ord(prefix[-1]) + 1), start)
+        return start, end
+
+    def search(self, query: str) -> Iterator["Product"]:
+        """
+        Finds the products whose names contain all words of a query, the last word as a prefix.
+
+        "macbook ai" finds "MacBook Air M2": complete words must match whole
+        tokens, while the last word may be unfinished, as while typing. The
+        index must not change while the iterator is consumed.
+
+        :param query: The search text.
+        :type query: str
+        :return: Iterator of the matching products. Empty for a query without words.
+        :rtype: Iterator[Product]
+        """
+        *words, prefix = tokenize(query) or [""]
+        if not prefix:
+            return
+
+        exact_postings = []
+        for word in dict.fromkeys(words):
+            postings = self._postings.get(word)
+            if postings is None:
+                return
+            exact_postings.append(postings)
+
+        exact_postings.sort(key=len)
+        start, end = self._prefix_range(prefix)
+        # start from whichever is likely smaller: the products of the rarest
+        # word, or the products of the tokens starting with the prefix
+        if not exact_postings or end - start <= len(exact_postings[0]):
+            seen = set()
+            for token in self._tokens[start:end]:
+                for key, product in self._postings[token].items():
+                    if key not in seen and all(key in postings for postings in exact_postings):
+                        seen.add(key)
+                        yield product
+            return
+
+        rarest, others = exact_postings[0], exact_postings[1:]
+        for key, product in rarest.items():
+            if all(key in postings for postings in others) and \
+                    any(token.startswith(prefix) for token in self._product_tokens[key]):
+                yield product
@@ -0,0 +1,362 @@
+import argparse
+import asyncio
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from catalog_io import read_catalog
+from journal import InventoryJournal
+from main import build_default_catalog, PAGE_SIZE
+from products import Product
+from store import Store
+
+# Most orders the writer places before it lets other requests run
+MAX_BATCH = 256
+# Largest page of products served by one listing request
+MAX_PAGE_SIZE = 1_000
+STATUS_TEXTS = {200: "OK", 400: "Bad Request", 404: "Not Found", 409: "Conflict",
+                500: "Internal Server Error"}
+
+
+class OrderService:
+    """
+    Represents an HTTP checkout service for a store, run by asyncio.
+
+    All stock changes go through a single writer task: request handlers put
+    their orders on a queue and wait for the result, and the writer places
+    queued orders one after the other. Since the writer and the handlers run
+    on the same event loop thread, listings and totals never see an order in
+    progress and the store's locks are never contended. The writer takes all
+    orders queued since its last run at once, up to ``MAX_BATCH``, so a busy
+    service places orders in batches without a context switch per order.
+
+    Routes, all answered with JSON:
+
+    - ``GET /products?page=0&size=20``: one page of the active products.
+    - ``GET /total-quantity``: the total quantity of the store.
+    - ``POST /orders`` with ``{"items": [{"name": ..., "quantity": ...}]}``:
+      places one order, answered with its total or, with status 409, the reason it failed.
+    - ``POST /orders/batch`` with ``{"orders": [{"items": [...]}, ...]}``:
+      places several orders, each all-or-nothing, answered with one result per order.
+
+    Orders the store fails to place, e.g. because its journal cannot be
+    written, are answered with status 500, or in a batch with an error
+    result for just that order; the writer keeps running.
+    """
+
+    def __init__(self, store: Store, batch_size: int = MAX_BATCH):
+        """
+        Initializes the service for a store. Products are ordered by name.
+
+        :param store: The store to serve.
+        :type store: Store
+        :param batch_size: Most orders placed by the writer at once.
+        :type batch_size: int
+        """
+        self._store = store
+        self._batch_size = batch_size
+        self._products_by_name: dict[str, Product] = {}
+        for product in store.products:
+            self._products_by_name.setdefault(product.name, product)
+        self._queue: asyncio.Queue | None = None
+        self._writer_task: asyncio.Task | None = None
+
+    async def start(self, host: str, port: int) -> asyncio.Server:
+        """
+        Starts the order writer and the HTTP server.
+
+        :param host: Address to listen on.
+        :type host: str
+        :param port: Port to listen on, 0 for any free port.
+        :type port: int
+        :return: The started server.
+        :rtype: asyncio.Server
+        """
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._write_orders())
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def stop(self):
+        """
+        Stops the order writer. Orders still queued are not placed: their
+        requests fail with a RuntimeError, as do requests submitted later.
+        """
+        if self._writer_task is not None:
+            self._writer_task.cancel()
+            try:
+                await self._writer_task
+            except asyncio.CancelledError:
+                pass
+            self._writer_task = None
+            while not self._queue.empty():
+                _, future = self._queue.get_nowait()
+                if not future.done():
+                    future.set_exception(RuntimeError("Error placing order: the service was stopped"))
+
+    async def submit(self, orders: list[list[tuple[str, int]]]) -> list[dict]:
+        """
+        Queues orders for the writer and waits until they are placed.
+
+        :param orders: Orders as lists of (product name, quantity) items.
+        :type orders: list[list[tuple[str, int]]]
+        :return: Per order ``{"total": ...}`` with the total as text, ``{"error": ...}`` if the
+                 order was rejected, or the exception the store failed with, e.g. an OSError
+                 of its journal. Every order is placed or failed on its own.
+        :rtype: list[dict | Exception]
+        :raises RuntimeError: If the service is stopped.
+        """
+        if self._writer_task is None:
+            raise RuntimeError("Error placing order: the service is not running")
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((orders, future))
+        return await future
+
+    async def _write_orders(self):
+        """
+        Places queued orders one after the other, taking all queued orders at once.
+
+        An order failing with an error other than a rejected order, e.g. when
+        the journal cannot be written, gets the error as its result, and the
+        writer goes on with the next order.
+        """
+        while True:
+            batch = [await self._queue.get()]
+            while len(batch) < self._batch_size and not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            for orders, future in batch:
+                results = []
+                for items in orders:
+                    try:
+                        results.append(self._place_order(items))
+                    except Exception as e:
+                        results.append(e)
+                if not future.done():
+                    future.set_result(results)
+
+    def _place_order(self, items: list[tuple[str, int]]) -> dict:
+        """
+        Places one order in the store. Only called by the writer.
+
+        :param items: The order as (product name, quantity) items.
+        :type items: list[tuple[str, int]]
+        :return: ``{"total": ...}`` with the total as text, or ``{"error": ...}``.
+        :rtype: dict
+        """
+        shopping_list = []
+        for name, quantity in items:
+            product = self._products_by_name.get(name)
+            if product is None or not self._store.has_product(product):
+                return {"error": f"Error while making order! Product '{name}' is not available."}
+            shopping_list.append((product, quantity))
+        try:
+            return {"total": str(self._store.order(shopping_list))}
+        except ValueError as e:
+            return {"error": str(e)}
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Answers the requests of one keep-alive connection until the client closes it.
+
+        :param reader: Stream of the requests.
+        :type reader: asyncio.StreamReader
+        :param writer: Stream of the responses.
+        :type writer: asyncio.StreamWriter
+        """
+        try:
+            while True:
+                try:
+                    request = await read_message(reader)
+                except ValueError as e:
+                    writer.write(encode_response(400, {"error": str(e)}))
+                    break
+                if request is None:
+                    break
+                start_line, headers, body = request
+                method, target = start_line.split(" ")[:2]
+                status, payload = await self._route(method, target, body)
+                writer.write(encode_response(status, payload))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def _route(self, method: str, target: str, body: bytes) -> tuple[int, dict]:
+        """
+        Answers one request.
+
+        :param method: The HTTP method.
+        :type method: str
+        :param target: The request path with its query.
+        :type target: str
+        :param body: The request body.
+        :type body: bytes
+        :return: The response status and JSON payload.
+        :rtype: tuple[int, dict]
+        """
+        url = urlsplit(target)
+        try:
+            if method == "GET" and url.path == "/products":
+                query = parse_qs(url.query)
+                page = int(query.get("page", ["0"])[0])
+                size = min(int(query.get("size", [str(PAGE_SIZE)])[0]), MAX_PAGE_SIZE)
+                return 200, {
+                    "page": page,
+                    "page_count": self._store.get_page_count(size),
+                    "products": [product_to_dict(product)
+                                 for product in self._store.get_products_page(page, size)],
+                }
+            if method == "GET" and url.path == "/total-quantity":
+                return 200, {"total_quantity": self._store.get_total_quantity()}
+            if method == "POST" and url.path == "/orders":
+                [result] = await self.submit([parse_order(json.loads(body))])
+                if isinstance(result, Exception):
+                    raise result
+                return (409 if "error" in result else 200), result
+            if method == "POST" and url.path == "/orders/batch":
+                request = json.loads(body)
+                if not isinstance(request, dict) or not isinstance(request.get("orders"), list):
+                    raise ValueError("Error reading request: 'orders' must be a list of orders")
+                results = await self.submit([parse_order(order) for order in request["orders"]])
+                return 200, {"results": [{"error": f"Error placing order: {result}"}
+                                         if isinstance(result, Exception) else result for result in results]}
+        except ValueError as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            # the store failed, e.g. writing its journal, or the service is stopping
+            return 500, {"error": f"Error placing order: {e}"}
+        return 404, {"error": f"Error reading request: no route for {method} {url.path}"}
+
+
+def product_to_dict(product: Product) -> dict:
+    """
+    Describes a product for a JSON response.
+
+    :param product: The product to describe.
+    :type product: Product
+    :return: Name, price, quantity and promotion name (or None) of the product.
+    :rtype: dict
+    """
+    promotion = product.promotion
+    return {
+        "name": product.name,
+        "price": product.price,
+        "quantity": product.quantity,
+        "promotion": promotion.name if promotion is not None else None,
+    }
+
+
+def parse_order(order) -> list[tuple[str, int]]:
+    """
+    Reads an order from a decoded JSON request.
+
+    :param order: ``{"items": [{"name": ..., "quantity": ...}, ...]}``.
+    :return: The order as (product name, quantity) items.
+    :rtype: list[tuple[str, int]]
+    :raises ValueError: If the order is not in the expected form.
+    """
+    items = order.get("items") if isinstance(order, dict) else None
+    if not isinstance(items, list) or not items:
+        raise ValueError("Error reading request: an order needs a non-empty list of 'items'")
+    parsed = []
+    for item in items:
+        name = item.get("name") if isinstance(item, dict) else None
+        quantity = item.get("quantity") if isinstance(item, dict) else None
+        if not isinstance(name, str) or type(quantity) is not int:
+            raise ValueError("Error reading request: every item needs a 'name' and a whole 'quantity'")
+        parsed.append((name, quantity))
+    return parsed
+
+
+async def read_message(reader: asyncio.StreamReader) -> tuple[str, dict[str, str], bytes] | None:
+    """
+    Reads one HTTP/1.1 request or response with a ``Content-Length`` body.
+
+    :param reader: The stream to read from.
+    :type reader: asyncio.StreamReader
+    :return: Start line, headers with lowercase names and body, or None if the stream ended.
+    :rtype: tuple[str, dict[str, str], bytes] | None
+    :raises ValueError: If the message is malformed.
+    """
+    start_line = await reader.readline()
+    if not start_line:
+        return None
+    start_line = start_line.decode("latin-1").rstrip("\r\n")
+    if start_line.count(" ") < 2:
+        raise ValueError("Error reading request: malformed start line")
+
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b"\n", b""):
+        name, separator, value = line.decode("latin-1").partition(":")
+        if not separator:
+            raise ValueError("Error reading request: malformed header")
+        headers[name.strip().lower()] = value.strip()
+
+    length = headers.get("content-length", "0")
+    if not length.isdigit():
+        raise ValueError("Error reading request: malformed Content-Length")
+    return start_line, headers, await reader.readexactly(int(length))
+
+
+def encode_response(status: int, payload: dict) -> bytes:
+    """
+    Encodes a JSON HTTP/1.1 response.
+
+    :param status: The response status.
+    :type status: int
+    :param payload: The JSON payload.
+    :type payload: dict
+    :return: The response, ready to be written.
+    :rtype: bytes
+    """
+    body = json.dumps(payload).encode()
+    head = (f"HTTP/1.1 {status} {STATUS_TEXTS[status]}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n")
+    return head.encode("latin-1") + body
+
+
+async def serve(store: Store, host: str, port: int):
+    """
+    Runs the service until it is interrupted.
+
+    :param store: The store to serve.
+    :type store: Store
+    :param host: Address to listen on.
+    :type host: str
+    :param port: Port to listen on.
+    :type port: int
+    """
+    service = OrderService(store)
+    server = await service.start(host, port)
+    print(f"Serving the store on http://{host}:{server.sockets[0].getsockname()[1]}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await service.stop()
+
+
+def main():
+    """
+    Starts the checkout service with the built-in inventory or a catalog file.
+    Like the terminal app, the stock is kept in the journal in the ``data`` directory.
+    """
+    parser = argparse.ArgumentParser(description="HTTP checkout service for the store.")
+    parser.add_argument("catalog", nargs="?", help="CSV or JSON Lines catalog, the built-in inventory by default.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    product_list = list(read_catalog(args.catalog)) if args.catalog else build_default_catalog()
+    store = Store(product_list, journal=InventoryJournal("data"))
+    try:
+        asyncio.run(serve(store, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.checkpoint()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,424 @@
+import itertools
+import multiprocessing
+import os
+import threading
+import zlib
+from contextlib import ExitStack
+from heapq import merge
+from multiprocessing.connection import Connection
+
+from money import Money
+from products import Product
+from store import Store
+
+# An order line sent to a shard: (product name, quantity)
+OrderItem = tuple[str, int]
+
+
+def shard_of(name: str, shard_count: int) -> int:
+    """
+    Returns the shard owning the product with the given name.
+
+    :param name: The product's name, which identifies it across processes.
+    :type name: str
+    :param shard_count: Number of shards.
+    :type shard_count: int
+    :return: Index of the shard, stable across processes and runs.
+    :rtype: int
+    """
+    return zlib.crc32(name.encode()) % shard_count
+
+
+class _Shard:
+    """
+    Represents the part of a sharded store's products owned by one worker process.
+
+    A shard is only used by the single thread of its worker, which handles
+    one request at a time, so a reservation is never interleaved with
+    another order of the same shard.
+    """
+
+    def __init__(self, products: list[tuple[int, Product]]):
+        """
+        Initializes the shard with its products.
+
+        :param products: (position in the sharded store, product) pairs.
+        :type products: list[tuple[int, Product]]
+        """
+        self._store = Store([product for _, product in products])
+        self._positions = {id(product): position for position, product in products}
+        self._products_by_name: dict[str, Product] = {}
+        for _, product in products:
+            self._products_by_name.setdefault(product.name, product)
+        self._reservations: dict[int, list[tuple[Product, int]]] = {}
+
+    def _lines(self, items: list[OrderItem]) -> list[tuple[Product, int]]:
+        """
+        Looks up the products of order items, leaving out products that are not in the shard's store.
+
+        :param items: Order items as (product name, quantity) pairs.
+        :type items: list[OrderItem]
+        :return: Order lines with duplicate products merged.
+        :rtype: list[tuple[Product, int]]
+        """
+        lines: dict[int, list] = {}
+        for name, quantity in items:
+            product = self._products_by_name.get(name)
+            if product is None or not self._store.has_product(product):
+                continue
+            if id(product) in lines:
+                lines[id(product)][1] += quantity
+            else:
+                lines[id(product)] = [product, quantity]
+        return [(product, quantity) for product, quantity in lines.values()]
+
+    def order(self, items: list[OrderItem]) -> int:
+        """
+        Places an order touching only this shard.
+
+        :return: Total of the order in cents.
+        :rtype: int
+        :raises ValueError: If any line cannot be bought.
+        """
+        return self._store.order(self._lines(items)).cents
+
+    def order_many(self, orders: list[list[OrderItem]]) -> list[tuple[str, int | str]]:
+        """
+        Places several orders touching only this shard, each all-or-nothing.
+
+        :return: ("ok", total in cents) or ("error", message) per order.
+        :rtype: list[tuple[str, int | str]]
+        """
+        results = []
+        for items in orders:
+            try:
+                results.append(("ok", self.order(items)))
+            except ValueError as e:
+                results.append(("error", str(e)))
+        return results
+
+    def reserve(self, order_id: int, items: list[OrderItem]) -> int:
+        """
+        Takes the stock of the shard's part of an order, to be committed or aborted later.
+
+        :param order_id: Identifier of the order, unique per sharded store.
+        :type order_id: int
+        :param items: The shard's part of the order.
+        :type items: list[OrderItem]
+        :return: Price of the reserved lines in cents.
+        :rtype: int
+        :raises ValueError: If any line cannot be bought. Nothing is reserved in that case.
+        """
+        lines = self._lines(items)
+        for product, quantity in lines:
+            product.check_purchase(quantity)
+        for product, quantity in lines:
+            product.take_stock(quantity)
+        self._reservations[order_id] = lines
+        return self._store.price_cart(lines).cents
+
+    def reserve_many(self, reservations: list[tuple[int, list[OrderItem]]]) -> list[tuple[str, int | str]]:
+        """
+        Reserves the shard's parts of several orders, each all-or-nothing.
+
+        :param reservations: (order id, the shard's part of the order) pairs.
+        :type reservations: list[tuple[int, list[OrderItem]]]
+        :return: ("ok", price in cents) or ("error", message) per order.
+        :rtype: list[tuple[str, int | str]]
+        """
+        results = []
+        for order_id, items in reservations:
+            try:
+                results.append(("ok", self.reserve(order_id, items)))
+            except ValueError as e:
+                results.append(("error", str(e)))
+        return results
+
+    def finish_many(self, commit_ids: list[int], abort_ids: list[int]):
+        """
+        Commits and aborts several reserved orders.
+
+        :param commit_ids: Identifiers of the orders to commit.
+        :type commit_ids: list[int]
+        :param abort_ids: Identifiers of the orders to abort.
+        :type abort_ids: list[int]
+        """
+        for order_id in abort_ids:
+            self.abort(order_id)
+        for order_id in commit_ids:
+            self.commit(order_id)
+
+    def commit(self, order_id: int):
+        """
+        Completes a reserved order, removing the products it sold out like ``Store.order``.
+
+        :param order_id: Identifier of the reserved order.
+        :type order_id: int
+        """
+        for product, _ in self._reservations.pop(order_id):
+            if not product.is_active() and self._store.has_product(product):
+                self._store.remove_product(product)
+
+    def abort(self, order_id: int):
+        """
+        Returns the stock taken by a reserved order.
+
+        :param order_id: Identifier of the reserved order.
+        :type order_id: int
+        """
+        for product, quantity in self._reservations.pop(order_id):
+            product.restock(quantity)
+
+    def get_total_quantity(self) -> int:
+        """Returns the total quantity of the shard's products."""
+        return self._store.get_total_quantity()
+
+    def get_all_products(self) -> list[tuple[int, Product]]:
+        """
+        Returns copies of the shard's active products with their positions in the sharded store.
+
+        :return: (position, product copy) pairs in ascending order of position.
+        :rtype: list[tuple[int, Product]]
+        """
+        return [(self._positions[id(product)], product.copy()) for product in self._store.get_all_products()]
+
+
+def _run_shard(connection: Connection, products: list[tuple[int, Product]]):
+    """
+    Serves the requests of a sharded store to one shard until it is closed. Runs in a worker process.
+
+    Requests are (method name, arguments) tuples, answered with ("ok", result)
+    or ("error", message) when the shard raised a ValueError.
+
+    :param connection: The worker's end of the pipe to the sharded store.
+    :type connection: Connection
+    :param products: (position, product) pairs owned by the shard.
+    :type products: list[tuple[int, Product]]
+    """
+    shard = _Shard(products)
+    while True:
+        method, arguments = connection.recv()
+        if method == "close":
+            break
+        try:
+            connection.send(("ok", getattr(shard, method)(*arguments)))
+        except ValueError as e:
+            connection.send(("error", str(e)))
+    connection.close()
+
+
+class ShardedStore:
+    """
+    Represents a store whose products are split across worker processes, so
+    orders of different shards are placed in parallel on several cores
+    instead of taking turns on the GIL of one process.
+
+    Every product is owned by the shard chosen by the hash of its name, and
+    products are identified by name across processes. An order touching one
+    shard is placed by that shard alone. An order touching several shards is
+    placed with a two-phase reservation: every shard takes the stock of its
+    lines, and the order is committed only if all of them succeeded, otherwise
+    the reserved stock is returned. Totals and listings are collected from all shards.
+
+    Requests to a shard are sent under the shard's lock, and an order locks
+    its shards in ascending order, so the store can be shared between threads.
+    Cart rules are not supported, as they span the products of several shards.
+    """
+
+    def __init__(self, products: list[Product], shard_count: int | None = None):
+        """
+        Initializes the store, starting one worker process per shard with copies of the given products.
+
+        :param products: Products to distribute. The shards own copies, the given products are not changed.
+        :type products: list[Product]
+        :param shard_count: Number of worker processes, the number of CPUs by default.
+        :type shard_count: int | None
+        """
+        self._shard_count = shard_count or os.cpu_count() or 1
+        groups: list[list[tuple[int, Product]]] = [[] for _ in range(self._shard_count)]
+        for position, product in enumerate(products):
+            groups[shard_of(product.name, self._shard_count)].append((position, product.copy()))
+
+        self._connections: list[Connection] = []
+        self._processes: list[multiprocessing.Process] = []
+        self._locks = [threading.Lock() for _ in range(self._shard_count)]
+        self._order_ids = itertools.count()
+        context = multiprocessing.get_context()
+        for group in groups:
+            connection, worker_connection = context.Pipe()
+            process = context.Process(target=_run_shard, args=(worker_connection, group), daemon=True)
+            process.start()
+            worker_connection.close()
+            self._connections.append(connection)
+            self._processes.append(process)
+
+    def _exchange(self, requests: dict[int, tuple]) -> dict[int, tuple[str, object]]:
+        """
+        Sends a request to each of several shards and waits for all of their answers.
+
+        All requests are sent before the first answer is read, so the shards
+        handle them in parallel.
+
+        :param requests: (method name, arguments) request per shard index.
+        :type requests: dict[int, tuple]
+        :return: ("ok", result) or ("error", message) answer per shard index.
+        :rtype: dict[int, tuple[str, object]]
+        """
+        shards = sorted(requests)
+        with ExitStack() as stack:
+            for shard in shards:
+                stack.enter_context(self._locks[shard])
+            for shard in shards:
+                self._connections[shard].send(requests[shard])
+            return {shard: self._connections[shard].recv() for shard in shards}
+
+    def _group_items(self, shopping_list: list[tuple[Product, int]]) -> dict[int, list[OrderItem]]:
+        """
+        Splits a shopping list into the items of each shard.
+
+        :param shopping_list: Order items as (product, quantity) tuples.
+        :type shopping_list: list[tuple[Product, int]]
+        :return: (product name, quantity) items per shard index.
+        :rtype: dict[int, list[OrderItem]]
+        """
+        items: dict[int, list[OrderItem]] = {}
+        for product, quantity in shopping_list:
+            items.setdefault(shard_of(product.name, self._shard_count), []).append((product.name, quantity))
+        return items
+
+    def order(self, shopping_list: list[tuple[Product, int]]) -> Money:
+        """
+        Processes an order, all-or-nothing, like ``Store.order``.
+
+        Products are matched by name, so products returned by
+        ``get_all_products`` can be ordered. Products that are not in the store are skipped.
+
+        :param shopping_list: List of order items as (product, quantity) tuples.
+        :type shopping_list: list[tuple[Product, int]]
+        :return: Total cost of the order, after product promotions.
+        :rtype: Money
+        :raises ValueError: If any line cannot be bought. No stock is changed in that case.
+        """
+        items = self._group_items(shopping_list)
+        if not items:
+            return Money(0)
+        if len(items) == 1:
+            [(shard, shard_items)] = items.items()
+            status, result = self._exchange({shard: ("order", (shard_items,))})[shard]
+            if status == "error":
+                raise ValueError(result)
+            return Money(result)
+
+        order_id = next(self._order_ids)
+        answers = self._exchange({shard: ("reserve", (order_id, shard_items))
+                                  for shard, shard_items in items.items()})
+        errors = [result for status, result in answers.values() if status == "error"]
+        if errors:
+            reserved = [shard for shard, (status, _) in answers.items() if status == "ok"]
+            if reserved:
+                self._exchange({shard: ("abort", (order_id,)) for shard in reserved})
+            raise ValueError(errors[0])
+        self._exchange({shard: ("commit", (order_id,)) for shard in answers})
+        return Money(sum(result for _, result in answers.values()))
+
+    def order_many(self, shopping_lists: list[list[tuple[Product, int]]]) -> list[Money | ValueError]:
+        """
+        Processes several independent orders, each all-or-nothing.
+
+        Instead of one request per order and shard, every shard gets one
+        request with all its single-shard orders, one with all its
+        reservations for orders spanning several shards and one committing
+        or aborting them, which saves most of the cost of communicating with
+        the worker processes. A reservation holds its stock until the batch is
+        finished, so an order may fail on stock held by a reservation of the
+        same batch that is aborted later.
+
+        :param shopping_lists: The orders, each a list of (product, quantity) tuples.
+        :type shopping_lists: list[list[tuple[Product, int]]]
+        :return: Per order its total, or the ValueError it failed with.
+        :rtype: list[Money | ValueError]
+        """
+        results: list[Money | ValueError] = [Money(0)] * len(shopping_lists)
+        single_shard: dict[int, list[tuple[int, list[OrderItem]]]] = {}
+        reservations: dict[int, list[tuple[int, list[OrderItem]]]] = {}
+        order_indexes: dict[int, int] = {}
+        for index, shopping_list in enumerate(shopping_lists):
+            items = self._group_items(shopping_list)
+            if len(items) == 1:
+                [(shard, shard_items)] = items.items()
+                single_shard.setdefault(shard, []).append((index, shard_items))
+            elif items:
+                order_id = next(self._order_ids)
+                order_indexes[order_id] = index
+                for shard, shard_items in items.items():
+                    reservations.setdefault(shard, []).append((order_id, shard_items))
+
+        if single_shard:
+            answers = self._exchange({shard: ("order_many", ([shard_items for _, shard_items in orders],))
+                                      for shard, orders in single_shard.items()})
+            for shard, (_, order_results) in answers.items():
+                for (index, _), (status, result) in zip(single_shard[shard], order_results):
+                    results[index] = Money(result) if status == "ok" else ValueError(result)
+
+        if reservations:
+            totals = dict.fromkeys(order_indexes, 0)
+            errors: dict[int, str] = {}
+            answers = self._exchange({shard: ("reserve_many", (shard_reservations,))
+                                      for shard, shard_reservations in reservations.items()})
+            for shard, (_, reserve_results) in answers.items():
+                for (order_id, _), (status, result) in zip(reservations[shard], reserve_results):
+                    if status == "ok":
+                        totals[order_id] += result
+                    else:
+                        errors.setdefault(order_id, result)
+
+            finish_requests = {}
+            for shard, (_, reserve_results) in answers.items():
+                reserved = [order_id for (order_id, _), (status, _) in zip(reservations[shard], reserve_results)
+                            if status == "ok"]
+                finish_requests[shard] = ("finish_many", (
+                    [order_id for order_id in reserved if order_id not in errors],
+                    [order_id for order_id in reserved if order_id in errors]))
+            self._exchange(finish_requests)
+
+            for order_id, index in order_indexes.items():
+                results[index] = ValueError(errors[order_id]) if order_id in errors else Money(totals[order_id])
+        return results
+
+    def get_total_quantity(self) -> int:
+        """
+        Returns the total quantity of all products of all shards.
+
+        :return: Sum of the quantities of all products in the store.
+        :rtype: int
+        """
+        answers = self._exchange({shard: ("get_total_quantity", ()) for shard in range(self._shard_count)})
+        return sum(result for _, result in answers.values())
+
+    def get_all_products(self) -> list[Product]:
+        """
+        Returns copies of all active products of all shards, in the order they were given to the store.
+
+        :return: Snapshots of the products; changing them does not change the store.
+        :rtype: list[Product]
+        """
+        answers = self._exchange({shard: ("get_all_products", ()) for shard in range(self._shard_count)})
+        return [product for _, product in merge(*(result for _, result in answers.values()),
+                                                key=lambda entry: entry[0])]
+
+    def close(self):
+        """Stops the worker processes. The store cannot be used afterwards."""
+        for lock, connection in zip(self._locks, self._connections):
+            with lock:
+                connection.send(("close", ()))
+                connection.close()
+        for process in self._processes:
+            process.join()
+
+    def __enter__(self) -> "ShardedStore":
+        """Returns the store for use in a with statement, which closes it on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        """Stops the worker processes."""
+        self.close()
@@ -0,0 +1,152 @@
+import threading
+from typing import Callable, Iterable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from products import Product
+
+# Kinds of published events: a changed quantity, a product activated or
+# deactivated, and a quantity falling below the product's low-stock threshold
+EVENT_KINDS = ("quantity", "active", "low_stock")
+
+
+class StockEvent:
+    """
+    Represents a change of a product's stock published to subscribers.
+
+    For ``quantity`` and ``low_stock`` events the values are the quantities
+    before and after the change, for ``active`` events the active status.
+    """
+
+    __slots__ = ("product", "kind", "old_value", "new_value")
+
+    def __init__(self, product: "Product", kind: str, old_value: int | bool, new_value: int | bool):
+        """
+        Initializes the event.
+
+        :param product: The changed product.
+        :type product: Product
+        :param kind: One of ``EVENT_KINDS``.
+        :type kind: str
+        :param old_value: Value before the change.
+        :type old_value: int | bool
+        :param new_value: Value after the change.
+        :type new_value: int | bool
+        """
+        self.product = product
+        self.kind = kind
+        self.old_value = old_value
+        self.new_value = new_value
+
+    def __repr__(self) -> str:
+        """Returns a representation of the event for debugging."""
+        return f"StockEvent({self.product.name!r}, {self.kind!r}, {self.old_value!r}, {self.new_value!r})"
+
+
+class StockEvents:
+    """
+    Represents the subscribers to the stock events of a store and the low-stock thresholds of its products.
+
+    The owner reports every product change it observes with ``collect`` and
+    passes the returned events to ``publish`` once it released its own locks,
+    so subscribers may call back into the owner. Without subscribers,
+    ``collect`` returns at once, so unobserved stores pay almost nothing.
+
+    A low-stock alert is published when a quantity falls from at least the
+    threshold to below it. It is published again only after the quantity
+    has been back at or above the threshold.
+    """
+
+    def __init__(self):
+        """Initializes the hub without subscribers and thresholds."""
+        self._subscribers: tuple[tuple[Callable[[StockEvent], None], frozenset[str]], ...] = ()
+        self._thresholds: dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[StockEvent], None],
+                  kinds: Iterable[str] = EVENT_KINDS) -> Callable[[], None]:
+        """
+        Registers a callback called with every published event of the given kinds.
+
+        :param callback: Function called with each event, in the thread that changed the product.
+        :type callback: Callable[[StockEvent], None]
+        :param kinds: Kinds of events to receive, all by default.
+        :type kinds: Iterable[str]
+        :return: Function cancelling the subscription.
+        :rtype: Callable[[], None]
+        :raises ValueError: If a kind is unknown.
+        """
+        kinds = frozenset(kinds)
+        unknown = kinds - set(EVENT_KINDS)
+        if unknown:
+            raise ValueError(f"Error subscribing to stock events: unknown kinds {', '.join(sorted(unknown))}")
+        subscriber = (callback, kinds)
+        with self._lock:
+            self._subscribers += (subscriber,)
+
+        def unsubscribe():
+            with self._lock:
+                self._subscribers = tuple(entry for entry in self._subscribers if entry is not subscriber)
+
+        return unsubscribe
+
+    def set_threshold(self, product: "Product", threshold: int | None):
+        """
+        Sets the quantity below which a product is low on stock.
+
+        :param product: The product to watch.
+        :type product: Product
+        :param threshold: Lowest quantity not reported as low stock, or None to stop watching the product.
+        :type threshold: int | None
+        :raises ValueError: If the threshold is not a positive whole number.
+        """
+        if threshold is None:
+            self._thresholds.pop(id(product), None)
+            return
+        if not isinstance(threshold, int) or threshold <= 0:
+            raise ValueError("Error setting low-stock threshold: threshold must be a positive whole number")
+        self._thresholds[id(product)] = threshold
+
+    def get_threshold(self, product: "Product") -> int | None:
+        """
+        Returns the low-stock threshold of a product.
+
+        :param product: The watched product.
+        :type product: Product
+        :return: The threshold, or None if the product is not watched.
+        :rtype: int | None
+        """
+        return self._thresholds.get(id(product))
+
+    def collect(self, product: "Product", attribute: str, old_value, new_value) -> list[StockEvent]:
+        """
+        Turns a change of a product into the events to publish.
+
+        :param product: The changed product.
+        :type product: Product
+        :param attribute: The changed attribute, as reported to product observers.
+        :type attribute: str
+        :param old_value: Value of the attribute before the change.
+        :param new_value: Value of the attribute after the change.
+        :return: The events, empty without subscribers or for attributes other than quantity and active.
+        :rtype: list[StockEvent]
+        """
+        if not self._subscribers or attribute not in ("quantity", "active"):
+            return []
+        events = [StockEvent(product, attribute, old_value, new_value)]
+        threshold = self._thresholds.get(id(product))
+        if attribute == "quantity" and threshold is not None and new_value < threshold <= old_value:
+            events.append(StockEvent(product, "low_stock", old_value, new_value))
+        return events
+
+    def publish(self, events: list[StockEvent]):
+        """
+        Calls the subscribers of each event's kind with the event.
+
+        :param events: Events returned by ``collect``.
+        :type events: list[StockEvent]
+        """
+        subscribers = self._subscribers
+        for event in events:
+            for callback, kinds in subscribers:
+                if event.kind in kinds:
+                    callback(event)
@@ -1,28 +1,106 @@
+import threading
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+from cart_rules import CartRule, CartRuleIndex
+from journal import InventoryJournal
+from money import Money
+from price_index import PriceIndex
 from products import Product
+from search_index import NameIndex
+from stock_events import EVENT_KINDS, StockEvent, StockEvents
+from storecore import Inventory
+
+# Promotion groups with fewer lines are priced line by line, where batch pricing has no advantage.
+BATCH_PRICING_MIN_LINES = 32
 
 
-class Store:
+class Store(Inventory):
     """
     Represents a store containing products in stock.
+
+    The catalog keyed by product identity, the active products, the total
+    stock quantity and all-or-nothing orders are provided by the shared
+    ``Inventory``, which observes the products to keep them up to date
+    instead of recomputing them from the whole catalog on every query.
+    This class adds the bestbuy2 features on top. Active products
+    are also indexed by price for range and top-k queries; the index is built on
+    the first such query and kept up to date afterwards. Product names are
+    kept in an inverted index for search. The same observation publishes
+    quantity and activation changes, and low-stock alerts, to subscribers.
+
+    Cart rules such as bundles and basket thresholds are priced over the whole
+    order. They are indexed by product, so an order only evaluates the rules
+    of the products it contains.
+
+    A store can be shared between threads. Orders lock the products they
+    touch in a fixed order, while a store-wide lock guards the catalog and
+    the derived indexes. A product lock is always taken before the store lock.
+
+    With an ``InventoryJournal``, the stock survives restarts: every order is
+    logged before it completes, and the store restores the journaled stock
+    of its products on creation.
     """
 
-    def __init__(self, products: list[Product]):
+    def __init__(self, products: list[Product], journal: InventoryJournal | None = None):
         """
         Initializes a Store instance with the given products.
 
         :param products: List of products to assign to the store.
         :type products: list[Product]
+        :param journal: Journal to restore the stock from and to log orders to.
+        :type journal: InventoryJournal | None
+        """
+        self._product_lines: dict[int, str] = {}
+        self._price_index: PriceIndex | None = None
+        self._name_index = NameIndex()
+        self._cart_rules = CartRuleIndex()
+        self._stock_events = StockEvents()
+        self._lock = threading.Lock()
+        self._journal = None
+        super().__init__(products)
+        if journal is not None:
+            self._restore(journal)
+
+    def _restore(self, journal: InventoryJournal):
         """
-        self.products = products
+        Sets the quantities of the store's products to the stock saved in the journal, then logs orders to it.
+
+        Products missing from the journal keep their quantity. Products sold
+        out in the journal are removed, as they would have been by the order.
+
+        :param journal: Journal holding the saved stock.
+        :type journal: InventoryJournal
+        """
+        stock = journal.load()
+        for product in self.products:
+            quantity = stock.get(product.name)
+            if quantity is None or quantity == product.quantity:
+                continue
+            product.quantity = quantity
+            if not product.is_active():
+                self.remove_product(product)
+        self._journal = journal
+
+    def checkpoint(self):
+        """
+        Writes a snapshot of the current stock to the store's journal and empties its log.
+
+        :raises ValueError: If the store has no journal.
+        """
+        if self._journal is None:
+            raise ValueError("Error writing checkpoint: store has no journal")
+        self._journal.checkpoint(self.products)
 
     def add_product(self, product: Product):
         """
-        Adds a product to the store.
+        Adds a product to the store. Adding a product already in the store has no effect.
 
         :param product: Product to be added to the store.
         :type product: Product
         """
-        self.products.append(product)
+        with product.lock, self._lock:
+            super().add_product(product)
 
     def remove_product(self, product: Product):
         """
@@ -30,17 +108,132 @@ class Store:
 
         :param product: Product to be removed from the store.
         :type product: Product
+        :raises ValueError: If the product is not in the store.
+        """
+        with product.lock, self._lock:
+            super().remove_product(product)
+
+    def _index(self, product: Product):
+        """Adds a new product to the name index. Hold the store lock."""
+        self._name_index.add(product)
+
+    def _unindex(self, product: Product):
+        """Removes a removed product from the name index, the cached listing lines and the thresholds."""
+        self._name_index.remove(product)
+        self._product_lines.pop(id(product), None)
+        self._stock_events.set_threshold(product, None)
+
+    def _list(self, product: Product):
+        """Adds an active product to the listing and the price index. Hold the store lock."""
+        super()._list(product)
+        self._index_price(product)
+
+    def _unlist(self, product: Product):
+        """Removes a deactivated product from the listing and the price index. Hold the store lock."""
+        super()._unlist(product)
+        self._unindex_price(product, product.unit_price)
+
+    def _on_product_change(self, product: Product, attribute: str, old_value, new_value):
+        """
+        Keeps the active products, the indexes, the total quantity and the cached
+        listing line in sync with a changed product.
+
+        :param product: Product whose state has changed.
+        :type product: Product
+        :param attribute: Name of the changed attribute, e.g. ``quantity``, ``active`` or ``price``.
+        :type attribute: str
+        :param old_value: Value of the attribute before the change.
+        :param new_value: Value of the attribute after the change.
         """
-        self.products.remove(product)
+        events = self._stock_events.collect(product, attribute, old_value, new_value)
+        with self._lock:
+            self._product_lines.pop(id(product), None)
+            if attribute == "price":
+                if id(product) in self._active:
+                    self._unindex_price(product, old_value)
+                    self._index_price(product)
+            elif attribute == "name":
+                self._name_index.remove(product)
+                self._name_index.add(product)
+            else:
+                super()._on_product_change(product, attribute, old_value, new_value)
+        # subscribers are called without the store lock, so they can query the store
+        if events:
+            self._stock_events.publish(events)
 
-    def get_total_quantity(self) -> int:
+    def subscribe(self, callback: Callable[[StockEvent], None],
+                  kinds: Iterable[str] = EVENT_KINDS) -> Callable[[], None]:
         """
-        Gets the total quantity of all products in the store.
+        Subscribes to the stock events of the store's products, instead of polling the store for changes.
 
-        :return: Sum of the quantities of all products in the store.
-        :rtype: int
+        Events are ``quantity`` changes, ``active`` status changes and
+        ``low_stock`` alerts of products with a threshold set by
+        ``set_low_stock_threshold``. The callback is called in the thread
+        changing the product, while the product's lock is held, so it should
+        return quickly, e.g. by putting the event on a queue.
+
+        :param callback: Function called with each event.
+        :type callback: Callable[[StockEvent], None]
+        :param kinds: Kinds of events to receive, all by default.
+        :type kinds: Iterable[str]
+        :return: Function cancelling the subscription.
+        :rtype: Callable[[], None]
+        :raises ValueError: If a kind is unknown.
+        """
+        return self._stock_events.subscribe(callback, kinds)
+
+    def set_low_stock_threshold(self, product: Product, threshold: int | None):
+        """
+        Sets the quantity below which subscribers get a ``low_stock`` alert for a product.
+
+        The alert is sent when the quantity falls below the threshold, and sent
+        again only after the product was restocked to at least the threshold.
+
+        :param product: A product of the store.
+        :type product: Product
+        :param threshold: Lowest quantity not reported as low stock, or None to remove the threshold.
+        :type threshold: int | None
+        :raises ValueError: If the product is not in the store or the threshold is not positive.
+        """
+        with self._lock:
+            if id(product) not in self._catalog:
+                raise ValueError("Error setting low-stock threshold: product is not in the store")
+            self._stock_events.set_threshold(product, threshold)
+
+    def _price_key(self, product: Product, unit_price: Money) -> tuple[int, int]:
         """
-        return sum(product.quantity for product in self.products)
+        Returns the price index key of a product: its price, then its position in the store.
+
+        :param product: An indexed product.
+        :type product: Product
+        :param unit_price: The price the product is indexed with.
+        :type unit_price: Money
+        :return: The (price in cents, position) key.
+        :rtype: tuple[int, int]
+        """
+        return unit_price.cents, self._positions[id(product)]
+
+    def _index_price(self, product: Product):
+        """Adds an active product to the price index, if the index has been built. Hold the store lock."""
+        if self._price_index is not None:
+            self._price_index.add(self._price_key(product, product.unit_price), product)
+
+    def _unindex_price(self, product: Product, unit_price: Money):
+        """Removes a product indexed with the given price from the price index, if built. Hold the store lock."""
+        if self._price_index is not None:
+            self._price_index.remove(self._price_key(product, unit_price))
+
+    def _get_price_index(self) -> PriceIndex:
+        """
+        Returns the price index of the active products, building it on first use. Hold the store lock.
+
+        :return: The price index.
+        :rtype: PriceIndex
+        """
+        if self._price_index is None:
+            self._price_index = PriceIndex((self._price_key(product, product.unit_price), product)
+                                           for product in self._active.values())
+        return self._price_index
 
     def get_all_products(self) -> list[Product]:
         """
@@ -49,42 +242,373 @@ class Store:
         :return: A list of products with the attribute ``active`` set to True.
         :rtype: list[Product]
         """
-        return [product for product in self.products if product.is_active()]
+        with self._lock:
+            return super().get_all_products()
+
+    def get_products_page(self, page: int, page_size: int) -> list[Product]:
+        """
+        Returns one page of the active products, in the order of ``get_all_products``.
+
+        :param page: Index of the page, starting at 0.
+        :type page: int
+        :param page_size: Number of products per page.
+        :type page_size: int
+        :return: The products of the page, empty past the last page.
+        :rtype: list[Product]
+        :raises ValueError: If the page size is less than 1.
+        """
+        self._check_page_size(page_size)
+        if page < 0:
+            return []
+        with self._lock:
+            return self._get_listing()[page * page_size:(page + 1) * page_size]
+
+    def get_page_count(self, page_size: int) -> int:
+        """
+        Returns the number of pages of active products.
+
+        :param page_size: Number of products per page.
+        :type page_size: int
+        :return: The number of pages, 0 without active products.
+        :rtype: int
+        :raises ValueError: If the page size is less than 1.
+        """
+        self._check_page_size(page_size)
+        return -(-len(self._active) // page_size)
+
+    @staticmethod
+    def _check_page_size(page_size: int):
+        """
+        Validates the number of products per page of a listing.
+
+        :param page_size: Number of products per page.
+        :type page_size: int
+        :raises ValueError: If the page size is not a whole number of at least 1.
+        """
+        if not isinstance(page_size, int) or page_size < 1:
+            raise ValueError("Error listing products: page size must be a positive whole number")
+
+    def get_product_line(self, product: Product) -> str:
+        """
+        Returns the product's description for listings, formatted only when the product has changed.
+
+        :param product: A product of the store.
+        :type product: Product
+        :return: The product formatted with ``str()``.
+        :rtype: str
+        """
+        key = id(product)
+        with self._lock:
+            line = self._product_lines.get(key)
+            if line is None:
+                line = str(product)
+                if key in self._catalog:
+                    self._product_lines[key] = line
+            return line
+
+    def get_products_in_price_range(self, low: float | int, high: float | int) -> list[Product]:
+        """
+        Returns the active products priced between two prices, both inclusive.
+
+        :param low: The lowest price.
+        :type low: float | int
+        :param high: The highest price.
+        :type high: float | int
+        :return: The products in ascending order of price, equally priced ones in insertion order.
+        :rtype: list[Product]
+        """
+        low_cents, high_cents = Money.from_amount(low).cents, Money.from_amount(high).cents
+        with self._lock:
+            return self._get_price_index().between(low_cents, high_cents)
 
-    def order(self, shopping_list: list[tuple[Product, int]]) -> float:
+    def get_cheapest_products(self, count: int) -> list[Product]:
+        """
+        Returns the cheapest active products.
+
+        :param count: Maximum number of products to return.
+        :type count: int
+        :return: The products in ascending order of price.
+        :rtype: list[Product]
+        """
+        with self._lock:
+            return self._get_price_index().cheapest(count)
+
+    def get_most_expensive_products(self, count: int) -> list[Product]:
+        """
+        Returns the most expensive active products.
+
+        :param count: Maximum number of products to return.
+        :type count: int
+        :return: The products in descending order of price.
+        :rtype: list[Product]
+        """
+        with self._lock:
+            return self._get_price_index().most_expensive(count)
+
+    def search_products(self, query: str, limit: int = 20) -> list[Product]:
+        """
+        Finds active products by name, e.g. "macbook ai" finds "MacBook Air M2".
+
+        Every word of the query must match a whole word of the name, ignoring
+        case, except the last word, which may be the start of a word.
+
+        :param query: The search text.
+        :type query: str
+        :param limit: Maximum number of products to return.
+        :type limit: int
+        :return: The matching products, at most ``limit``.
+        :rtype: list[Product]
+        """
+        with self._lock:
+            matches = (product for product in self._name_index.search(query) if id(product) in self._active)
+            return list(islice(matches, max(limit, 0)))
+
+    def order(self, shopping_list: list[tuple[Product, int]]) -> Money:
         """
         Processes an order by purchasing products from the given shopping list.
 
+        The order is all-or-nothing: duplicate lines for the same product are
+        merged, every line is checked before any stock is taken, and if buying
+        any line fails, stock taken by the preceding lines is returned.
+        Products that are not assigned to the store are skipped.
+
+        The locks of all ordered products are held while the order is checked
+        and bought, so concurrent orders can never oversell a product. Locks are
+        acquired once each, in ascending ``id()`` order of the lock objects, to
+        rule out deadlocks between orders. A single-line order, the most common
+        one, simply takes the lock of its product.
+
         :param shopping_list: List of order items, where each item is a tuple
                               containing a product and the quantity to purchase.
         :type shopping_list: list[tuple[Product, int]]
-        :return: Total cost of the order.
-        :rtype: float
-        :raises ValueError: If the requested quantity exceeds available stock for any product.
+        :return: Total cost of the order, after product promotions and cart rules.
+        :rtype: Money
+        :raises ValueError: If any line cannot be bought, e.g. the requested quantity
+                            exceeds available stock. No stock is changed in that case.
+        :raises OSError: If the order cannot be written to the store's journal.
+                         No stock is changed in that case.
+        """
+        lines = self._collect_order_lines(shopping_list)
+
+        if len(lines) == 1:
+            with lines[0][0].lock:
+                lines = self._buy_lines(lines)
+        else:
+            locks_by_id = {}
+            for product, _ in lines:
+                lock = product.lock
+                locks_by_id[id(lock)] = lock
+            locks = [locks_by_id[key] for key in sorted(locks_by_id)]
+            acquired = 0
+            try:
+                for lock in locks:
+                    lock.acquire()
+                    acquired += 1
+                lines = self._buy_lines(lines)
+            finally:
+                for lock in locks[:acquired]:
+                    lock.release()
+
+        if self._journal is not None and self._journal.checkpoint_due:
+            self.checkpoint()
+        return self._price_order(lines)
+
+    def _buy_lines(self, lines: list[tuple[Product, int]]) -> list[tuple[Product, int]]:
+        """
+        Checks and takes the stock of merged order lines, all or nothing. Hold the locks of all ordered products.
+
+        :param lines: Order lines with one line per product.
+        :type lines: list[tuple[Product, int]]
+        :return: The bought lines, without products removed from the store by another order.
+        :rtype: list[tuple[Product, int]]
+        :raises ValueError: If any line cannot be bought. No stock is changed in that case.
+        :raises OSError: If the order cannot be written to the store's journal. No stock is changed in that case.
+        """
+        # another order may have removed a product before its lock was acquired
+        catalog = self._catalog
+        return super()._buy_lines([(product, quantity) for product, quantity in lines if id(product) in catalog])
+
+    def _take_stock(self, lines: list[tuple[Product, int]]):
+        """
+        Takes the stock of checked order lines and logs the changed quantities to the journal, if any.
+
+        :param lines: Checked order lines.
+        :type lines: list[tuple[Product, int]]
+        :raises ValueError: If any line cannot be bought. Stock taken by earlier lines is returned.
+        :raises OSError: If the order cannot be logged. All taken stock is returned.
+        """
+        journal = self._journal
+        if journal is None:
+            super()._take_stock(lines)
+            return
+
+        # the journal lock keeps snapshots from seeing stock taken by an order that is not logged yet
+        with journal.lock:
+            stock_before = [product.quantity for product, _ in lines]
+            super()._take_stock(lines)
+            changes = [(product.name, product.quantity) for (product, _), quantity in zip(lines, stock_before)
+                       if product.quantity != quantity]
+            if changes:
+                try:
+                    journal.record(changes)
+                except OSError:
+                    for product, quantity in lines:
+                        product.restock(quantity)
+                    raise
+
+    def _price_order(self, lines: list[tuple[Product, int]]) -> Money:
+        """
+        Calculates the total price of bought order lines; see ``price_cart``.
+
+        :param lines: The bought order lines.
+        :type lines: list[tuple[Product, int]]
+        :return: Total price of all lines after all discounts.
+        :rtype: Money
+        """
+        return self.price_cart(lines)
+
+    @staticmethod
+    def _price_lines(shopping_list: list[tuple[Product, int]]) -> list[int]:
+        """
+        Calculates the price of every order line, including product promotions.
+
+        Lines are grouped by promotion. Large groups are priced with one call of
+        ``Promotion.apply_promotion_many``, so large carts and re-pricing runs are
+        priced in a few vectorized passes. Small groups, typical for checkout,
+        use the memoized per-line prices of ``Product.get_price`` instead.
+
+        :param shopping_list: List of order items as (product, quantity) tuples.
+        :type shopping_list: list[tuple[Product, int]]
+        :return: Price of every line in cents, in the order of the shopping list.
+        :rtype: list[int]
         """
-        total = 0
-        for product, quantity in shopping_list:
-            if product in self.products:
-                total += product.buy(quantity)
-                if not product.is_active():
-                    self.remove_product(product)
+        line_prices = [0] * len(shopping_list)
+        promoted_lines: dict[int, list[int]] = {}
+        for index, (product, quantity) in enumerate(shopping_list):
+            if product.promotion is None:
+                line_prices[index] = product.unit_price.cents * quantity
+            else:
+                promoted_lines.setdefault(id(product.promotion), []).append(index)
+
+        for indexes in promoted_lines.values():
+            if len(indexes) < BATCH_PRICING_MIN_LINES:
+                for index in indexes:
+                    product, quantity = shopping_list[index]
+                    line_prices[index] = product.get_price(quantity).cents
+                continue
+
+            promotion = shopping_list[indexes[0]][0].promotion
+            unit_prices = [shopping_list[index][0].unit_price.cents for index in indexes]
+            quantities = [shopping_list[index][1] for index in indexes]
+            for index, price in zip(indexes, promotion.apply_promotion_many(unit_prices, quantities)):
+                line_prices[index] = int(price)
+
+        return line_prices
 
-        return total
+    def price_cart(self, shopping_list: list[tuple[Product, int]]) -> Money:
+        """
+        Calculates the total price of order lines, including product promotions
+        and the store's cart rules, without buying them.
+
+        :param shopping_list: List of order items as (product, quantity) tuples.
+        :type shopping_list: list[tuple[Product, int]]
+        :return: Total price of all lines after all discounts.
+        :rtype: Money
+        """
+        line_prices = self._price_lines(shopping_list)
+        total = sum(line_prices)
+        if len(self._cart_rules):
+            total -= self._cart_rules.get_discount(shopping_list, line_prices)
+        return Money(total)
+
+    def add_rule(self, rule: CartRule):
+        """
+        Adds a cart rule, e.g. a bundle or a basket threshold, applied to every order of the store.
+
+        :param rule: The cart rule to add.
+        :type rule: CartRule
+        """
+        with self._lock:
+            self._cart_rules.add_rule(rule)
 
-    def __contains__(self, item: Product):
+    def remove_rule(self, rule: CartRule):
         """
-        Checks if the given product is in the store's active product list.
+        Removes a cart rule from the store.
 
-        :param item: Product to check for in the store.
-        :type item: Product
-        :return: True if the product is in the store, otherwise False.
-        :rtype: bool
+        :param rule: The cart rule to remove.
+        :type rule: CartRule
+        :raises ValueError: If the rule is not in the store.
         """
-        return item in self.get_all_products()
+        with self._lock:
+            try:
+                self._cart_rules.remove_rule(rule)
+            except (ValueError, KeyError):
+                raise ValueError("Error removing cart rule: rule is not in the store")
+
+    def __iter__(self) -> Iterator[Product]:
+        """
+        Iterates lazily over the active products, in the order of ``get_all_products``.
+
+        The iteration sees the products that were active when it started,
+        without copying the listing up front.
+
+        :return: Iterator of active products.
+        :rtype: Iterator[Product]
+        """
+        with self._lock:
+            listing = self._get_listing()
+            self._listing_shared = True
+        yield from listing
+
+    def merge(self, other_store: "Store", copy_products: bool = True) -> "Store":
+        """
+        Merges the products of this store with those of another store into a new store.
+
+        Products are matched by name. Matching products become one product with
+        the summed stock, taking the price, promotion and type of the first one
+        found, this store's products first. The merge makes one pass over both
+        catalogs, so it takes linear time.
+
+        By default every product of the new store is a copy, so the new store
+        and the merged stores do not share stock. With ``copy_products`` set to
+        False, products found in only one store are shared instead of copied,
+        which avoids duplicating large catalogs in memory: selling a shared
+        product in either store then takes from the same stock. Matched products
+        are always new products, as their summed stock belongs to neither store.
+
+        :param other_store: Another store to merge with this store.
+        :type other_store: Store
+        :param copy_products: Whether to copy products found in only one store.
+        :type copy_products: bool
+        :return: A new store containing the products of both stores.
+        :rtype: Store
+        """
+        merged: dict[str, Product] = {}
+        copied: set[str] = set()
+        for product in self.products + other_store.products:
+            name = product.name
+            existing = merged.get(name)
+            if existing is None:
+                if copy_products:
+                    merged[name] = product.copy()
+                    copied.add(name)
+                else:
+                    merged[name] = product
+                continue
+
+            if name not in copied:
+                existing = merged[name] = existing.copy()
+                copied.add(name)
+            existing.restock(product.quantity)
+
+        return Store(list(merged.values()))
 
     def __add__(self, other_store: "Store"):
         """
-        Combines the products of this store with those of another store, creating a new store.
+        Merges the products of this store with those of another store, creating a new store.
+
+        Products with the same name are merged into one product with the summed
+        stock, and all products are copied; see ``merge``.
 
         :param other_store: Another store to combine with this store.
         :type other_store: Store
@@ -93,5 +617,5 @@ class Store:
         :raises NotImplementedError: If the other_store is not an instance of the Store class.
         """
         if isinstance(other_store, Store):
-            return Store(self.products + other_store.products)
+            return self.merge(other_store)
         return NotImplemented
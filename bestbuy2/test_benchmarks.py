@@ -0,0 +1,13 @@
+from benchmarks import compare_results
+
+
+def test_compare_results_reports_only_slowdowns_beyond_tolerance():
+    """
+    Test that only measurements slower than the baseline by more than the tolerance
+    are reported, and measurements missing in the baseline are skipped.
+    """
+    baseline = {"fast": 100.0, "slightly slower": 100.0, "much slower": 100.0}
+    results = {"fast": 150.0, "slightly slower": 85.0, "much slower": 50.0, "new": 1.0}
+
+    assert compare_results(results, baseline, tolerance=0.2) == [("much slower", 0.5)]
+
@@ -0,0 +1,95 @@
+import pytest
+
+from catalog_io import read_catalog, write_catalog
+from products import Product, NonStockedProduct, LimitedProduct
+
+
+@pytest.mark.parametrize("file_name", ["catalog.csv", "catalog.jsonl"])
+def test_catalog_round_trip(tmp_path, file_name):
+    """
+    Test that products written to a catalog file are read back with the same types and values.
+
+    Verifies that:
+    - Rows are read across several validation batches in file order.
+    - Non-stocked products are active and limited products keep their maximum.
+    """
+    products = [Product(f"Product {index}", price=index + 0.99, quantity=index) for index in range(5)]
+    products += [NonStockedProduct("Windows License", price=125),
+                 LimitedProduct("Shipping", price=10, quantity=250, maximum=1)]
+    path = str(tmp_path / file_name)
+
+    assert write_catalog(path, products) == 7
+    loaded = list(read_catalog(path, batch_size=3))
+
+    assert [type(product) for product in loaded] == [type(product) for product in products]
+    assert [(product.name, product.price, product.quantity, product.is_active()) for product in loaded] == \
+           [(product.name, product.price, product.quantity, product.is_active()) for product in products]
+    assert loaded[-1].maximum == 1
+
+
+def test_invalid_row_reports_its_row_number(tmp_path):
+    """
+    Test that an invalid row fails the import with the row number and the broken rule.
+
+    :raises ValueError: If a price is negative.
+    """
+    path = tmp_path / "catalog.csv"
+    path.write_text("type,name,price,quantity,maximum\n"
+                    "product,Stocked,100,10,\n"
+                    "product,Broken,-5,10,\n")
+
+    with pytest.raises(ValueError, match="row 2: price must be a non-negative number"):
+        list(read_catalog(str(path)))
+
+
+def test_jsonl_rows_are_numbered_by_line(tmp_path):
+    """
+    Test that rows of a JSON Lines catalog are numbered by their line, counting blank lines.
+
+    :raises ValueError: If a quantity is negative.
+    """
+    path = tmp_path / "catalog.jsonl"
+    path.write_text('{"type": "product", "name": "Stocked", "price": 100, "quantity": 10}\n'
+                    "\n"
+                    '{"type": "product", "name": "Broken", "price": 100, "quantity": -1}\n')
+
+    with pytest.raises(ValueError, match="row 3: quantity must be a non-negative whole number"):
+        list(read_catalog(str(path)))
+
+
+def test_jsonl_type_that_is_not_a_string_is_invalid(tmp_path):
+    """
+    Test that a JSON list or object as product type fails with the row number like any invalid type.
+
+    :raises ValueError: If a type is not a string.
+    """
+    path = tmp_path / "catalog.jsonl"
+    path.write_text('{"type": "product", "name": "Stocked", "price": 100, "quantity": 10}\n'
+                    '{"type": ["product"], "name": "Broken", "price": 100, "quantity": 10}\n')
+
+    with pytest.raises(ValueError, match="row 2: type must be one of"):
+        list(read_catalog(str(path)))
+
+
+def test_price_too_large_for_a_float_is_invalid(tmp_path):
+    """
+    Test that a whole price too large to be a float fails like any invalid price.
+
+    :raises ValueError: If a price does not fit a float.
+    """
+    path = tmp_path / "catalog.csv"
+    path.write_text("type,name,price,quantity,maximum\n"
+                    f"product,Huge,{10 ** 400},10,\n")
+
+    with pytest.raises(ValueError, match="row 1: price must be a non-negative number"):
+        list(read_catalog(str(path)))
+
+
+def test_unsupported_file_type():
+    """
+    Test that only CSV and JSON Lines catalogs are accepted.
+
+    :raises ValueError: If the file extension is not supported.
+    """
+    with pytest.raises(ValueError):
+        read_catalog("catalog.xml")
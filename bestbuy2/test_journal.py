@@ -0,0 +1,115 @@
+import os
+
+import pytest
+
+from journal import InventoryJournal, LOG_FILE
+from products import Product, NonStockedProduct
+from store import Store
+
+
+def build_products() -> list[Product]:
+    """Builds the same fresh catalog on every call, like the hard-coded catalog in main."""
+    return [
+        Product("MacBook Air M2", price=1450, quantity=100),
+        Product("Google Pixel 7", price=500, quantity=5),
+        NonStockedProduct("Windows License", price=125),
+    ]
+
+
+def test_store_restores_stock_from_log(tmp_path):
+    """
+    Test that a new store restores the stock sold by orders of an earlier store.
+
+    Verifies that:
+    - Quantities of ordered products are restored from the log.
+    - Products sold out by an order are removed from the restored store.
+    """
+    laptop, phone, license_ = build_products()
+    store = Store([laptop, phone, license_], journal=InventoryJournal(str(tmp_path)))
+    store.order([(laptop, 3), (license_, 1)])
+    store.order([(phone, 5)])
+
+    restored = Store(build_products(), journal=InventoryJournal(str(tmp_path)))
+
+    assert [(product.name, product.quantity) for product in restored.products] == [
+        ("MacBook Air M2", 97), ("Windows License", 0)
+    ]
+    assert restored.get_total_quantity() == 97
+
+
+def test_checkpoint_writes_snapshot_and_empties_log(tmp_path):
+    """
+    Test that a checkpoint saves the stock in the snapshot, including products removed from the store.
+
+    Verifies that:
+    - The log is empty after a checkpoint.
+    - Orders after the checkpoint are replayed on top of the snapshot.
+    """
+    laptop, phone, license_ = build_products()
+    store = Store([laptop, phone, license_], journal=InventoryJournal(str(tmp_path), checkpoint_every=2))
+    store.order([(phone, 5)])
+    store.order([(laptop, 10)])
+    assert os.path.getsize(tmp_path / LOG_FILE) == 0
+
+    store.order([(laptop, 1)])
+    restored = Store(build_products(), journal=InventoryJournal(str(tmp_path)))
+
+    assert [(product.name, product.quantity) for product in restored.products] == [
+        ("MacBook Air M2", 89), ("Windows License", 0)
+    ]
+
+
+def test_torn_log_record_is_cut_off(tmp_path):
+    """
+    Test that an incomplete record at the end of the log is ignored and removed.
+    """
+    laptop, phone, license_ = build_products()
+    store = Store([laptop, phone, license_], journal=InventoryJournal(str(tmp_path)))
+    store.order([(laptop, 1)])
+    store.order([(laptop, 1)])
+    log_size = os.path.getsize(tmp_path / LOG_FILE)
+    with open(tmp_path / LOG_FILE, "r+b") as log_file:
+        log_file.truncate(log_size - 3)
+
+    journal = InventoryJournal(str(tmp_path))
+    assert journal.load() == {"MacBook Air M2": 99}
+    assert os.path.getsize(tmp_path / LOG_FILE) == log_size // 2
+
+
+def test_damaged_record_before_the_end_is_an_error(tmp_path):
+    """
+    Test that a record failing its checksum with records after it stops the load and keeps the log.
+    """
+    laptop, phone, license_ = build_products()
+    store = Store([laptop, phone, license_], journal=InventoryJournal(str(tmp_path)))
+    store.order([(laptop, 1)])
+    store.order([(laptop, 1)])
+    log_size = os.path.getsize(tmp_path / LOG_FILE)
+    with open(tmp_path / LOG_FILE, "r+b") as log_file:
+        # flip a byte of the first record's quantity
+        log_file.seek(log_size // 2 - 1)
+        last_byte = log_file.read(1)
+        log_file.seek(log_size // 2 - 1)
+        log_file.write(bytes([last_byte[0] ^ 0xFF]))
+
+    with pytest.raises(ValueError, match="record 1"):
+        InventoryJournal(str(tmp_path)).load()
+    assert os.path.getsize(tmp_path / LOG_FILE) == log_size
+
+
+def test_damaged_last_record_is_cut_off(tmp_path):
+    """
+    Test that a complete last record failing its checksum is treated as torn and removed.
+    """
+    laptop, phone, license_ = build_products()
+    store = Store([laptop, phone, license_], journal=InventoryJournal(str(tmp_path)))
+    store.order([(laptop, 1)])
+    store.order([(laptop, 1)])
+    log_size = os.path.getsize(tmp_path / LOG_FILE)
+    with open(tmp_path / LOG_FILE, "r+b") as log_file:
+        log_file.seek(log_size - 1)
+        log_file.write(b"\xff")
+
+    journal = InventoryJournal(str(tmp_path))
+    assert journal.load() == {"MacBook Air M2": 99}
+    assert os.path.getsize(tmp_path / LOG_FILE) == log_size // 2
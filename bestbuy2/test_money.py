@@ -0,0 +1,44 @@
+from decimal import Decimal
+
+import pytest
+
+from money import Money
+
+
+def test_equal_amounts_have_equal_hashes():
+    """
+    Test that Money equals ints and floats of the same amount and hashes like them,
+    so amounts of either kind can be mixed as dict keys and in sets.
+    """
+    assert Money(999) == 9.99 and Money(9990) == 99.9
+    assert Money(100) == 1 and Money(150) == 1.5
+    assert Money(30) == 0.3 and Money(30) != 0.1 + 0.2
+    assert Money(30) < 0.1 + 0.2 and Money(999) < 10 and Money(1000) >= 9.999
+    assert Money(-999) < 0 < Money(1) < float("inf")
+    assert Money(0) != float("nan")
+    assert hash(Money(999)) == hash(9.99)
+    assert hash(Money(100)) == hash(1)
+    assert hash(Money(150)) == hash(1.5)
+    assert len({Money(100), 1, 1.0, Money(999), 9.99}) == 2
+
+
+def test_decimals_are_not_compared():
+    """
+    Test that Money does not compare equal to Decimals, as it could not hash like both Decimals and floats.
+    """
+    assert Money(999) != Decimal("9.99")
+    with pytest.raises(TypeError):
+        Money(999) < Decimal("10")
+
+
+def test_floats_are_converted_through_their_shortest_representation():
+    """
+    Test that floats become the cents of their shortest representation, rounded half up,
+    whether they are whole cents, between cents or too large for the float shortcut.
+    """
+    assert Money.from_amount(9.99).cents == 999
+    assert Money.from_amount(0.1 + 0.2).cents == 30
+    assert Money.from_amount(2.675).cents == 268
+    assert Money.from_amount(0.125).cents == 13
+    assert Money.from_amount(-1.005).cents == -101
+    assert Money.from_amount(1e15 + 0.125).cents == 100000000000000010
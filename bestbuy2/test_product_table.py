@@ -0,0 +1,51 @@
+import pytest
+
+from product_table import ProductTable
+from store import Store
+
+
+def test_product_view_reads_and_writes_table_row():
+    """
+    Test that a product view works on the data of its table row.
+
+    Verifies that:
+    - Indexing the same row twice returns the same view.
+    - Buying through the view updates the table's quantity column.
+    - A sold out row becomes inactive.
+    """
+    table = ProductTable([("First", 10, 5), ("Second", 20, 1)])
+    view = table[1]
+    assert view is table[1]
+    assert view.name == "Second"
+
+    assert view.buy(1) == 20
+    assert table._quantities[1] == 0
+    assert not table[-1].is_active()
+
+
+def test_product_table_rejects_invalid_rows():
+    """
+    Test that adding rows with an invalid name, price or quantity raises an exception.
+
+    :raises ValueError: If any value of the row is invalid.
+    """
+    table = ProductTable()
+    with pytest.raises(ValueError):
+        table.append("", 10, 1)
+    with pytest.raises(ValueError):
+        table.append("Product", -10, 1)
+    assert len(table) == 0
+
+
+def test_store_with_product_views():
+    """
+    Test that a store keeps its totals in sync when products are table views.
+    """
+    table = ProductTable([("First", 10, 5), ("Second", 20, 0)])
+    store = Store(list(table))
+
+    store.order([(table[0], 2)])
+    table[1].quantity = 4
+
+    assert store.get_total_quantity() == 7
+    assert store.get_all_products() == [table[0], table[1]]
@@ -0,0 +1,43 @@
+from products import Product, NonStockedProduct
+from profiling import Profiler
+from promotions import PercentDiscount, SecondHalfPrice
+from store import Store
+
+
+def test_profiler_counts_calls_only_while_enabled():
+    """
+    Test that the profiler records calls of the instrumented methods while enabled,
+    and that disabling it restores the original methods.
+    """
+    original_order = Store.order
+    original_price_lines = Store.__dict__["_price_lines"]
+    product = Product("Google Pixel 7", price=500, quantity=100)
+    product.promotion = PercentDiscount("30% off!", percent=30)
+    windows = NonStockedProduct("Windows License", price=125)
+    stacked = Product("Pixel Case", price=20, quantity=100)
+    stacked.promotions = [PercentDiscount("10% off!", percent=10), SecondHalfPrice("Second Half price!")]
+    store = Store([product, windows, stacked])
+    profiler = Profiler()
+
+    profiler.enable()
+    store.order([(product, 1), (windows, 1)])
+    store.order([(product, 2)])
+    stacked.buy(3)
+    profiler.disable()
+    store.order([(product, 1)])
+    stacked.buy(1)
+
+    stats = profiler.get_stats()
+    assert Store.order is original_order
+    assert Store.__dict__["_price_lines"] is original_price_lines
+    assert "buy" not in Product.__dict__
+    assert stats["Store.order"].count == 2
+    assert stats["Store._price_lines"].count == 2
+    assert stats["Product.take_stock"].count == 3
+    assert stats["NonStockedProduct.take_stock"].count == 1
+    assert stats["Product.get_price"].count == 3
+    assert stats["Product.buy"].count == 1
+    assert stats["Promotion.apply_promotion"].count == 2
+    assert stats["PromotionStack.apply_promotion"].count == 1
+    assert sum(stats["Store.order"].histogram) == 2
+    assert "Store.order" in profiler.report()
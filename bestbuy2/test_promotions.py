@@ -0,0 +1,151 @@
+import pytest
+
+from products import Product
+from promotions import Promotion, SecondHalfPrice, ThirdOneFree, PercentDiscount, compile_promotions
+from store import Store
+
+PROMOTIONS = [
+    SecondHalfPrice("Second Half price!"),
+    ThirdOneFree("Third One Free!"),
+    PercentDiscount("30% off!", percent=30),
+]
+
+
+@pytest.mark.parametrize("promotion", PROMOTIONS + [compile_promotions(tuple(PROMOTIONS))],
+                         ids=lambda promotion: promotion.name)
+def test_apply_promotion_many_matches_scalar_path(promotion):
+    """
+    Test that batch pricing of many lines gives the same prices as pricing every line alone.
+
+    The scalar ``apply_promotion`` is the reference implementation.
+    """
+    prices = [0, 0.01, 0.05, 9.99, 250, 1450]
+    quantities = [1, 2, 3, 4, 7, 10]
+    lines = [(Product("Test name", price, 100), quantity) for price in prices for quantity in quantities]
+
+    batch = promotion.apply_promotion_many([product.unit_price.cents for product, _ in lines],
+                                           [quantity for _, quantity in lines])
+    scalar = [promotion.apply_promotion(product, quantity).cents for product, quantity in lines]
+
+    assert [int(cents) for cents in batch] == scalar
+
+
+def test_store_prices_cart_by_promotion_groups():
+    """
+    Test that pricing a whole cart equals the sum of the prices of its lines.
+
+    The cart is large enough for every promotion group to be priced in one batch.
+    """
+    products = [Product(f"Product {index}", 10.05 * index + 0.99, 100) for index in range(120)]
+    for product, promotion in zip(products, PROMOTIONS * 40):
+        product.promotion = promotion
+    products.append(Product("No promotion", 0.1, 100))
+    cart = [(product, 1 + index % 7) for index, product in enumerate(products)]
+
+    expected = sum(product.get_price(quantity) for product, quantity in cart)
+    assert Store([]).price_cart(cart) == expected
+
+
+def test_promotions_calculate_exact_cents():
+    """
+    Test that promotions calculate in whole cents and round split cents half up.
+
+    Verifies that:
+    - Repeated binary float errors do not show up in totals.
+    - A half cent discount is rounded up.
+    """
+    product = Product("Test name", 0.1, 100)
+    assert product.buy(3) == 0.3
+    assert product.buy(3).cents == 30
+
+    product.promotion = PercentDiscount("50% off!", percent=50)
+    assert product.get_price(1).cents == 5
+
+    product.price = 0.05
+    product.promotion = SecondHalfPrice("Second Half price!")
+    assert product.get_price(2).cents == 7
+
+
+def test_stacked_promotions():
+    """
+    Test that stacked promotions are combined into one promotion applied at checkout.
+
+    Verifies that:
+    - 30% off plus third one free charges 70% of two items for three.
+    - The stacked promotions are listed by priority.
+    - The same combination compiles to the same promotion object.
+    """
+    third_one_free = ThirdOneFree("Third One Free!", priority=2)
+    thirty_percent = PercentDiscount("30% off!", percent=30, priority=1)
+    product = Product("Test name", 100, 100)
+    product.promotions = [third_one_free, thirty_percent]
+
+    assert product.promotions == [thirty_percent, third_one_free]
+    assert product.buy(3) == 140
+    assert product.buy(4) == 210
+
+    other = Product("Other", 100, 100)
+    other.promotions = [third_one_free, thirty_percent]
+    assert other.promotion is product.promotion
+
+    product.promotions = []
+    assert product.promotion is None
+    assert product.get_price(3) == 300
+
+
+class BuyTwoPayOne(Promotion):
+    """
+    Promotion written against float prices, overriding only ``apply_promotion``.
+    """
+
+    def apply_promotion(self, product: "Product", quantity: int) -> float:
+        """
+        Calculate the final price when every second item is free.
+
+        :param product: The product to apply the discount on.
+        :type product: Product
+        :param quantity: The number of items bought.
+        :type quantity: int
+        :return: The final price after the discount.
+        :rtype: float
+        """
+        return product.price * (quantity - quantity // 2)
+
+
+def test_promotion_overriding_only_apply_promotion():
+    """
+    Test that a promotion overriding only ``apply_promotion`` prices, stacks and batch prices like the built-in ones.
+
+    :raises NotImplementedError: If a promotion overrides neither method.
+    """
+    promotion = BuyTwoPayOne("Buy two, pay one!")
+    product = Product("Test name", 9.99, 100)
+    product.promotion = promotion
+    assert product.buy(3).cents == 1998
+    assert promotion.paid_share(4) == (2_000_000, 4_000_000)
+
+    product.promotions = [promotion, PercentDiscount("50% off!", percent=50)]
+    assert product.get_price(2).cents == 499
+
+    assert promotion.apply_promotion_many([999, 100], [2, 3]) == [999, 200]
+    products = [Product(f"Product {index}", 1 + index, 100) for index in range(40)]
+    for batch_product in products:
+        batch_product.promotion = promotion
+    cart = [(batch_product, 3) for batch_product in products]
+    assert Store([]).price_cart(cart) == sum(batch_product.get_price(3) for batch_product, _ in cart)
+
+    class Undefined(Promotion):
+        pass
+
+    with pytest.raises(NotImplementedError):
+        Undefined("Undefined").paid_share(1)
+
+
+def test_percent_discount_out_of_range():
+    """
+    Test that a percentage discount outside 1-100 % cannot be created.
+
+    :raises ValueError: If the percentage is out of range.
+    """
+    with pytest.raises(ValueError):
+        PercentDiscount("Too much!", percent=120)
@@ -0,0 +1,143 @@
+import asyncio
+
+import pytest
+
+from journal import InventoryJournal
+from load_client import request
+from products import Product
+from service import OrderService
+from store import Store
+
+
+async def _place_orders(store: Store) -> list[tuple[int, dict]]:
+    """Starts a service for the store, sends a few requests over one connection and stops the service."""
+    service = OrderService(store)
+    server = await service.start("127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        return [
+            await request(reader, writer, "POST", "/orders",
+                          {"items": [{"name": "MacBook Air M2", "quantity": 2}]}),
+            await request(reader, writer, "POST", "/orders/batch", {"orders": [
+                {"items": [{"name": "Google Pixel 7", "quantity": 1}]},
+                {"items": [{"name": "Google Pixel 7", "quantity": 10}]},
+            ]}),
+            await request(reader, writer, "POST", "/orders", {"items": "MacBook Air M2"}),
+            await request(reader, writer, "GET", "/total-quantity"),
+            await request(reader, writer, "GET", "/products?page=0&size=1"),
+        ]
+    finally:
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        await service.stop()
+
+
+def test_service_places_orders_and_reports_stock():
+    """
+    Test that the service places single and batched orders, rejects the order
+    exceeding the stock without affecting the other order of its batch, and
+    reports bad requests, the total quantity and listing pages.
+    """
+    store = Store([
+        Product("MacBook Air M2", price=1450, quantity=100),
+        Product("Google Pixel 7", price=500, quantity=5),
+    ])
+
+    single, batch, bad, total, page = asyncio.run(_place_orders(store))
+
+    assert single == (200, {"total": "2900.00"})
+    assert batch[0] == 200
+    assert batch[1]["results"][0] == {"total": "500.00"}
+    assert "error" in batch[1]["results"][1]
+    assert bad[0] == 400
+    assert total == (200, {"total_quantity": 102})
+    assert page[1]["page_count"] == 2
+    assert page[1]["products"] == [{"name": "MacBook Air M2", "price": 1450, "quantity": 98, "promotion": None}]
+
+
+def test_service_survives_journal_errors(tmp_path):
+    """
+    Test that an order failing to be journaled is answered with an error
+    without stopping the writer, and that a stopped service rejects orders.
+    """
+    journal = InventoryJournal(str(tmp_path))
+    store = Store([Product("MacBook Air M2", price=1450, quantity=100)], journal)
+    record = journal.record
+    failures = [OSError("disk full")]
+
+    def record_or_fail(changes):
+        if failures:
+            raise failures.pop()
+        record(changes)
+
+    journal.record = record_or_fail
+
+    async def place_orders():
+        service = OrderService(store)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        order = {"items": [{"name": "MacBook Air M2", "quantity": 1}]}
+        try:
+            responses = [await request(reader, writer, "POST", "/orders", order),
+                         await request(reader, writer, "POST", "/orders", order)]
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+        with pytest.raises(RuntimeError):
+            await service.submit([[("MacBook Air M2", 1)]])
+        return responses
+
+    failed, placed = asyncio.run(place_orders())
+    journal.close()
+
+    assert failed[0] == 500
+    assert "disk full" in failed[1]["error"]
+    assert placed == (200, {"total": "1450.00"})
+    assert store.get_total_quantity() == 99
+
+
+def test_batch_keeps_the_orders_placed_around_a_failed_one(tmp_path):
+    """
+    Test that an order of a batch failing to be journaled gets an error result
+    while the orders before and after it are placed and keep their totals.
+    """
+    journal = InventoryJournal(str(tmp_path))
+    store = Store([Product("MacBook Air M2", price=1450, quantity=100)], journal)
+    record = journal.record
+    calls = []
+
+    def record_or_fail_second(changes):
+        calls.append(changes)
+        if len(calls) == 2:
+            raise OSError("disk full")
+        record(changes)
+
+    journal.record = record_or_fail_second
+
+    async def place_batch():
+        service = OrderService(store)
+        server = await service.start("127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        order = {"items": [{"name": "MacBook Air M2", "quantity": 1}]}
+        try:
+            return await request(reader, writer, "POST", "/orders/batch", {"orders": [order, order, order]})
+        finally:
+            writer.close()
+            server.close()
+            await server.wait_closed()
+            await service.stop()
+
+    status, payload = asyncio.run(place_batch())
+    journal.close()
+
+    assert status == 200
+    assert payload["results"][0] == {"total": "1450.00"}
+    assert "disk full" in payload["results"][1]["error"]
+    assert payload["results"][2] == {"total": "1450.00"}
+    assert store.get_total_quantity() == 98
@@ -0,0 +1,63 @@
+import pytest
+
+from products import Product, NonStockedProduct
+from sharded_store import ShardedStore, shard_of
+
+
+def build_products() -> list[Product]:
+    """Builds products spread over both shards of a two-shard store."""
+    return [Product(f"Product {index}", price=10, quantity=5) for index in range(8)] + \
+        [NonStockedProduct("Windows License", price=125)]
+
+
+def test_orders_across_shards_are_all_or_nothing():
+    """
+    Test that an order spanning several shards is placed on all of them, and
+    that an order failing on one shard returns the stock reserved on the others.
+    """
+    products = build_products()
+    first = products[0]
+    other = next(product for product in products if shard_of(product.name, 2) != shard_of(first.name, 2))
+
+    with ShardedStore(products, shard_count=2) as store:
+        assert store.order([(first, 2), (other, 1)]) == 30
+        assert store.get_total_quantity() == 37
+
+        with pytest.raises(ValueError):
+            store.order([(first, 1), (other, 10)])
+        assert store.get_total_quantity() == 37
+
+        results = store.order_many([[(first, 1)], [(first, 5)], [(first, 1), (other, 1)]])
+        assert results[0] == 10
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 20
+
+        assert store.order([(first, 1)]) == 10
+        assert [product.name for product in store.get_all_products()] == \
+            [product.name for product in products[1:]]
+    assert first.quantity == 5
+
+
+def test_order_many_batches_orders_spanning_shards():
+    """
+    Test that order_many places orders spanning several shards in at most three
+    round trips, returning the stock reserved by the orders that fail.
+    """
+    products = build_products()
+    first = products[0]
+    other = next(product for product in products if shard_of(product.name, 2) != shard_of(first.name, 2))
+
+    with ShardedStore(products, shard_count=2) as store:
+        exchanges = []
+        exchange = store._exchange
+        store._exchange = lambda requests: exchanges.append(requests) or exchange(requests)
+
+        results = store.order_many([[(first, 1), (other, 2)], [(first, 1), (other, 10)], [],
+                                    [(first, 2), (other, 1)], [(first, 1)]])
+        assert results[0] == 30
+        assert isinstance(results[1], ValueError)
+        assert results[2] == 0
+        assert results[3] == 30
+        assert results[4] == 10
+        assert len(exchanges) == 3
+        assert store.get_total_quantity() == 40 - 7
@@ -0,0 +1,397 @@
+import threading
+
+import pytest
+
+from cart_rules import BundleDiscount, BasketThreshold, CartRuleIndex
+from products import Product
+from store import Store
+
+
+def test_store_lookup_uses_product_identity():
+    """
+    Test that store membership is decided by product identity, not by price.
+
+    Verifies that:
+    - A product with the same price as a stocked product is not found in the store.
+    - Ordering such a product does not touch the stocked product.
+    """
+    stocked = Product("Stocked", 100, 10)
+    lookalike = Product("Lookalike", 100, 10)
+    store = Store([stocked])
+
+    assert stocked in store
+    assert lookalike not in store
+
+    store.order([(lookalike, 5)])
+    assert stocked.quantity == 10
+
+
+def test_get_all_products_keeps_insertion_order():
+    """
+    Test that active products are listed in the order they were added.
+
+    Verifies that:
+    - Inactive products are left out of the listing.
+    - Adding the same product twice does not duplicate it.
+    """
+    first = Product("First", 30, 1)
+    inactive = Product("Inactive", 20, 0)
+    last = Product("Last", 10, 1)
+    store = Store([first, inactive])
+    store.add_product(last)
+    store.add_product(first)
+
+    assert store.get_all_products() == [first, last]
+    assert store.get_all_products()[1] is last
+    assert len(store) == 3
+
+
+def test_remove_product_not_in_store():
+    """
+    Test that removing a product which is not in the store raises an exception.
+
+    :raises ValueError: If the product is not assigned to the store.
+    """
+    store = Store([Product("Stocked", 100, 10)])
+    with pytest.raises(ValueError):
+        store.remove_product(Product("Other", 100, 10))
+
+
+def test_store_tracks_product_changes():
+    """
+    Test that the active listing and total quantity follow changes made directly on products.
+
+    Verifies that:
+    - Changing a product quantity updates the store's total quantity.
+    - A product running out of stock disappears from the listing.
+    - A restocked product reappears at its original position.
+    """
+    first = Product("First", 30, 5)
+    second = Product("Second", 20, 5)
+    store = Store([first, second])
+    assert store.get_total_quantity() == 10
+
+    first.quantity = 0
+    assert store.get_all_products() == [second]
+    assert first not in store
+    assert store.get_total_quantity() == 5
+
+    first.quantity = 2
+    assert store.get_all_products()[0] is first
+    assert store.get_total_quantity() == 7
+
+    store.remove_product(second)
+    second.quantity = 100
+    assert store.get_total_quantity() == 2
+
+
+def test_order_is_all_or_nothing():
+    """
+    Test that a failing order line leaves the stock of all other lines untouched.
+
+    :raises ValueError: If any order line exceeds the available stock.
+    """
+    plenty = Product("Plenty", 10, 100)
+    scarce = Product("Scarce", 10, 1)
+    store = Store([plenty, scarce])
+
+    with pytest.raises(ValueError):
+        store.order([(plenty, 5), (scarce, 2)])
+
+    assert plenty.quantity == 100
+    assert scarce.quantity == 1
+    assert store.get_total_quantity() == 101
+
+
+def test_order_merges_duplicate_lines():
+    """
+    Test that duplicate lines for one product are checked and bought as a single line.
+
+    Verifies that:
+    - Lines that together exceed the stock are rejected.
+    - Lines that fit the stock are bought once with the summed quantity.
+    """
+    product = Product("Product", 10, 3)
+    store = Store([product])
+
+    with pytest.raises(ValueError):
+        store.order([(product, 2), (product, 2)])
+    assert product.quantity == 3
+
+    assert store.order([(product, 1), (product, 2)]) == 30
+    assert product.quantity == 0
+    assert product not in store
+
+
+def test_concurrent_orders_do_not_oversell():
+    """
+    Test that orders placed from several threads never sell more than the stock.
+
+    Verifies that:
+    - The units sold equal the stock taken from the product.
+    - The product's quantity never drops below zero.
+    """
+    product = Product("Scarce", 10, 500)
+    store = Store([product])
+    sold = []
+
+    def buy_until_sold_out():
+        while True:
+            try:
+                store.order([(product, 3)])
+            except ValueError:
+                return
+            sold.append(3)
+
+    threads = [threading.Thread(target=buy_until_sold_out) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(sold) == 498
+    assert product.quantity == 2
+    assert store.get_total_quantity() == 2
+
+
+def test_order_applies_bundle_discount():
+    """
+    Test that a bundle discounts the second product only when bought with the first.
+
+    Verifies that:
+    - One discounted item is granted for every item of the required product.
+    - Without the required product the discounted product costs full price.
+    """
+    laptop = Product("MacBook Air M2", 1000, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 100, 10)
+    store = Store([laptop, earbuds])
+    store.add_rule(BundleDiscount("Laptop + earbuds", laptop, earbuds, percent=20))
+
+    assert store.order([(laptop, 1), (earbuds, 2)]) == 1000 + 80 + 100
+    assert store.order([(earbuds, 1)]) == 100
+
+
+def test_order_applies_highest_reached_basket_threshold():
+    """
+    Test that only the basket threshold with the highest reached minimum applies.
+
+    Verifies that:
+    - Orders below every threshold are not discounted.
+    - Thresholds see the subtotal left after bundle discounts.
+    - Removed rules no longer apply.
+    """
+    laptop = Product("MacBook Air M2", 1000, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 100, 10)
+    store = Store([laptop, earbuds])
+    five_percent = BasketThreshold("5% over 1000", 1000, percent=5)
+    store.add_rule(five_percent)
+    store.add_rule(BasketThreshold("10% over 2000", 2000, percent=10))
+    store.add_rule(BundleDiscount("Laptop + earbuds", laptop, earbuds, percent=50))
+
+    assert store.price_cart([(earbuds, 5)]) == 500
+    assert store.price_cart([(laptop, 1), (earbuds, 1)]) == 1050 * 0.95
+    assert store.price_cart([(laptop, 2), (earbuds, 1)]) == 2050 * 0.9
+    assert store.price_cart([(laptop, 1), (earbuds, 2)]) == 1150 * 0.95
+
+    store.remove_rule(five_percent)
+    assert store.price_cart([(laptop, 1), (earbuds, 1)]) == 1050
+    with pytest.raises(ValueError):
+        store.remove_rule(five_percent)
+
+
+def test_cart_rule_index_counts_added_and_removed_rules():
+    """
+    Test that the rule index counts product and basket-wide rules, also after failed removals.
+    """
+    laptop = Product("MacBook Air M2", 1000, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 100, 10)
+    bundle = BundleDiscount("Laptop + earbuds", laptop, earbuds, percent=50)
+    threshold = BasketThreshold("5% over 1000", 1000, percent=5)
+    index = CartRuleIndex()
+    assert not index
+
+    index.add_rule(bundle)
+    index.add_rule(threshold)
+    index.add_rule(BundleDiscount("Earbuds + laptop", earbuds, laptop, percent=10))
+    assert len(index) == 3
+
+    index.remove_rule(bundle)
+    with pytest.raises(ValueError):
+        index.remove_rule(bundle)
+    index.remove_rule(threshold)
+    assert len(index) == 1
+
+
+def test_adding_stores_merges_products_by_name():
+    """
+    Test that adding stores merges products with the same name and copies all products.
+
+    Verifies that:
+    - Products with the same name become one product with the summed stock.
+    - Selling from the merged store does not change the stock of the added stores.
+    """
+    north_laptop = Product("MacBook Air M2", 1450, 10)
+    south_laptop = Product("MacBook Air M2", 1450, 5)
+    earbuds = Product("Bose QuietComfort Earbuds", 250, 20)
+    north, south = Store([north_laptop, earbuds]), Store([south_laptop])
+
+    merged = north + south
+    laptop, merged_earbuds = merged.products
+
+    assert len(merged) == 2
+    assert (laptop.name, laptop.quantity) == ("MacBook Air M2", 15)
+    assert merged.get_total_quantity() == 35
+    merged.order([(laptop, 12), (merged_earbuds, 1)])
+    assert (north_laptop.quantity, south_laptop.quantity, earbuds.quantity) == (10, 5, 20)
+
+
+def test_merge_can_share_unique_products():
+    """
+    Test that a merge without copying shares the products found in only one store.
+    """
+    laptop = Product("MacBook Air M2", 1450, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 250, 20)
+    other_earbuds = Product("Bose QuietComfort Earbuds", 250, 5)
+
+    merged = Store([laptop, earbuds]).merge(Store([other_earbuds]), copy_products=False)
+
+    assert merged.products[0] is laptop
+    assert merged.products[1] is not earbuds
+    assert merged.products[1].quantity == 25
+
+
+def test_price_queries_follow_price_and_status_changes():
+    """
+    Test that price range and top-k queries see price changes and sold-out products.
+
+    Verifies that:
+    - Range bounds are inclusive and results are sorted by price.
+    - Equally priced products keep their insertion order.
+    - Repriced and sold-out products move in or out of the results.
+    """
+    cheap = Product("Cable", 10, 5)
+    phone = Product("Google Pixel 7", 500, 5)
+    earbuds = Product("Bose QuietComfort Earbuds", 250, 5)
+    headphones = Product("Bose QuietComfort Headphones", 250, 1)
+    store = Store([cheap, phone, earbuds, headphones])
+
+    def names(products):
+        return [product.name for product in products]
+
+    assert names(store.get_products_in_price_range(100, 500)) == [earbuds.name, headphones.name, phone.name]
+    assert names(store.get_cheapest_products(2)) == [cheap.name, earbuds.name]
+
+    phone.price = 99.99
+    store.order([(headphones, 1)])
+
+    assert names(store.get_products_in_price_range(100, 500)) == [earbuds.name]
+    assert names(store.get_cheapest_products(2)) == [cheap.name, phone.name]
+    assert names(store.get_most_expensive_products(1)) == [earbuds.name]
+
+
+def test_search_products_by_words_and_prefix():
+    """
+    Test that products are found by the words of their names, the last word as a prefix.
+
+    Verifies that:
+    - Matching ignores case and word order.
+    - Renamed and removed products are found under their current names only.
+    - Inactive products are not found.
+    """
+    laptop = Product("MacBook Air M2", 1450, 10)
+    earbuds = Product("Bose QuietComfort Earbuds", 250, 10)
+    headphones = Product("Bose QuietComfort Headphones", 300, 0)
+    store = Store([laptop, earbuds, headphones])
+
+    assert store.search_products("macbook ai") == [laptop]
+    assert [product.name for product in store.search_products("quietcomfort BO")] == [earbuds.name]
+    assert store.search_products("bose", limit=0) == []
+
+    laptop.name = "Apple MacBook Pro"
+    store.remove_product(earbuds)
+
+    assert store.search_products("air") == []
+    assert store.search_products("apple mac") == [laptop]
+    assert store.search_products("bose") == []
+
+
+def test_pages_and_iteration_follow_the_listing():
+    """
+    Test that pages and iteration list the active products in insertion order.
+
+    Verifies that:
+    - A deactivated product leaves the pages and returns to its place when reactivated.
+    - An iteration in progress is not affected by products changing meanwhile.
+    """
+    products = [Product(f"Product {index}", 10, 5) for index in range(5)]
+    store = Store(products)
+
+    assert store.get_page_count(2) == 3
+    assert [product.name for product in store.get_products_page(1, 2)] == ["Product 2", "Product 3"]
+
+    iteration = iter(store)
+    next(iteration)
+    products[2].deactivate()
+    assert [product.name for product in store.get_products_page(1, 2)] == ["Product 3", "Product 4"]
+    assert [product.name for product in iteration] == ["Product 1", "Product 2", "Product 3", "Product 4"]
+
+    products[2].activate()
+    assert [product.name for product in store] == [product.name for product in products]
+
+
+def test_product_line_is_refreshed_when_the_product_changes():
+    """
+    Test that the cached listing line of a product is formatted again after the product changes.
+    """
+    product = Product("Google Pixel 7", 500, 5)
+    store = Store([product])
+
+    assert store.get_product_line(product) == str(product)
+    assert store.get_product_line(product) is store.get_product_line(product)
+    product.quantity = 3
+    assert "Quantity: 3" in store.get_product_line(product)
+
+
+def test_subscribers_get_stock_events_and_low_stock_alerts():
+    """
+    Test that subscribers receive quantity and activation changes, and a low-stock
+    alert only when the quantity falls below the threshold, again after restocking.
+    """
+    pixel = Product("Google Pixel 7", 500, 10)
+    macbook = Product("MacBook Air M2", 1450, 1)
+    store = Store([pixel, macbook])
+    events = []
+    alerts = []
+    unsubscribe = store.subscribe(lambda event: events.append((event.product.name, event.kind)))
+    store.subscribe(lambda event: alerts.append(event.new_value), kinds=["low_stock"])
+    store.set_low_stock_threshold(pixel, 5)
+
+    store.order([(pixel, 6), (macbook, 1)])
+    store.order([(pixel, 1)])
+    pixel.restock(10)
+    store.order([(pixel, 10)])
+
+    assert alerts == [4, 3]
+    assert ("MacBook Air M2", "active") in events
+    assert events.count(("Google Pixel 7", "quantity")) == 4
+
+    unsubscribe()
+    store.order([(pixel, 1)])
+    assert events.count(("Google Pixel 7", "quantity")) == 4
+    with pytest.raises(ValueError):
+        store.set_low_stock_threshold(macbook, 5)
+
+
+def test_page_size_must_be_positive():
+    """
+    Test that listing pages of fewer than one product is rejected.
+
+    :raises ValueError: If the page size is less than 1.
+    """
+    store = Store([Product("Product", 10, 5)])
+
+    for page_size in (0, -1):
+        with pytest.raises(ValueError):
+            store.get_page_count(page_size)
+        with pytest.raises(ValueError):
+            store.get_products_page(0, page_size)
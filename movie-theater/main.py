@@ -2,7 +2,7 @@ import argparse
 import sys
 
 from project import MovieApp
-from storage import StorageJson, StorageCsv
+from storage import StorageJson, StorageJsonl, StorageCsv, StorageSqlite
 from utils import print_error
 
 EXAMPLE_FILENAME = "movies.json"
@@ -13,13 +13,13 @@ def parse_args():
     Parses command-line arguments and initializes the appropriate storage class.
 
     This function reads the `filename` argument from the command line, determines
-    whether it is a JSON or CSV file, and initializes the corresponding storage
-    class (`StorageJson` or `StorageCsv`). If the file extension is invalid, it
-    prints an error message and exits the program. The filename argument is optional.
-    If not provided, the example file will be used.
+    whether it is a JSON, JSON Lines, CSV or SQLite file, and initializes the corresponding
+    storage class (`StorageJson`, `StorageJsonl`, `StorageCsv` or `StorageSqlite`). If the file
+    extension is invalid, it prints an error message and exits the program.
+    The filename argument is optional. If not provided, the example file will be used.
 
     Returns:
-        StorageJson | StorageCsv: An instance of the appropriate storage class.
+        StorageJson | StorageJsonl | StorageCsv | StorageSqlite: An instance of the appropriate storage class.
 
     Example:
         `python main.py movies.json`
@@ -28,7 +28,7 @@ def parse_args():
     parser.add_argument("filename",
                         nargs="?",
                         default=EXAMPLE_FILENAME,
-                        help="Specify alternative file for saving movie data. Supported formats: json, csv. Example: 'file.json'")
+                        help="Specify alternative file for saving movie data. Supported formats: json, jsonl, csv, db/sqlite. Example: 'file.json'")
     args = parser.parse_args()
 
     storage_file: str = args.filename
@@ -36,10 +36,14 @@ def parse_args():
         storage = StorageJson(EXAMPLE_FILENAME)
     elif storage_file.endswith(".json"):
         storage = StorageJson(storage_file)
+    elif storage_file.endswith(".jsonl"):
+        storage = StorageJsonl(storage_file)
     elif storage_file.endswith(".csv"):
         storage = StorageCsv(storage_file)
+    elif storage_file.endswith((".db", ".sqlite")):
+        storage = StorageSqlite(storage_file)
     else:
-        print_error("Error: Invalid filename provided! File must have a .json or .csv extension.")
+        print_error("Error: Invalid filename provided! File must have a .json, .jsonl, .csv, .db or .sqlite extension.")
         sys.exit("Exiting!")
 
     return storage
@@ -300,25 +300,23 @@ class CommandHandler:
     def _command_search_movie(self, movies: dict):
         """
         Performs case-insensitive partial search in movies and prints matching entries.
-    
+        The search runs in the storage, the movies are only used to suggest similar titles.
 
         Args:
             movies (dict): Dictionary containing movies and their data (years/ratings).
         """
         search_term = get_title_from_user("Enter part of movie name: ")
-        search_term_lower = get_normalized_input(search_term)
-        match_found = False
-        for movie, movie_data in movies.items():
-            if search_term_lower in get_normalized_input(movie):
-                self._print_movie(movies, movie)
-                match_found = True
-
-        if not match_found:
+        matching_movies = self._storage.search_movies(search_term)
+        for movie in matching_movies:
+            self._print_movie(matching_movies, movie)
+
+        if not matching_movies:
             self._fuzzy_search_movie(search_term, movies)
 
     def _command_sort_movies(self, movies: dict, sort_by: str, reverse: bool = True):
         """
         Sorts movies by rating in descending order by default and prints them.
+        The sorting runs in the storage.
     
         Args:
             movies (dict): Dictionary containing movies and their data (years/ratings).
@@ -330,29 +328,20 @@ class CommandHandler:
                 "Do you want to see the latest movies first? (yes/no): "
             )
 
-        sortable_movies = dict(
-            sorted(
-                self._get_movies_with_property(sort_by, movies).items(),
-                key=lambda item: item[1][sort_by],
-                reverse=reverse
-            )
-        )
-
-        for movie in sortable_movies:
-            self._print_movie(sortable_movies, movie)
-
-        unsortable_movies = {title: movie_data for title, movie_data in movies.items() if
-                             (title, movie_data) not in sortable_movies.items()}
-
-        if unsortable_movies:
-            print(f"\nThese movies could not be sorted by '{sort_by}':")
-            for movie in unsortable_movies:
-                self._print_movie(unsortable_movies, movie)
+        # movies without a value for the property come last
+        sorted_movies = self._storage.sort_movies(sort_by, reverse)
+        unsortable_found = False
+        for movie, movie_data in sorted_movies.items():
+            if movie_data[sort_by] is None and not unsortable_found:
+                print(f"\nThese movies could not be sorted by '{sort_by}':")
+                unsortable_found = True
+            self._print_movie(sorted_movies, movie)
 
     def _command_filter_movies(self, movies: dict):
         """
         Asks the user for optional filtering parameters: minimal rating, start year, end year.
         Prints only movies matching the parameter boundaries for year or rating entered by user.
+        The filtering runs in the storage.
         """
         min_rating = get_rating_from_user(
             prompt="Enter minimum rating (leave blank for no minimum rating): ",
@@ -366,27 +355,15 @@ class CommandHandler:
             prompt="Enter end year (leave blank for no end year): ",
             allow_empty_input=True
         )
-        movies_filtered = 0
-        for movie in movies:
-            conditions_met = []
-
-            movie_rating = movies[movie][CommandHandler.RATING_KEY]
-            movie_year = movies[movie][CommandHandler.YEAR_KEY]
-
-            if not min_rating == "" and movie_rating is not None:
-                conditions_met.append(movie_rating >= min_rating)
-
-            if not min_year == "" and movie_year is not None:
-                conditions_met.append(movie_year >= min_year)
-
-            if not max_year == "" and movie_year is not None:
-                conditions_met.append(movie_year <= max_year)
-
-            if all(conditions_met):
-                movies_filtered += 1
-                self._print_movie(movies, movie)
+        filtered_movies = self._storage.filter_movies(
+            None if min_rating == "" else min_rating,
+            None if min_year == "" else min_year,
+            None if max_year == "" else max_year
+        )
+        for movie in filtered_movies:
+            self._print_movie(filtered_movies, movie)
 
-        if movies_filtered == 0:
+        if not filtered_movies:
             print_error("No movies matched the filtering criteria.")
 
     def _command_create_rating_histogram(self, movies: dict):
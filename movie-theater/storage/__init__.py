@@ -2,3 +2,5 @@ from .istorage import IStorage
 from .storage_csv import StorageCsv
 from .storage_file import StorageFile
 from .storage_json import StorageJson
+from .storage_jsonl import StorageJsonl
+from .storage_sqlite import StorageSqlite
@@ -1,5 +1,7 @@
 from abc import ABC, abstractmethod
 
+from utils import get_normalized_input
+
 
 class IStorage(ABC):
     """
@@ -45,3 +47,50 @@ class IStorage(ABC):
         Returns True if movie was found in the storage, otherwise False.
         """
         pass
+
+    def search_movies(self, search_term: str):
+        """
+        Returns the movies whose title contains the search term, as a dictionary
+        in the order of list_movies. Titles and search term are compared
+        normalized: case-insensitive and without accents.
+        Storages able to query their data should override this scan.
+        """
+        normalized_search_term = get_normalized_input(search_term)
+        return {title: movie for title, movie in self.list_movies().items()
+                if normalized_search_term in get_normalized_input(title)}
+
+    def sort_movies(self, sort_by: str, reverse: bool = True):
+        """
+        Returns all movies as a dictionary sorted by a movie data property,
+        e.g. 'rating' or 'year'. Movies with equal values keep the order of
+        list_movies, movies without a value for the property come last.
+        Storages able to query their data should override this sort.
+        """
+        movies = self.list_movies()
+        sortable_movies = sorted(
+            ((title, movie) for title, movie in movies.items() if movie[sort_by] is not None),
+            key=lambda item: item[1][sort_by],
+            reverse=reverse
+        )
+        unsortable_movies = [(title, movie) for title, movie in movies.items() if movie[sort_by] is None]
+        return dict(sortable_movies + unsortable_movies)
+
+    def filter_movies(self, min_rating: float | None, min_year: int | None, max_year: int | None):
+        """
+        Returns the movies within the given bounds as a dictionary in the order
+        of list_movies. A bound of None is not applied, and a movie without
+        a rating or year is not filtered by the bounds of that property.
+        Storages able to query their data should override this scan.
+        """
+        filtered_movies = {}
+        for title, movie in self.list_movies().items():
+            rating = movie["rating"]
+            year = movie["year"]
+            if min_rating is not None and rating is not None and rating < min_rating:
+                continue
+            if min_year is not None and year is not None and year < min_year:
+                continue
+            if max_year is not None and year is not None and year > max_year:
+                continue
+            filtered_movies[title] = movie
+        return filtered_movies
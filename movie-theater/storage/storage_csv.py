@@ -87,9 +87,9 @@ class StorageCsv(StorageFile):
                     "notes": notes
                 })
 
-    def list_movies(self):
+    def _load_movies(self):
         """
-        Retrieve all movies from the database.
+        Read all movies from the CSV file.
 
         This method loads movie information from the CSV file and returns
         it as a dictionary of dictionaries, where each movie title is a key
@@ -109,16 +109,41 @@ class StorageCsv(StorageFile):
                 }
             }
         """
-        movies = {}
         with open(self._file_path, newline='') as csvfile:
             reader = csv.DictReader(csvfile)
-            for row in reader:
-                # save the record to movies in desired format
-                movies[row["title"]] = {
-                    "rating": convert_to_number(row["rating"], float),
-                    "year": convert_to_number(row["year"], int),
-                    "poster_url": validate_url(row["poster_url"]),
-                    "notes": row["notes"]
-                }
+            movies = {row["title"]: self._parse_row(row) for row in reader}
 
         return movies
+
+    def _parse_row(self, row: dict) -> dict:
+        """
+        Convert a CSV row to movie data in the desired format.
+
+        Args:
+            row (dict): The row as read from the CSV file, with string values.
+
+        Returns:
+            dict: The movie data. Unreadable numbers and invalid URLs become None.
+        """
+        return {
+            "rating": convert_to_number(row["rating"], float),
+            "year": convert_to_number(row["year"], int),
+            "poster_url": validate_url(row["poster_url"]),
+            "notes": row["notes"]
+        }
+
+    def _as_stored(self, movie_data: dict) -> dict:
+        """
+        Return movie data as it is read back from the CSV file.
+
+        Values are written as text, with None as an empty field, and parsed
+        again like a row loaded from the file.
+
+        Args:
+            movie_data (dict): The data of one movie.
+
+        Returns:
+            dict: The data of the movie as read back from the file.
+        """
+        row = {key: "" if value is None else str(value) for key, value in movie_data.items()}
+        return self._parse_row(row)
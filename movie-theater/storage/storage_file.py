@@ -1,3 +1,5 @@
+import os
+
 from storage.istorage import IStorage
 
 
@@ -5,20 +7,110 @@ class StorageFile(IStorage):
     """
     Base class for file storage implementation. Shares blueprint with
     common method implementations and methods to override in subclasses.
+
+    The parsed movies are cached in memory together with an index of the
+    lowercase titles, and served from the cache as long as the file's
+    inode, size and modification time are unchanged. Changes made through
+    the storage update the cache after saving, so they don't re-read the
+    file either; changes made to the file by anything else are picked up
+    on the next read.
     """
     data_dir = "data"
 
+    # parsed movies, lowercase titles and the (inode, size, mtime) of the file they were read from
+    _cached_movies: dict | None = None
+    _cached_titles: frozenset = frozenset()
+    _cached_signature: tuple | None = None
+
     def _save_movies(self, movies: dict):
         raise NotImplementedError("Subclasses must implement '_save_movies'.")
 
+    def _load_movies(self) -> dict:
+        raise NotImplementedError("Subclasses must implement '_load_movies'.")
+
+    def _as_stored(self, movie_data: dict) -> dict:
+        """
+        Returns movie data as `_load_movies` would return it after saving it.
+
+        Subclasses whose format doesn't keep every value as it is, override
+        this, so the cache holds the same data as a fresh load of the file.
+
+        Args:
+            movie_data (dict): The data of one movie.
+
+        Returns:
+            dict: The data of the movie as read back from the file.
+        """
+        return movie_data
+
+    def _get_file_signature(self) -> tuple:
+        """
+        Returns the file attributes telling whether the file has changed.
+
+        Returns:
+            tuple: The inode, size and modification time in nanoseconds of the file.
+
+        Raises:
+            OSError: If the file cannot be accessed.
+        """
+        file_stat = os.stat(self._file_path)
+        return file_stat.st_ino, file_stat.st_size, file_stat.st_mtime_ns
+
+    def _get_movies(self) -> dict:
+        """
+        Returns the cached movies, loading them from the file first if it has
+        changed since they were cached.
+
+        The returned movies and their data must not be changed in place.
+
+        Returns:
+            dict: The movies by title.
+        """
+        signature = self._get_file_signature()
+        if self._cached_movies is None or signature != self._cached_signature:
+            self._set_cache(self._load_movies(), signature)
+        return self._cached_movies
+
+    def _set_cache(self, movies: dict, signature: tuple):
+        """
+        Replaces the cached movies and the lowercase title index.
+
+        Args:
+            movies (dict): The movies by title, as in the file.
+            signature (tuple): The file signature the movies correspond to.
+        """
+        self._cached_movies = movies
+        self._cached_titles = frozenset(title.lower() for title in movies)
+        self._cached_signature = signature
+
+    def _save_and_cache(self, movies: dict):
+        """
+        Saves all movie data and caches it without reading the file back.
+
+        Args:
+            movies (dict): A dictionary containing movie data to save.
+        """
+        self._save_movies(movies)
+        self._set_cache(movies, self._get_file_signature())
+
     def list_movies(self):
-        raise NotImplementedError("Subclasses must implement 'list_movies'.")
+        """
+        Retrieve all movies from the database.
+
+        The movies are read from the file only if it has changed since the
+        last read or save.
+
+        Returns:
+            dict: A new dictionary containing movie information by title,
+            which may be changed freely.
+        """
+        return {title: dict(movie_data) for title, movie_data in self._get_movies().items()}
 
     def add_movie(self, title: str, year: int, rating: float, poster_url: str):
         """
         Add a new movie to the database.
 
-        This method retrieves all movies from the storage, adds a new movie
+        This method takes the movies from the cache, adds a new movie
         with the provided details, and saves the updated list back to the
         database.
 
@@ -28,37 +120,37 @@ class StorageFile(IStorage):
             rating (float): The rating of the movie.
             poster_url (str): The URL of the movie's poster image.
         """
-        movies = self.list_movies()
-        movies[title] = {
+        movies = dict(self._get_movies())
+        movies[title] = self._as_stored({
             "rating": rating,
             "year": year,
             "poster_url": poster_url,
             "notes": None
-        }
+        })
 
-        self._save_movies(movies)
+        self._save_and_cache(movies)
 
     def delete_movie(self, title: str):
         """
         Delete a movie from the database.
 
-        This method retrieves all movies from the storage, deletes the
+        This method takes the movies from the cache, deletes the
         specified movie by its title, and saves the updated list back to
         the database.
 
         Args:
             title (str): The title of the movie to delete.
         """
-        movies = self.list_movies()
+        movies = dict(self._get_movies())
         del movies[title]
 
-        self._save_movies(movies)
+        self._save_and_cache(movies)
 
     def update_movie(self, title: str, notes: str):
         """
         Update the movie's notes in the database.
 
-        This method retrieves all movies from the storage, updates the
+        This method takes the movies from the cache, updates the
         notes of the specified movie, and saves the changes back to the
         database.
 
@@ -66,14 +158,16 @@ class StorageFile(IStorage):
             title (str): The title of the movie to update.
             notes (str): The new notes to assign to the movie.
         """
-        movies = self.list_movies()
-        movies[title]["notes"] = notes
+        movies = dict(self._get_movies())
+        # the cached movie data is replaced, not changed in place
+        movies[title] = self._as_stored({**movies[title], "notes": notes})
 
-        self._save_movies(movies)
+        self._save_and_cache(movies)
 
     def is_movie_in_storage(self, title: str):
         """
-        Checks if a movie with the given title exists in the storage.
+        Checks if a movie with the given title exists in the storage, ignoring case.
+        The lowercase titles are kept in the cache, so no titles are scanned.
 
         Args:
             title (str): The title of the movie to check.
@@ -81,6 +175,5 @@ class StorageFile(IStorage):
         Returns:
             bool: True if the movie exists in the storage, False otherwise.
         """
-        movies = self.list_movies()
-        movies_keys = [key.lower() for key in movies.keys()]
-        return title.lower() in movies_keys
+        self._get_movies()
+        return title.lower() in self._cached_titles
@@ -75,9 +75,9 @@ class StorageJson(StorageFile):
         with open(self._file_path, 'w') as json_file_obj:
             json_file_obj.write(json.dumps(movies))
 
-    def list_movies(self):
+    def _load_movies(self):
         """
-        Retrieve all movies from the database.
+        Read all movies from the JSON file.
 
         This method loads movie information from the JSON file and returns
         it as a dictionary of dictionaries, where each movie title is a key
@@ -0,0 +1,319 @@
+import json
+import os
+import threading
+
+from .istorage import IStorage
+from .storage_file import StorageFile
+
+
+class StorageJsonl(IStorage):
+    """
+    Persistent storage keeping movie data in an append-only JSON Lines log.
+
+    Every change appends a single record to the log instead of rewriting
+    the whole file, so adding, deleting and updating a movie costs the same
+    for any library size. The movies are kept in memory and rebuilt from
+    the log when the storage is opened.
+
+    Records replace whole movies or remove them, so old records of a movie
+    become garbage. Once the log holds more than twice as many records as
+    there are movies, it is compacted in a background thread into one
+    record per movie, while new changes keep being appended.
+
+    Log records look like:
+        {"op": "put", "title": "Titanic", "movie": {"rating": 9, ...}}
+        {"op": "delete", "title": "Titanic"}
+    """
+
+    # logs shorter than this are never compacted
+    min_compaction_records = 1000
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the StorageJsonl object with a specified file path.
+
+        This method loads the movies from the log, creating an empty log
+        if it doesn't exist yet, and opens the log for appending.
+
+        Args:
+            file_path (str): The name of the JSON Lines file to use for storage.
+
+        Raises:
+            OSError: If the log cannot be read or created.
+            ValueError: If a complete line of the log is not a valid record.
+
+        Side Effects:
+            - Creates a new JSON Lines file at the specified path if it does not
+              exist.
+            - Truncates the last record if an interrupted write left it incomplete.
+        """
+        current_dir = os.getcwd()
+        self._file_path = os.path.join(current_dir, StorageFile.data_dir, file_path)
+        self._movies: dict[str, dict] = {}
+        self._lower_titles: dict[str, int] = {}
+        self._record_count = 0
+        self._lock = threading.Lock()
+        self._compaction: threading.Thread | None = None
+        # records appended while a compaction runs, to be copied to the compacted log
+        self._pending_records: list[str] | None = None
+
+        if os.path.exists(self._file_path):
+            self._load()
+        else:
+            self._save_movies({})
+            print(f"New jsonl file was created at path: '{self._file_path}'.")
+        self._log = open(self._file_path, "a", encoding="utf-8")
+
+    def _load(self):
+        """
+        Rebuild the movies by replaying the log.
+
+        Only a last line without a line break, left by a crash during a write,
+        is cut off, so the next record starts on a new line. Any other line
+        that is not a valid record means the log is damaged: it is left as it
+        is and the storage is not opened.
+
+        Raises:
+            ValueError: If a complete line is not a valid record.
+        """
+        valid_size = 0
+        with open(self._file_path, "rb") as log_file:
+            for line_number, line in enumerate(log_file, start=1):
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    record = self._parse_record(line)
+                except ValueError as e:
+                    raise ValueError(f"Error reading jsonl file at path: '{self._file_path}', "
+                                     f"line {line_number}: {e}") from e
+                self._apply(record)
+                self._record_count += 1
+                valid_size += len(line)
+
+        if valid_size < os.path.getsize(self._file_path):
+            with open(self._file_path, "r+b") as log_file:
+                log_file.truncate(valid_size)
+
+    @staticmethod
+    def _parse_record(line: bytes) -> dict:
+        """
+        Parse one line of the log.
+
+        Args:
+            line (bytes): The line, including its line break.
+
+        Returns:
+            dict: The record.
+
+        Raises:
+            ValueError: If the line is not a "put" record with a title and a movie,
+            or a "delete" record with a title.
+        """
+        record = json.loads(line)
+        if not isinstance(record, dict) or not isinstance(record.get("title"), str):
+            raise ValueError("record without a title")
+        if record.get("op") == "put":
+            if not isinstance(record.get("movie"), dict):
+                raise ValueError("put record without a movie")
+        elif record.get("op") != "delete":
+            raise ValueError(f"unknown operation {record.get('op')!r}")
+        return record
+
+    def _apply(self, record: dict):
+        """
+        Apply a log record to the movies in memory.
+
+        Args:
+            record (dict): A "put" record with the whole movie, or a "delete" record.
+        """
+        title = record["title"]
+        if record["op"] == "put":
+            if title not in self._movies:
+                self._lower_titles[title.lower()] = self._lower_titles.get(title.lower(), 0) + 1
+            self._movies[title] = record["movie"]
+        elif self._movies.pop(title, None) is not None:
+            count = self._lower_titles.pop(title.lower()) - 1
+            if count:
+                self._lower_titles[title.lower()] = count
+
+    def _append(self, record: dict):
+        """
+        Apply a record to the movies and append it to the log.
+
+        Args:
+            record (dict): The record to apply and log.
+
+        Raises:
+            IOError: If writing to the log fails.
+        """
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            self._log.write(line)
+            self._log.flush()
+            self._apply(record)
+            self._record_count += 1
+            if self._pending_records is not None:
+                self._pending_records.append(line)
+            if self._compaction is None and \
+                    self._record_count > max(self.min_compaction_records, 2 * len(self._movies)):
+                self._start_compaction()
+
+    def _save_movies(self, movies: dict):
+        """
+        Save all movie data as a new log with one record per movie.
+
+        The log is written to a temporary file that replaces the old log
+        at once, so an interrupted save leaves the old log intact.
+
+        Args:
+            movies (dict): A dictionary containing movie data to save,
+            by movie title.
+
+        Raises:
+            IOError: If saving to the file fails due to file system
+            issues.
+        """
+        temporary_path = self._file_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as log_file:
+            for title, movie in movies.items():
+                log_file.write(json.dumps({"op": "put", "title": title, "movie": movie}) + "\n")
+            log_file.flush()
+            os.fsync(log_file.fileno())
+        os.replace(temporary_path, self._file_path)
+
+    def _start_compaction(self):
+        """Start compacting the log in a background thread. Hold the lock."""
+        # movies are replaced on every change, never changed in place, so a shallow copy is a snapshot
+        snapshot = dict(self._movies)
+        self._pending_records = []
+        self._compaction = threading.Thread(target=self._compact, args=(snapshot,), daemon=True)
+        self._compaction.start()
+
+    def _compact(self, snapshot: dict):
+        """
+        Replace the log by a compacted one. Runs in the background thread.
+
+        The snapshot is written without holding the lock. Records appended
+        meanwhile are then copied to the compacted log under the lock, just
+        before it replaces the old log.
+
+        Args:
+            snapshot (dict): Copy of the movies when the compaction started.
+        """
+        try:
+            self._save_compacted(snapshot)
+        except OSError as e:
+            print(f"Error: compacting jsonl file at path: '{self._file_path}' failed: {e}")
+            with self._lock:
+                self._pending_records = None
+                self._compaction = None
+
+    def _save_compacted(self, snapshot: dict):
+        """
+        Write the snapshot and the records appended since to a new log replacing the old one.
+
+        Args:
+            snapshot (dict): Copy of the movies when the compaction started.
+
+        Raises:
+            OSError: If writing the new log fails. The old log stays in use.
+        """
+        temporary_path = self._file_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as log_file:
+            for title, movie in snapshot.items():
+                log_file.write(json.dumps({"op": "put", "title": title, "movie": movie}) + "\n")
+            with self._lock:
+                log_file.writelines(self._pending_records)
+                log_file.flush()
+                os.fsync(log_file.fileno())
+                os.replace(temporary_path, self._file_path)
+                self._log.close()
+                self._log = open(self._file_path, "a", encoding="utf-8")
+                self._record_count = len(snapshot) + len(self._pending_records)
+                self._pending_records = None
+                self._compaction = None
+
+    def wait_for_compaction(self):
+        """Block until a running background compaction has finished."""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+    def close(self):
+        """Finish a running compaction and close the log."""
+        self.wait_for_compaction()
+        self._log.close()
+
+    def list_movies(self):
+        """
+        Retrieve all movies from the database.
+
+        The movies are kept in memory, so no file is read.
+
+        Returns:
+            dict: A dictionary containing movie information by title. For example:
+            {
+                "Titanic": {
+                    "rating": 9,
+                    "year": 1999,
+                    "poster_url": "https://example_movie.com/",
+                    "notes": "Very good movie..."
+                }
+            }
+        """
+        with self._lock:
+            return {title: dict(movie) for title, movie in self._movies.items()}
+
+    def add_movie(self, title: str, year: int, rating: float, poster_url: str):
+        """
+        Add a new movie to the database by appending one record to the log.
+
+        Args:
+            title (str): The title of the movie to add.
+            year (int): The release year of the movie.
+            rating (float): The rating of the movie.
+            poster_url (str): The URL of the movie's poster image.
+        """
+        movie = {"rating": rating, "year": year, "poster_url": poster_url, "notes": None}
+        self._append({"op": "put", "title": title, "movie": movie})
+
+    def delete_movie(self, title: str):
+        """
+        Delete a movie from the database by appending one record to the log.
+
+        Args:
+            title (str): The title of the movie to delete.
+
+        Raises:
+            KeyError: If the movie is not in the database.
+        """
+        if title not in self._movies:
+            raise KeyError(title)
+        self._append({"op": "delete", "title": title})
+
+    def update_movie(self, title: str, notes: str):
+        """
+        Update the movie's notes by appending the updated movie to the log.
+
+        Args:
+            title (str): The title of the movie to update.
+            notes (str): The new notes to assign to the movie.
+
+        Raises:
+            KeyError: If the movie is not in the database.
+        """
+        movie = dict(self._movies[title])
+        movie["notes"] = notes
+        self._append({"op": "put", "title": title, "movie": movie})
+
+    def is_movie_in_storage(self, title: str):
+        """
+        Checks if a movie with the given title exists in the storage, ignoring case.
+
+        Args:
+            title (str): The title of the movie to check.
+
+        Returns:
+            bool: True if the movie exists in the storage, False otherwise.
+        """
+        return title.lower() in self._lower_titles
@@ -0,0 +1,222 @@
+import os
+import sqlite3
+
+from utils import get_normalized_input
+from .istorage import IStorage
+from .storage_file import StorageFile
+
+
+class StorageSqlite(IStorage):
+    """
+    Persistent storage keeping movie data in an SQLite database.
+
+    Every change updates a single row instead of rewriting the whole file.
+    Titles are stored together with their lowercase form for the
+    case-insensitive lookup and their normalized form for searching,
+    and year and rating are indexed, so searching, sorting and filtering
+    run as queries in the database instead of scanning all movies.
+
+    Movies are listed in the order they were added, as in the file storages.
+    """
+
+    def __init__(self, file_path: str):
+        """
+        Initialize the StorageSqlite object with a specified file path.
+
+        This method opens the database, creating it with the movies table
+        and its indexes if it doesn't exist yet.
+
+        Args:
+            file_path (str): The name of the database file to use for storage.
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened or created.
+
+        Side Effects:
+            - Creates a new database file at the specified path if it does not
+              exist.
+        """
+        current_dir = os.getcwd()
+        self._file_path = os.path.join(current_dir, StorageFile.data_dir, file_path)
+        is_new_database = not os.path.exists(self._file_path)
+        self._connection = sqlite3.connect(self._file_path)
+        # NUMERIC keeps whole ratings as integers, like the file storages
+        self._connection.executescript("""
+            CREATE TABLE IF NOT EXISTS movies (
+                title TEXT PRIMARY KEY,
+                title_lower TEXT NOT NULL,
+                title_normalized TEXT NOT NULL,
+                rating NUMERIC,
+                year INTEGER,
+                poster_url TEXT,
+                notes TEXT
+            );
+            CREATE INDEX IF NOT EXISTS movies_title_lower ON movies (title_lower);
+            CREATE INDEX IF NOT EXISTS movies_rating ON movies (rating);
+            CREATE INDEX IF NOT EXISTS movies_year ON movies (year);
+        """)
+        if is_new_database:
+            print(f"New sqlite database was created at path: '{self._file_path}'.")
+
+    def close(self):
+        """Close the database connection."""
+        self._connection.close()
+
+    def _query_movies(self, condition: str = "", parameters: tuple = (), order: str = "rowid"):
+        """
+        Select movies from the database.
+
+        Args:
+            condition (str, optional): SQL expression rows must match. All rows by default.
+            parameters (tuple, optional): Values of the placeholders in the condition.
+            order (str, optional): SQL ordering of the rows. Insertion order by default.
+
+        Returns:
+            dict: A dictionary containing movie information by title, in the selected order.
+        """
+        where = f"WHERE {condition}" if condition else ""
+        rows = self._connection.execute(
+            f"SELECT title, rating, year, poster_url, notes FROM movies {where} ORDER BY {order}",
+            parameters
+        )
+        return {
+            title: {"rating": rating, "year": year, "poster_url": poster_url, "notes": notes}
+            for title, rating, year, poster_url, notes in rows
+        }
+
+    def list_movies(self):
+        """
+        Retrieve all movies from the database.
+
+        Returns:
+            dict: A dictionary containing movie information. For example:
+            {
+                "Titanic": {
+                    "rating": 9,
+                    "year": 1999,
+                    "poster_url": "https://example_movie.com/",
+                    "notes": "Very good movie..."
+                }
+            }
+        """
+        return self._query_movies()
+
+    def add_movie(self, title: str, year: int, rating: float, poster_url: str):
+        """
+        Add a new movie to the database, replacing a movie with the same title.
+
+        Args:
+            title (str): The title of the movie to add.
+            year (int): The release year of the movie.
+            rating (float): The rating of the movie.
+            poster_url (str): The URL of the movie's poster image.
+        """
+        with self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO movies VALUES (?, ?, ?, ?, ?, ?, NULL)",
+                (title, title.lower(), get_normalized_input(title), rating, year, poster_url)
+            )
+
+    def delete_movie(self, title: str):
+        """
+        Delete a movie from the database.
+
+        Args:
+            title (str): The title of the movie to delete.
+
+        Raises:
+            KeyError: If the movie is not in the database.
+        """
+        with self._connection:
+            cursor = self._connection.execute("DELETE FROM movies WHERE title = ?", (title,))
+        if cursor.rowcount == 0:
+            raise KeyError(title)
+
+    def update_movie(self, title: str, notes: str):
+        """
+        Update the movie's notes in the database.
+
+        Args:
+            title (str): The title of the movie to update.
+            notes (str): The new notes to assign to the movie.
+
+        Raises:
+            KeyError: If the movie is not in the database.
+        """
+        with self._connection:
+            cursor = self._connection.execute("UPDATE movies SET notes = ? WHERE title = ?", (notes, title))
+        if cursor.rowcount == 0:
+            raise KeyError(title)
+
+    def is_movie_in_storage(self, title: str):
+        """
+        Checks if a movie with the given title exists in the storage, ignoring case.
+
+        Args:
+            title (str): The title of the movie to check.
+
+        Returns:
+            bool: True if the movie exists in the storage, False otherwise.
+        """
+        row = self._connection.execute(
+            "SELECT 1 FROM movies WHERE title_lower = ? LIMIT 1", (title.lower(),)
+        ).fetchone()
+        return row is not None
+
+    def search_movies(self, search_term: str):
+        """
+        Retrieve the movies whose title contains the search term, ignoring case and accents.
+
+        Args:
+            search_term (str): The partial movie title to search for.
+
+        Returns:
+            dict: A dictionary containing the matching movies by title, in insertion order.
+        """
+        return self._query_movies("instr(title_normalized, ?) > 0", (get_normalized_input(search_term),))
+
+    def sort_movies(self, sort_by: str, reverse: bool = True):
+        """
+        Retrieve all movies sorted by rating or year.
+
+        Args:
+            sort_by (str): The movie data property to sort by: 'rating' or 'year'.
+            reverse (bool, optional): If True, sorts in descending order, otherwise ascending.
+
+        Returns:
+            dict: A dictionary containing all movies by title. Movies with equal values
+            keep their insertion order, movies without a value come last.
+
+        Raises:
+            ValueError: If the property is not 'rating' or 'year'.
+        """
+        if sort_by not in ("rating", "year"):
+            raise ValueError(f"Movies cannot be sorted by '{sort_by}'")
+        direction = "DESC" if reverse else "ASC"
+        return self._query_movies(order=f"{sort_by} IS NULL, {sort_by} {direction}, rowid")
+
+    def filter_movies(self, min_rating: float | None, min_year: int | None, max_year: int | None):
+        """
+        Retrieve the movies within the given rating and year bounds.
+
+        Args:
+            min_rating (float | None): Minimal rating, or None for no minimum.
+            min_year (int | None): Start year, or None for no start year.
+            max_year (int | None): End year, or None for no end year.
+
+        Returns:
+            dict: A dictionary containing the matching movies by title, in insertion order.
+            Movies without a rating or year are not filtered by the bounds of that property.
+        """
+        conditions = []
+        parameters = []
+        if min_rating is not None:
+            conditions.append("(rating IS NULL OR rating >= ?)")
+            parameters.append(min_rating)
+        if min_year is not None:
+            conditions.append("(year IS NULL OR year >= ?)")
+            parameters.append(min_year)
+        if max_year is not None:
+            conditions.append("(year IS NULL OR year <= ?)")
+            parameters.append(max_year)
+        return self._query_movies(" AND ".join(conditions), tuple(parameters))
@@ -0,0 +1,37 @@
+import os
+
+import pytest
+
+from storage import StorageCsv, StorageJson
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Runs each test in an empty working directory with a data directory."""
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("data")
+
+
+@pytest.mark.parametrize("storage_class, file_name", [(StorageCsv, "movies.csv"), (StorageJson, "movies.json")])
+def test_cached_movies_match_a_fresh_load(storage_class, file_name):
+    """Test that the movies cached after changes equal the movies a new storage loads from the file."""
+    storage = storage_class(file_name)
+    storage.add_movie("Heat", 1995, 8, "https://example.com/heat.jpg")
+    storage.add_movie("Nope", None, None, "not a url")
+    storage.add_movie("Alien", 1979, 8.5, None)
+    storage.update_movie("Heat", "Great cast")
+    storage.delete_movie("Alien")
+
+    assert storage.list_movies() == storage_class(file_name).list_movies()
+    assert storage.is_movie_in_storage("HEAT")
+    assert not storage.is_movie_in_storage("alien")
+
+
+def test_changes_of_the_file_are_picked_up():
+    """Test that a storage reads the file again after another storage changed it."""
+    storage = StorageJson("movies.json")
+    storage.add_movie("Heat", 1995, 8.3, None)
+    StorageJson("movies.json").add_movie("Alien", 1979, 8.5, None)
+
+    assert list(storage.list_movies()) == ["Heat", "Alien"]
+    assert storage.is_movie_in_storage("alien")
@@ -0,0 +1,106 @@
+import os
+import threading
+
+import pytest
+
+from storage import StorageJsonl
+
+LOG_PATH = os.path.join("data", "movies.jsonl")
+
+
+@pytest.fixture(autouse=True)
+def data_dir(tmp_path, monkeypatch):
+    """Runs each test in an empty working directory with a data directory."""
+    monkeypatch.chdir(tmp_path)
+    os.mkdir("data")
+
+
+def fill(storage: StorageJsonl):
+    """Adds, updates and deletes a few movies."""
+    storage.add_movie("Heat", 1995, 8.3, None)
+    storage.add_movie("Alien", 1979, 8.5, "https://example.com/alien.jpg")
+    storage.add_movie("Nope", None, None, None)
+    storage.update_movie("Heat", "Great cast")
+    storage.delete_movie("Nope")
+
+
+def test_log_is_replayed_when_opened():
+    """Test that a storage opened on a log has the movies of the storage that wrote it."""
+    storage = StorageJsonl("movies.jsonl")
+    fill(storage)
+    storage.close()
+
+    reopened = StorageJsonl("movies.jsonl")
+    assert reopened.list_movies() == storage.list_movies()
+    assert list(reopened.list_movies()) == ["Heat", "Alien"]
+    assert reopened.list_movies()["Heat"]["notes"] == "Great cast"
+    assert reopened.is_movie_in_storage("alien")
+    assert not reopened.is_movie_in_storage("nope")
+    reopened.close()
+
+
+def test_incomplete_last_record_is_cut_off():
+    """Test that a record torn by an interrupted write is dropped, and new records follow the intact ones."""
+    storage = StorageJsonl("movies.jsonl")
+    fill(storage)
+    storage.close()
+    intact_size = os.path.getsize(LOG_PATH)
+    with open(LOG_PATH, "a", encoding="utf-8") as log_file:
+        log_file.write('{"op": "put", "title": "Tor')
+
+    reopened = StorageJsonl("movies.jsonl")
+    assert os.path.getsize(LOG_PATH) == intact_size
+    assert list(reopened.list_movies()) == ["Heat", "Alien"]
+    reopened.add_movie("Ran", 1985, 8.2, None)
+    reopened.close()
+
+    assert list(StorageJsonl("movies.jsonl").list_movies()) == ["Heat", "Alien", "Ran"]
+
+
+@pytest.mark.parametrize("bad_line", ["not json", '{"op": "put", "title": "Heat"}', '{"title": "Heat"}'])
+def test_corrupt_record_before_the_end_is_an_error(bad_line):
+    """Test that a damaged record followed by intact ones stops the storage from opening and keeps the log."""
+    storage = StorageJsonl("movies.jsonl")
+    storage.add_movie("Heat", 1995, 8.3, None)
+    storage.close()
+    with open(LOG_PATH, "a", encoding="utf-8") as log_file:
+        log_file.write(bad_line + "\n")
+        log_file.write('{"op": "put", "title": "Ran", "movie": {"rating": 8.2, "year": 1985, '
+                       '"poster_url": null, "notes": null}}\n')
+    size = os.path.getsize(LOG_PATH)
+
+    with pytest.raises(ValueError, match="line 2"):
+        StorageJsonl("movies.jsonl")
+    assert os.path.getsize(LOG_PATH) == size
+
+
+def test_compaction_keeps_changes_made_while_it_runs():
+    """
+    Test that the log is compacted to one record per movie, and that records
+    appended while the compaction is writing are kept in the compacted log.
+    """
+    storage = StorageJsonl("movies.jsonl")
+    storage.min_compaction_records = 4
+    release = threading.Event()
+    compact = storage._compact
+    storage._compact = lambda snapshot: release.wait() and compact(snapshot)
+
+    storage.add_movie("Heat", 1995, 8.3, None)
+    for notes in ["one", "two", "three", "four"]:
+        storage.update_movie("Heat", notes)
+    # the fifth record exceeds the minimum and started the compaction
+    assert storage._compaction is not None
+    storage.add_movie("Alien", 1979, 8.5, None)
+    storage.delete_movie("Heat")
+    storage.add_movie("Ran", 1985, 8.2, None)
+    release.set()
+    storage.wait_for_compaction()
+    storage.close()
+
+    with open(LOG_PATH, encoding="utf-8") as log_file:
+        # the snapshot holding Heat and the three records appended during the compaction
+        assert len(log_file.readlines()) == 4
+    reopened = StorageJsonl("movies.jsonl")
+    assert reopened.list_movies() == storage.list_movies()
+    assert list(reopened.list_movies()) == ["Alien", "Ran"]
+    reopened.close()
@@ -0,0 +1,8 @@
+from .suite import (
+    SUITE_VERSION,
+    add_suite_arguments,
+    bench_suite,
+    compare_results,
+    measure_store,
+    ops_per_second,
+)
@@ -0,0 +1,172 @@
+"""
+Benchmark suite harness shared by the bestbuy and bestbuy2 stores.
+
+Both stores are measured with the same workload and the same measurement
+names, and their results are written in the same format, so a run of one
+store can be compared with a run of the other as well as with an earlier run
+of the same store. Each project builds its own catalogs and adds its own
+measurements; this module measures the store operations both have and
+handles the results.
+"""
+import argparse
+import json
+import platform
+import random
+import time
+import timeit
+from itertools import cycle
+from typing import Callable
+
+# Version of the result format, runs of other versions are not compared
+SUITE_VERSION = 1
+
+
+def ops_per_second(function: Callable[[], object], repeat: int) -> float:
+    """
+    Measures how many times per second a function can be called.
+
+    The number of calls per run is raised until a run takes at least 0.2 s,
+    and the fastest of the runs is kept, as the slower ones were disturbed
+    by other work on the machine.
+
+    :param function: Function without arguments to measure.
+    :type function: Callable[[], object]
+    :param repeat: Number of runs.
+    :type repeat: int
+    :return: Calls per second of the fastest run.
+    :rtype: float
+    """
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat=repeat, number=number))
+
+
+def measure_store(store, catalog: list, cart_sizes: list[int], repeat: int) -> dict[str, float]:
+    """
+    Measures ordering, listing and the total quantity of a store.
+
+    Carts come from a generator seeded with the catalog size, so every run
+    measures the same work. The stock must be large enough never to run out.
+
+    :param store: The store holding the catalog, with ``order``, ``get_all_products``
+                  and ``get_total_quantity`` methods.
+    :param catalog: The products of the store.
+    :type catalog: list
+    :param cart_sizes: Numbers of distinct products per measured order.
+    :type cart_sizes: list[int]
+    :param repeat: Number of runs of every measurement.
+    :type repeat: int
+    :return: Calls per second of every measurement, by measurement name.
+    :rtype: dict[str, float]
+    """
+    size = len(catalog)
+    rng = random.Random(size)
+    results = {}
+    for cart_size in cart_sizes:
+        carts = cycle([[(item, rng.randint(1, 3)) for item in rng.sample(catalog, min(cart_size, size))]
+                       for _ in range(64)])
+        results[f"Store.order[products={size},cart={cart_size}]"] = ops_per_second(
+            lambda: store.order(next(carts)), repeat)
+    results[f"Store.get_all_products[products={size}]"] = ops_per_second(store.get_all_products, repeat)
+    results[f"Store.get_total_quantity[products={size}]"] = ops_per_second(store.get_total_quantity, repeat)
+    return results
+
+
+def compare_results(results: dict[str, float], baseline: dict[str, float],
+                    tolerance: float) -> list[tuple[str, float]]:
+    """
+    Finds the measurements which got slower than in a baseline run.
+
+    Measurements missing in either run are not compared.
+
+    :param results: Calls per second of the current run, by measurement name.
+    :type results: dict[str, float]
+    :param baseline: Calls per second of the baseline run, by measurement name.
+    :type baseline: dict[str, float]
+    :param tolerance: Accepted slowdown as a share of the baseline, e.g. 0.2 for 20%.
+    :type tolerance: float
+    :return: (name, current / baseline) of every regressed measurement.
+    :rtype: list[tuple[str, float]]
+    """
+    regressions = []
+    for name, ops in results.items():
+        if name in baseline and ops < baseline[name] * (1 - tolerance):
+            regressions.append((name, ops / baseline[name]))
+    return regressions
+
+
+def add_suite_arguments(parser: argparse.ArgumentParser, sizes: list[int], cart_sizes: list[int]):
+    """
+    Adds the options of a suite run to a command line parser.
+
+    :param parser: Parser of the suite command.
+    :type parser: argparse.ArgumentParser
+    :param sizes: Default catalog sizes.
+    :type sizes: list[int]
+    :param cart_sizes: Default numbers of distinct products per order.
+    :type cart_sizes: list[int]
+    """
+    parser.add_argument("--sizes", type=int, nargs="+", default=sizes, help="Catalog sizes.")
+    parser.add_argument("--cart-sizes", type=int, nargs="+", default=cart_sizes)
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement, the fastest is kept.")
+    parser.add_argument("--output", help="Write the results to this JSON file.")
+    parser.add_argument("--baseline", help="Compare with the results in this JSON file, e.g. of the other store.")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Accepted slowdown, 0.2 is 20%%.")
+
+
+def bench_suite(run: Callable[[], dict[str, float]], output: str | None, baseline_path: str | None,
+                tolerance: float, details: dict | None = None) -> int:
+    """
+    Runs a benchmark suite, prints its results and compares them with a baseline run.
+
+    :param run: Function running the suite and returning calls per second by measurement name.
+    :type run: Callable[[], dict[str, float]]
+    :param output: Path of a JSON file to write the results to, or None.
+    :type output: str | None
+    :param baseline_path: Path of a JSON file written by an earlier run to compare with, or None.
+    :type baseline_path: str | None
+    :param tolerance: Accepted slowdown as a share of the baseline.
+    :type tolerance: float
+    :param details: Further facts about the run to write with the results.
+    :type details: dict | None
+    :return: Exit status, 1 if a measurement regressed, otherwise 0.
+    :rtype: int
+    """
+    baseline = None
+    if baseline_path is not None:
+        with open(baseline_path, encoding="utf-8") as baseline_file:
+            baseline_run = json.load(baseline_file)
+        if baseline_run.get("version") != SUITE_VERSION:
+            print(f"baseline was written by suite version {baseline_run.get('version')}, "
+                  f"not {SUITE_VERSION}, so it is not comparable")
+            return 1
+        baseline = baseline_run["results"]
+
+    results = run()
+
+    print(f"{'measurement':<48} {'calls/s':>14} {'vs baseline':>12}")
+    for name, ops in results.items():
+        change = f"{ops / baseline[name] - 1:>+11.1%}" if baseline and name in baseline else ""
+        print(f"{name:<48} {ops:>14.0f} {change:>12}")
+
+    if output is not None:
+        suite_run = {
+            "version": SUITE_VERSION,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            **(details or {}),
+            "results": results,
+        }
+        with open(output, "w", encoding="utf-8") as output_file:
+            json.dump(suite_run, output_file, indent=2)
+            output_file.write("\n")
+
+    if baseline is None:
+        return 0
+    regressions = compare_results(results, baseline, tolerance)
+    for name, ratio in regressions:
+        print(f"REGRESSION {name}: {ratio:.0%} of the baseline calls/s")
+    if not regressions:
+        print(f"no measurement is more than {tolerance:.0%} slower than the baseline")
+    return 1 if regressions else 0
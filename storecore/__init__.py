@@ -0,0 +1,2 @@
+from .inventory import Inventory
+from .items import InventoryItem
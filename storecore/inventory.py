@@ -0,0 +1,358 @@
+"""
+Store of the inventory engine shared by the bestbuy and bestbuy2 stores.
+
+``Inventory`` holds the catalog and the order path both stores share: an
+insertion-ordered catalog keyed by item identity, the active items and the
+total quantity kept up to date by observing the items, and all-or-nothing
+orders. Each project's ``Store`` adds its own API, indexes and pricing
+through the hooks documented on the methods; bestbuy2 also adds the locks
+that let concurrent checkout workers share its store.
+"""
+from bisect import bisect_left
+from typing import Iterator
+
+from .items import InventoryItem
+
+
+class Inventory:
+    """
+    Represents a store containing items in stock.
+
+    Items are kept in a catalog keyed by item identity, so membership checks,
+    lookups and removals take constant time regardless of the catalog size.
+    The catalog preserves insertion order.
+
+    The store observes its items, keeping the active items and the total
+    stock quantity up to date as items change, instead of recomputing them
+    from the whole catalog on every query. The listing of the active items is
+    built on first use and kept up to date afterwards.
+    """
+
+    def __init__(self, items: list[InventoryItem]):
+        """
+        Initializes a store with the given items.
+
+        :param items: List of items to assign to the store.
+        :type items: list[InventoryItem]
+        """
+        self._catalog: dict[int, InventoryItem] = {}
+        self._positions: dict[int, int] = {}
+        self._next_position = 0
+        self._active: dict[int, InventoryItem] = {}
+        self._active_listing: list[InventoryItem] | None = None
+        self._listing_positions: list[int] = []
+        self._listing_shared = False
+        self._total_quantity = 0
+        for item in items:
+            self.add_product(item)
+
+    @property
+    def products(self) -> list[InventoryItem]:
+        """
+        Returns all items assigned to the store, active or not, in insertion order.
+
+        :return: A new list of the store's items.
+        :rtype: list[InventoryItem]
+        """
+        return list(self._catalog.values())
+
+    def add_product(self, item: InventoryItem):
+        """
+        Adds an item to the store. Adding an item already in the store has no effect.
+
+        :param item: Item to be added to the store.
+        :type item: InventoryItem
+        """
+        key = id(item)
+        if key in self._catalog:
+            return
+
+        self._catalog[key] = item
+        self._positions[key] = self._next_position
+        self._next_position += 1
+        self._total_quantity += item.quantity
+        if item.is_active():
+            self._list(item)
+        self._index(item)
+        item.add_observer(self._on_product_change)
+
+    def remove_product(self, item: InventoryItem):
+        """
+        Removes an item from the store.
+
+        :param item: Item to be removed from the store.
+        :type item: InventoryItem
+        :raises ValueError: If the item is not in the store.
+        """
+        key = id(item)
+        if self._catalog.pop(key, None) is None:
+            raise ValueError("Error removing product: product is not in the store")
+
+        item.remove_observer(self._on_product_change)
+        self._total_quantity -= item.quantity
+        if key in self._active:
+            self._unlist(item)
+        self._unindex(item)
+        del self._positions[key]
+
+    def _index(self, item: InventoryItem):
+        """Hook adding a new item to the indexes of a subclass."""
+
+    def _unindex(self, item: InventoryItem):
+        """Hook removing a removed item from the indexes of a subclass."""
+
+    def _list(self, item: InventoryItem):
+        """
+        Adds an active item to the active items and the listing.
+
+        Subclasses indexing active items extend this method.
+
+        :param item: The item, which must not be listed yet.
+        :type item: InventoryItem
+        """
+        self._active[id(item)] = item
+        self._update_listing(item, listed=True)
+
+    def _unlist(self, item: InventoryItem):
+        """
+        Removes a listed item from the active items and the listing.
+
+        Subclasses indexing active items extend this method.
+
+        :param item: The item, which must be listed.
+        :type item: InventoryItem
+        """
+        del self._active[id(item)]
+        self._update_listing(item, listed=False)
+
+    def _on_product_change(self, item: InventoryItem, attribute: str, old_value, new_value):
+        """
+        Updates the total quantity and the active items after a change of an item.
+
+        This is the observer registered on every item of the store. Subclasses
+        reacting to further attributes extend it.
+
+        :param item: Item whose state has changed.
+        :type item: InventoryItem
+        :param attribute: Name of the changed attribute, e.g. ``quantity`` or ``active``.
+        :type attribute: str
+        :param old_value: Value of the attribute before the change.
+        :param new_value: Value of the attribute after the change.
+        """
+        if attribute == "quantity":
+            self._total_quantity += new_value - old_value
+        elif attribute == "active":
+            is_listed = id(item) in self._active
+            if new_value and not is_listed:
+                self._list(item)
+            elif not new_value and is_listed:
+                self._unlist(item)
+
+    def _get_listing(self) -> list[InventoryItem]:
+        """
+        Returns the active items in insertion order, building the listing on first use.
+
+        :return: The listing, which callers must not change.
+        :rtype: list[InventoryItem]
+        """
+        if self._active_listing is None:
+            # reactivated items must return to their original place in the listing
+            self._active_listing = sorted(self._active.values(), key=lambda item: self._positions[id(item)])
+            self._listing_positions = [self._positions[id(item)] for item in self._active_listing]
+            self._listing_shared = False
+        return self._active_listing
+
+    def _update_listing(self, item: InventoryItem, listed: bool):
+        """
+        Adds an item to or removes it from the listing, if the listing has been built.
+
+        The item's place is found by binary search over the listed positions.
+        A listing handed out to an iterator is copied before it is changed.
+
+        :param item: The activated or deactivated item.
+        :type item: InventoryItem
+        :param listed: Whether the item must be in the listing.
+        :type listed: bool
+        """
+        if self._active_listing is None:
+            return
+        if self._listing_shared:
+            self._active_listing = list(self._active_listing)
+            self._listing_positions = list(self._listing_positions)
+            self._listing_shared = False
+
+        position = self._positions[id(item)]
+        index = bisect_left(self._listing_positions, position)
+        is_listed = index < len(self._listing_positions) and self._listing_positions[index] == position
+        if listed and not is_listed:
+            self._listing_positions.insert(index, position)
+            self._active_listing.insert(index, item)
+        elif not listed and is_listed:
+            del self._listing_positions[index]
+            del self._active_listing[index]
+
+    def has_product(self, item: InventoryItem) -> bool:
+        """
+        Checks if the given item is assigned to the store, regardless of its active status.
+
+        :param item: Item to look up.
+        :type item: InventoryItem
+        :return: True if this exact item object is in the store, otherwise False.
+        :rtype: bool
+        """
+        return id(item) in self._catalog
+
+    def get_total_quantity(self) -> int:
+        """
+        Gets the total quantity of all items in the store.
+
+        :return: Sum of the quantities of all items in the store.
+        :rtype: int
+        """
+        return self._total_quantity
+
+    def get_all_products(self) -> list[InventoryItem]:
+        """
+        Returns all active items in the store, in insertion order.
+
+        :return: A new list of the active items.
+        :rtype: list[InventoryItem]
+        """
+        listing = self._active_listing
+        if listing is None:
+            listing = self._get_listing()
+        return list(listing)
+
+    def _collect_order_lines(self, shopping_list: list[tuple[InventoryItem, int]]) -> list[tuple[InventoryItem, int]]:
+        """
+        Merges duplicate lines of a shopping list into one line per item.
+
+        Items that are not assigned to the store are left out.
+
+        :param shopping_list: List of order items as (item, quantity) tuples.
+        :type shopping_list: list[tuple[InventoryItem, int]]
+        :return: Order lines with the summed quantity per item, in first-seen order.
+        :rtype: list[tuple[InventoryItem, int]]
+        """
+        lines: dict[int, list] = {}
+        for item, quantity in shopping_list:
+            key = id(item)
+            if key in lines:
+                lines[key][1] += quantity
+            elif key in self._catalog:
+                lines[key] = [item, quantity]
+
+        return [(item, quantity) for item, quantity in lines.values()]
+
+    def order(self, shopping_list: list[tuple[InventoryItem, int]]):
+        """
+        Processes an order by purchasing items from the given shopping list.
+
+        The order is all-or-nothing: duplicate lines for the same item are
+        merged, every line is checked before any stock is taken, and if taking
+        any line fails, stock taken by the preceding lines is returned. Items
+        that are not assigned to the store are skipped, and items sold out by
+        the order are removed from the store.
+
+        :param shopping_list: List of order items, where each item is a tuple
+                              containing an item and the quantity to purchase.
+        :type shopping_list: list[tuple[InventoryItem, int]]
+        :return: Total cost of the order, see ``_price_order``.
+        :raises ValueError: If any line cannot be bought, e.g. the requested quantity
+                            exceeds available stock. No stock is changed in that case.
+        """
+        lines = self._buy_lines(self._collect_order_lines(shopping_list))
+        return self._price_order(lines)
+
+    def _buy_lines(self, lines: list[tuple[InventoryItem, int]]) -> list[tuple[InventoryItem, int]]:
+        """
+        Checks and takes the stock of merged order lines, all or nothing.
+
+        Items sold out by the order are removed from the store.
+
+        :param lines: Order lines of items of the store, with one line per item.
+        :type lines: list[tuple[InventoryItem, int]]
+        :return: The bought lines.
+        :rtype: list[tuple[InventoryItem, int]]
+        :raises ValueError: If any line cannot be bought. No stock is changed in that case.
+        """
+        if len(lines) > 1:
+            # a single line is checked by take_stock before any stock is taken
+            for item, quantity in lines:
+                item.check_purchase(quantity)
+
+        self._take_stock(lines)
+
+        for item, _ in lines:
+            if not item.is_active():
+                self.remove_product(item)
+        return lines
+
+    def _take_stock(self, lines: list[tuple[InventoryItem, int]]):
+        """
+        Takes the stock of checked order lines.
+
+        Subclasses recording orders, e.g. in a journal, extend this method.
+
+        :param lines: Checked order lines.
+        :type lines: list[tuple[InventoryItem, int]]
+        :raises ValueError: If any line cannot be bought. Stock taken by earlier lines is returned.
+        """
+        taken = []
+        try:
+            for item, quantity in lines:
+                item.take_stock(quantity)
+                taken.append((item, quantity))
+        except ValueError:
+            for item, quantity in taken:
+                item.restock(quantity)
+            raise
+
+    def _price_order(self, lines: list[tuple[InventoryItem, int]]):
+        """
+        Calculates the total price of bought order lines.
+
+        Subclasses with their own pricing, e.g. cart-wide discounts, override this method.
+
+        :param lines: The bought order lines.
+        :type lines: list[tuple[InventoryItem, int]]
+        :return: The sum of the items' ``get_price`` of every line.
+        """
+        total = 0
+        for item, quantity in lines:
+            total += item.get_price(quantity)
+        return total
+
+    def __iter__(self) -> Iterator[InventoryItem]:
+        """
+        Iterates lazily over the active items, in the order of ``get_all_products``.
+
+        The iteration sees the items that were active when it started,
+        without copying the listing up front.
+
+        :return: Iterator of active items.
+        :rtype: Iterator[InventoryItem]
+        """
+        listing = self._get_listing()
+        self._listing_shared = True
+        yield from listing
+
+    def __contains__(self, item: InventoryItem) -> bool:
+        """
+        Checks if the given item is in the store's active items.
+
+        :param item: Item to check for in the store.
+        :type item: InventoryItem
+        :return: True if the item is active in the store, otherwise False.
+        :rtype: bool
+        """
+        return id(item) in self._active
+
+    def __len__(self) -> int:
+        """
+        Returns the number of items assigned to the store.
+
+        :return: Count of items in the catalog.
+        :rtype: int
+        """
+        return len(self._catalog)
@@ -0,0 +1,168 @@
+"""
+Products of the inventory engine shared by the bestbuy and bestbuy2 stores.
+
+``InventoryItem`` holds what both stores' products have in common: a name,
+a price, the quantity in stock and the active status. Its attributes live in
+``__slots__`` and changes are reported to observers such as the store. Each
+project's ``Product`` adds its own API on top; bestbuy2 also adds the locks
+that let concurrent checkout workers share its products.
+"""
+from typing import Callable
+
+
+class InventoryItem:
+    """
+    Represents a product with a name, price, quantity in stock and active status.
+
+    An item is active while it is in stock. Changes of the quantity and the
+    active status are reported to observers as
+    ``observer(item, attribute, old_value, new_value)``.
+
+    The attributes are not validated here; subclasses validate them as their
+    API requires before calling ``__init__`` or the setters.
+    """
+
+    __slots__ = ("_name", "_price", "_quantity", "_active", "_observers")
+
+    def __init__(self, name: str, price: float | int, quantity: int):
+        """
+        Initializes an item, active if it is in stock and without observers.
+
+        :param name: The name of the item.
+        :type name: str
+        :param price: The price of one unit of the item.
+        :type price: float | int
+        :param quantity: The quantity of the item in stock.
+        :type quantity: int
+        """
+        self._name = name
+        self._price = price
+        self._quantity = quantity
+        self._active = quantity > 0
+        self._observers: tuple[Callable, ...] = ()
+
+    @property
+    def quantity(self) -> int:
+        """Returns the quantity of the item in stock."""
+        return self._quantity
+
+    @quantity.setter
+    def quantity(self, quantity: int):
+        """Sets the quantity of the item, updates its active status and notifies observers."""
+        self._set_quantity(quantity)
+
+    def _set_quantity(self, quantity: int):
+        """
+        Sets the quantity, updates the active status and notifies observers.
+
+        :param quantity: The new quantity, a non-negative int.
+        :type quantity: int
+        """
+        if quantity > 0 and not self._active:
+            self.activate()
+        elif quantity == 0 and self._active:
+            self.deactivate()
+
+        old_quantity = self._quantity
+        self._quantity = quantity
+        if old_quantity != quantity:
+            self._notify("quantity", old_quantity, quantity)
+
+    def is_active(self) -> bool:
+        """Returns whether the item is active."""
+        return self._active
+
+    def activate(self):
+        """Activates the item and notifies observers if it was inactive."""
+        if not self._active:
+            self._active = True
+            self._notify("active", False, True)
+
+    def deactivate(self):
+        """Deactivates the item and notifies observers if it was active."""
+        if self._active:
+            self._active = False
+            self._notify("active", True, False)
+
+    def add_observer(self, observer: Callable):
+        """
+        Registers a callback notified about changes of the item.
+
+        The callback is called as ``observer(item, attribute, old_value, new_value)``.
+
+        :param observer: The callback to register.
+        :type observer: Callable
+        """
+        self._observers += (observer,)
+
+    def remove_observer(self, observer: Callable):
+        """
+        Unregisters a previously registered callback.
+
+        :param observer: The callback to unregister.
+        :type observer: Callable
+        :raises ValueError: If the callback is not registered.
+        """
+        observers = list(self._observers)
+        observers.remove(observer)
+        self._observers = tuple(observers)
+
+    def _notify(self, attribute: str, old_value, new_value):
+        """Calls every registered observer with the changed attribute and its old and new value."""
+        for observer in self._observers:
+            observer(self, attribute, old_value, new_value)
+
+    def check_purchase(self, quantity: int):
+        """
+        Checks whether a specified quantity of the item can be bought, without buying it.
+
+        :param quantity: The quantity to purchase.
+        :type quantity: int
+        :raises ValueError: If the requested quantity exceeds the stock.
+        """
+        if quantity > self._quantity:
+            raise ValueError("Requested quantity exceeds the stock")
+
+    def get_price(self, quantity: int) -> float | int:
+        """
+        Calculates the price of a specified quantity of the item.
+
+        :param quantity: The quantity to price.
+        :type quantity: int
+        :return: The total cost of the quantity.
+        :rtype: float | int
+        """
+        return quantity * self._price
+
+    def take_stock(self, quantity: int):
+        """
+        Takes a specified quantity of the item out of stock without pricing it.
+
+        :param quantity: The quantity to take.
+        :type quantity: int
+        :raises ValueError: If the quantity cannot be bought, see ``check_purchase``.
+        """
+        self.check_purchase(quantity)
+        # check_purchase has validated the quantity, so the result is a valid quantity
+        self._set_quantity(self._quantity - quantity)
+
+    def restock(self, quantity: int):
+        """
+        Returns a specified quantity of the item back to stock, e.g. when an order is rolled back.
+
+        :param quantity: The quantity to return.
+        :type quantity: int
+        """
+        self.quantity = self._quantity + quantity
+
+    def buy(self, quantity: int):
+        """
+        Buys a specified quantity of the item.
+
+        :param quantity: The quantity to purchase.
+        :type quantity: int
+        :return: The total cost of the purchased quantity, see ``get_price``.
+        :raises ValueError: If the quantity cannot be bought, see ``check_purchase``.
+        """
+        self.take_stock(quantity)
+        return self.get_price(quantity)